@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batch solving
+
+Solves a batch of small synthetic tenants once as one process per tenant,
+the way the API starts the solver today, and once through the batch solver
+in a single process, printing the wall time and latency per tenant.
+
+Usage:
+    python benchmarks/bench_batch.py [--tenants N] [--classes N] [--max-workers N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PYTHON_DIR)
+from benchmarks.synthetic import generate_instance
+
+SOLVER_DIR = os.path.join(PYTHON_DIR, 'solver')
+
+
+def run_processes(jobs):
+    """Solve every job in its own solver process, one after the other."""
+    start_time = time.time()
+    for job in jobs:
+        subprocess.run(
+            [sys.executable, os.path.join(SOLVER_DIR, 'constraint_solver.py')],
+            input=json.dumps(job['data']), capture_output=True, text=True, check=True
+        )
+    return time.time() - start_time
+
+
+def run_batch(jobs, max_workers):
+    """Solve every job with one batch process and time the first and last result."""
+    start_time = time.time()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SOLVER_DIR, 'batch.py')],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    process.stdin.write(json.dumps({'jobs': jobs, 'maxWorkers': max_workers}))
+    process.stdin.close()
+
+    arrivals = [time.time() - start_time for _ in process.stdout]
+    process.wait()
+    return time.time() - start_time, arrivals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch solving')
+    parser.add_argument('--tenants', type=int, default=50, help='Number of tenants in the batch')
+    parser.add_argument('--classes', type=int, default=20, help='Number of classes per tenant')
+    parser.add_argument('--max-workers', type=int, default=None, help='Jobs solved at once by the batch')
+    args = parser.parse_args()
+
+    jobs = [
+        {'tenantId': f'school-{seed}', 'data': generate_instance(args.classes, conflict_density=0.2, seed=seed)}
+        for seed in range(args.tenants)
+    ]
+
+    process_time = run_processes(jobs)
+    batch_time, arrivals = run_batch(jobs, args.max_workers)
+
+    print(f"{'mode':>10} {'total':>8} {'per tenant':>11} {'first result':>13}")
+    print(f"{'processes':>10} {process_time:7.2f}s {process_time / len(jobs) * 1000:9.0f}ms {'-':>13}")
+    print(f"{'batch':>10} {batch_time:7.2f}s {batch_time / len(jobs) * 1000:9.0f}ms {arrivals[0]:12.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the calendar rule encodings
+
+Builds and solves synthetic instances of growing size with the calendar
+rules stated directly over class literals and over per-slot occupancy
+literals, and prints model size, build time and solve time.
+
+Usage:
+    python benchmarks/bench_calendar_encoding.py [--time-limit SECONDS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE
+from benchmarks.synthetic import generate_instance
+
+CONFIGURATIONS = [
+    ('direct', {}),
+    ('direct, slot breaks', {'breakEncoding': 'slot'}),
+    ('occupancy', {'calendarEncoding': 'occupancy'}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the calendar rule encodings')
+    parser.add_argument('--time-limit', type=float, default=30, help='Time limit per solve in seconds')
+    args = parser.parse_args()
+    
+    print(f"{'classes':>7} {'encoding':<20} {'variables':>10} {'constraints':>12} {'terms':>10} "
+          f"{'build':>8} {'solve':>8} {'status':>10}")
+    for num_classes in [40, 80, 160]:
+        data = generate_instance(
+            num_classes, rotation_weeks=max(1, num_classes // 16), conflict_density=0.3,
+            constraints={'requireBreakAfterClass': True}
+        )
+        for name, options in CONFIGURATIONS:
+            solver = ScheduleSolver(dict(data, solverOptions={'encoding': 'sparse', 'randomSeed': 0, **options}))
+            estimate = solver.estimate_model_size()
+            
+            start_time = time.time()
+            result = solver.solve(time_limit_seconds=args.time_limit)
+            build_time = time.time() - start_time - result['solveTime']
+            
+            stats = result['modelStats']
+            if result['status'] == 'success':
+                status = result['statusString']
+            else:
+                status = 'infeasible' if result['statusCode'] == INFEASIBLE else 'timeout'
+            print(f"{num_classes:>7} {name:<20} {stats['numVariables']:>10} {stats['numConstraints']:>12} "
+                  f"{estimate['numTerms']:>10} {build_time:7.2f}s {result['solveTime']:7.2f}s {status:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for solution extraction
+
+Compares reading every assignment variable with one solver.Value call each
+against the bulk read of the solver response used by ScheduleSolver.
+
+Usage:
+    python benchmarks/bench_extraction.py [--classes N] [--weeks W]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import generate_instance
+from solver.constraint_solver import ScheduleSolver
+
+
+def per_variable_extraction(solver):
+    """Extract the solution with one solver.Value call per variable."""
+    return [
+        {'classId': class_id, 'week': week, 'day': day, 'period': period}
+        for (class_id, week, day, period), var in solver.assignments.items()
+        if solver.solver.Value(var) == 1
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark solution extraction')
+    parser.add_argument('--classes', type=int, default=300, help='Number of classes')
+    parser.add_argument('--weeks', type=int, default=8, help='Rotation weeks')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+    
+    # Loose limits keep the solve short; only the extraction is measured
+    data = generate_instance(args.classes, rotation_weeks=args.weeks, conflict_density=0.1, constraints={
+        'maxClassesPerDay': 8,
+        'maxClassesPerWeek': 40,
+        'maxConsecutiveClasses': 8
+    })
+    solver = ScheduleSolver(data)
+    result = solver.solve(time_limit_seconds=60)
+    if result['status'] != 'success':
+        print(f"Instance not solved: {result['status']}")
+        return
+    
+    print(f"{len(solver.assignments)} variables, {len(result['solution'])} assignments")
+    
+    timings = {}
+    for name, extract in [
+        ('per-variable', lambda: per_variable_extraction(solver)),
+        ('bulk', lambda: solver._extract_solution(result['statusCode'], 0)['solution']),
+    ]:
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            solution = extract()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        assert solution == result['solution']
+        timings[name] = best
+        print(f"{name:<14} {best * 1000:9.1f}ms")
+    
+    print(f"speed-up       {timings['per-variable'] / timings['bulk']:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
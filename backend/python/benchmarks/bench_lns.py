@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for large neighbourhood search
+
+Solves a synthetic roster, changes the conflicts of some classes so the
+old schedule no longer fits, and re-solves against the old schedule as
+reference: once as one CP-SAT run with the stability objective and once
+with large neighbourhood search from a quick feasible schedule, with the
+same wall budget. Prints the classes moved and the LNS iteration times.
+
+Usage:
+    python benchmarks/bench_lns.py [--classes N] [--budget SECONDS]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.lns import LargeNeighbourhoodSearch
+from benchmarks.synthetic import DAYS, PERIODS, generate_instance
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark large neighbourhood search')
+    parser.add_argument('--classes', type=int, default=240, help='Number of classes')
+    parser.add_argument('--budget', type=float, default=30, help='Wall-clock budget in seconds')
+    parser.add_argument('--changed', type=int, default=40, help='Classes whose conflicts change')
+    args = parser.parse_args()
+    
+    data = generate_instance(args.classes, rotation_weeks=args.classes // 12, conflict_density=0.3)
+    data['solverOptions'] = {'encoding': 'sparse', 'randomSeed': 0}
+    reference = ScheduleSolver(data).solve(120)['solution']
+    
+    # New conflicts over the reference slots of some classes
+    rng = random.Random(1)
+    for assignment in rng.sample(reference, args.changed):
+        data['conflicts'][assignment['classId']] = {
+            day: [period for period in PERIODS if rng.random() < 0.3 or (day, period) == (assignment['day'], assignment['period'])]
+            for day in DAYS
+        }
+    options = {'encoding': 'sparse', 'randomSeed': 0, 'referenceSchedule': reference}
+    
+    start_time = time.time()
+    monolithic = ScheduleSolver(dict(data, solverOptions=options)).solve(args.budget)
+    monolithic_time = time.time() - start_time
+    search = LargeNeighbourhoodSearch(dict(data, solverOptions=options))
+    moved = search.objective(monolithic['solution']) if monolithic['status'] == 'success' else None
+    print(f"monolithic CP-SAT: {moved} classes moved, {monolithic.get('statusString', monolithic['status'])}, "
+          f"{monolithic_time:.1f}s")
+    
+    initial = ScheduleSolver(data).solve(120)['solution']
+    result = search.improve(initial, time_limit_seconds=args.budget, iteration_time_limit=1)
+    print(f"LNS: {result['initialObjective']} -> {result['objective']} classes moved, "
+          f"{result['numIterations']} iterations, {result['totalTime']:.1f}s, "
+          f"{1000 * result['totalTime'] / max(result['numIterations'], 1):.0f} ms per iteration")
+    for entry in result['trajectory']:
+        print(f"  {entry['time']:6.2f}s  iteration {entry['iteration']:>4}  "
+              f"objective {entry['objective']:>5}  {entry['neighbourhood'] or 'start'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the constraint parameter sweep
+
+Checks a grid of maxClassesPerDay / maxClassesPerWeek / maxConsecutiveClasses
+settings once with ParameterSweep and once with an independent ScheduleSolver
+run per setting, and prints the time of both.
+
+Usage:
+    python benchmarks/bench_parameter_sweep.py [--classes N] [--weeks W] [--time-limit SECONDS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.parameter_sweep import ParameterSweep
+from benchmarks.synthetic import generate_instance
+
+GRID = {
+    'maxClassesPerDay': [2, 3, 4, 5],
+    'maxClassesPerWeek': [12, 16, 20],
+    'maxConsecutiveClasses': [1, 2, 3],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the constraint parameter sweep')
+    parser.add_argument('--classes', type=int, default=40, help='Number of classes')
+    parser.add_argument('--weeks', type=int, default=2, help='Rotation weeks')
+    parser.add_argument('--time-limit', type=float, default=5, help='Time limit per setting in seconds')
+    args = parser.parse_args()
+    
+    data = generate_instance(args.classes, rotation_weeks=args.weeks, conflict_density=0.3)
+    
+    start_time = time.time()
+    sweep = ParameterSweep(data, GRID).solve(args.time_limit)
+    sweep_time = time.time() - start_time
+    
+    start_time = time.time()
+    mismatches = 0
+    for row in sweep['settings']:
+        setting_data = dict(data, constraints={**data['constraints'], **row['constraints']})
+        result = ScheduleSolver(setting_data).solve(args.time_limit)
+        feasible = result['status'] == 'success'
+        if row['status'] != 'unknown' and feasible != (row['status'] == 'feasible'):
+            mismatches += 1
+    independent_time = time.time() - start_time
+    
+    feasible = sum(row['status'] == 'feasible' for row in sweep['settings'])
+    print(f"{sweep['numSettings']} settings, {feasible} feasible, {sweep['numSolves']} solved by the sweep")
+    print(f"{'independent runs':<18} {independent_time:8.2f}s")
+    print(f"{'sweep':<18} {sweep_time:8.2f}s (build {sweep['buildTime']:.2f}s)")
+    print(f"{'speed-up':<18} {independent_time / sweep_time:8.1f}x")
+    if mismatches:
+        print(f"{mismatches} settings disagree with the independent runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for redundant implied constraints
+
+Solves near-capacity synthetic instances with and without the
+redundantConstraints solver option and prints build and solve times.
+
+Usage:
+    python benchmarks/bench_redundant_constraints.py [--time-limit SECONDS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from benchmarks.synthetic import generate_instance
+from ortools.sat.python import cp_model
+
+# Break after class with a teacher gap on Monday: 3 usable periods there and 4 on
+# other days, so a week holds 19 classes although maxClassesPerWeek allows 20.
+CONSTRAINTS = {
+    'maxClassesPerDay': 5,
+    'maxClassesPerWeek': 20,
+    'maxConsecutiveClasses': 2,
+    'requireBreakAfterClass': True
+}
+TEACHER_AVAILABILITY = {'MONDAY': [3, 6]}
+WEEK_CAPACITY = 19
+
+
+def run(data, redundant, time_limit):
+    """Solve one instance and return (status, build time, solve time)."""
+    data = dict(data, solverOptions={'redundantConstraints': redundant, 'randomSeed': 0})
+    solver = ScheduleSolver(data)
+    
+    start_time = time.time()
+    result = solver.solve(time_limit_seconds=time_limit)
+    total_time = time.time() - start_time
+    
+    status = result['status']
+    if status == 'infeasible' and result['statusCode'] == cp_model.UNKNOWN:
+        status = 'timeout'
+    
+    return status, total_time - result['solveTime'], result['solveTime']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark redundant implied constraints')
+    parser.add_argument('--time-limit', type=float, default=20, help='Solve time limit per run')
+    parser.add_argument('--seeds', type=int, default=3, help='Instances per size')
+    args = parser.parse_args()
+    
+    print(f"{'weeks':>5} {'classes':>7} {'seed':>4} | {'plain':>22} | {'redundant':>22}")
+    for weeks in [1, 2, 4]:
+        capacity = WEEK_CAPACITY * weeks
+        for num_classes in [capacity - 1, capacity, capacity + 1]:
+            for seed in range(args.seeds):
+                data = generate_instance(
+                    num_classes,
+                    rotation_weeks=weeks,
+                    conflict_density=0.15,
+                    teacher_availability=TEACHER_AVAILABILITY,
+                    constraints=CONSTRAINTS,
+                    seed=seed
+                )
+                row = []
+                for redundant in [False, True]:
+                    status, build_time, solve_time = run(data, redundant, args.time_limit)
+                    row.append(f"{status:>10} {build_time:5.2f}s {solve_time:5.2f}s")
+                print(f"{weeks:>5} {num_classes:>7} {seed:>4} | {row[0]} | {row[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark for solving exported models
+
+Solves every model in an export corpus (written with the exportModelDir
+solver option) with each requested number of search workers, reporting the
+search time separately from the model load time. Without a corpus, a few
+synthetic instances are exported to a temporary directory first.
+
+Usage:
+    python benchmarks/bench_saved_models.py [CORPUS_DIR] [--workers 1 4 8] [--time-limit SECONDS]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.synthetic import generate_instance
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE
+from solver.saved_model import solve_saved_model
+
+
+def export_synthetic_corpus(directory, time_limit):
+    """Export a few synthetic instances and report their full solve times."""
+    for num_classes, rotation_weeks in [(20, 1), (40, 2), (60, 4)]:
+        data = generate_instance(num_classes, rotation_weeks=rotation_weeks, conflict_density=0.3)
+        data['solverOptions'] = {'exportModelDir': directory}
+        
+        start_time = time.time()
+        result = ScheduleSolver(data).solve(time_limit_seconds=time_limit)
+        total_time = time.time() - start_time
+        print(f"exported {os.path.basename(result['exportPath'])}: {num_classes} classes, "
+              f"{rotation_weeks} weeks, build+solve {total_time:.2f}s (search {result['solveTime']:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark solving exported models')
+    parser.add_argument('corpus', nargs='?', help='Directory of exported models')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='Worker counts to compare')
+    parser.add_argument('--time-limit', type=float, default=30, help='Time limit per solve in seconds')
+    args = parser.parse_args()
+    
+    corpus = args.corpus
+    if corpus is None:
+        corpus = tempfile.mkdtemp(prefix='thunder-models-')
+        export_synthetic_corpus(corpus, args.time_limit)
+    
+    print(f"\n{'model':<18} {'workers':>7} {'load':>8} {'search':>8} {'status':>10}")
+    for name in sorted(os.listdir(corpus)):
+        for num_workers in args.workers:
+            result = solve_saved_model(os.path.join(corpus, name), args.time_limit, num_workers)
+            if result['status'] == 'success':
+                status = result['statusString']
+            else:
+                status = 'infeasible' if result['statusCode'] == INFEASIBLE else 'timeout'
+            print(f"{name:<18} {num_workers:>7} {result['loadTime']:7.2f}s {result['solveTime']:7.2f}s {status:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for shared-memory problems in process pools
+
+Validates a batch of schedules in a process pool twice: once sending the
+input data and schedule to the workers with every task, and once sharing
+the compiled problem and schedules in shared memory so a task carries only
+block names. Prints the bytes pickled per task and the wall time for
+growing rosters.
+
+Usage:
+    python benchmarks/bench_shared_problem.py [--schedules N] [--workers N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.shared_problem import SharedProblem, SharedSchedule, attach_worker, check_shared_schedule
+from solver.solution_validator import ScheduleValidator
+from benchmarks.synthetic import DAYS, PERIODS, generate_instance
+
+
+def validate_pickled(task):
+    """Validate a schedule sent with its full input data."""
+    data, assignments = task
+    return ScheduleValidator(dict(data, assignments=assignments)).validate()
+
+
+def make_schedule(data, seed):
+    """Place every class in a slot of its rotation, collisions included."""
+    slots = [
+        (week, day, period)
+        for week in range(1, data['rotationWeeks'] + 1) for day in DAYS for period in PERIODS
+    ]
+    return [
+        dict(zip(('classId', 'week', 'day', 'period'), (class_obj['id'],) + slots[(index * 7 + seed) % len(slots)]))
+        for index, class_obj in enumerate(data['classes'])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared-memory problems in process pools')
+    parser.add_argument('--schedules', type=int, default=32, help='Schedules validated per roster')
+    parser.add_argument('--workers', type=int, default=2, help='Pool processes')
+    args = parser.parse_args()
+
+    print(f"{'classes':>8} {'pickled task':>13} {'shared task':>12} {'pickled':>9} {'shared':>9}")
+    for num_classes in (200, 2000, 20000):
+        data = generate_instance(num_classes, rotation_weeks=num_classes // 20, conflict_density=0.3)
+        schedules = [make_schedule(data, seed) for seed in range(args.schedules)]
+
+        tasks = [(data, schedule) for schedule in schedules]
+        start_time = time.time()
+        with multiprocessing.Pool(args.workers) as pool:
+            pickled_results = pool.map(validate_pickled, tasks)
+        pickled_time = time.time() - start_time
+
+        start_time = time.time()
+        with SharedProblem.create(data) as problem:
+            shared = [SharedSchedule.create(problem, schedule) for schedule in schedules]
+            names = [schedule.name for schedule in shared]
+            with multiprocessing.Pool(args.workers, initializer=attach_worker, initargs=(problem.name,)) as pool:
+                shared_results = pool.map(check_shared_schedule, names)
+            for schedule in shared:
+                schedule.close()
+                schedule.unlink()
+            problem.unlink()
+        shared_time = time.time() - start_time
+
+        assert [result['violations'] for result in pickled_results] == [result['violations'] for result in shared_results]
+        print(
+            f"{num_classes:>8} {len(pickle.dumps(tasks[0])):>12}B {len(pickle.dumps(names[0])):>11}B "
+            f"{pickled_time:8.2f}s {shared_time:8.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
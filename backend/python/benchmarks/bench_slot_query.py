@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark for slot queries
+
+Solves a synthetic schedule and measures the latency of SlotQuery.feasible_masks
+(the UI drop-target highlight) and SlotQuery.explain (with reasons per slot).
+
+Usage:
+    python benchmarks/bench_slot_query.py [--classes N] [--weeks N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.slot_query import SlotQuery
+from benchmarks.synthetic import generate_instance
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark slot queries')
+    parser.add_argument('--classes', type=int, default=60, help='Number of classes')
+    parser.add_argument('--weeks', type=int, default=4, help='Rotation weeks')
+    args = parser.parse_args()
+    
+    data = generate_instance(args.classes, rotation_weeks=args.weeks, conflict_density=0.2)
+    result = ScheduleSolver(data).solve(time_limit_seconds=60)
+    if result['status'] != 'success':
+        print(f"No schedule to query: {result.get('message')}")
+        return
+    data['assignments'] = result['solution']
+    
+    start_time = time.perf_counter()
+    query = SlotQuery.from_data(data)
+    print(f"Setup: {(time.perf_counter() - start_time) * 1000:.2f} ms")
+    
+    class_ids = [class_obj['id'] for class_obj in data['classes']]
+    for name, method in [('feasible_masks', query.feasible_masks), ('explain', query.explain)]:
+        start_time = time.perf_counter()
+        for class_id in class_ids:
+            method(class_id)
+        per_query = (time.perf_counter() - start_time) / len(class_ids)
+        print(f"{name}: {per_query * 1000:.3f} ms per query ({args.weeks * 40} slots)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the solution pool
+
+Collects alternative schedules of a synthetic instance with repeated
+solver runs, with separate runs under different random seeds and with a
+solution pool, and prints the total time and how far apart the schedules are.
+
+Usage:
+    python benchmarks/bench_solution_pool.py [--classes N] [--size K] [--min-distance D]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.schedule_diff import diff_schedules
+from solver.solution_pool import SolutionPool
+from benchmarks.synthetic import generate_instance
+
+
+def closest_pair(solutions):
+    """Get the fewest classes in which two of the schedules differ."""
+    return min(
+        (len(diff_schedules(first, second)['moved'])
+         for index, first in enumerate(solutions) for second in solutions[index + 1:]),
+        default=None
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the solution pool')
+    parser.add_argument('--classes', type=int, default=120, help='Number of classes')
+    parser.add_argument('--size', type=int, default=5, help='Number of schedules to collect')
+    parser.add_argument('--min-distance', type=int, default=20, help='Fewest classes two schedules differ in')
+    parser.add_argument('--time-limit', type=float, default=60, help='Time limit per solve in seconds')
+    args = parser.parse_args()
+    
+    data = generate_instance(args.classes, rotation_weeks=args.classes // 12, conflict_density=0.3)
+    options = {'encoding': 'sparse', 'numWorkers': 8}
+    
+    runs = {}
+    for name, seeds in [('repeated runs', [0] * args.size), ('seeded runs', range(args.size))]:
+        start_time = time.time()
+        runs[name] = [
+            ScheduleSolver(dict(data, solverOptions=dict(options, randomSeed=seed))).solve(args.time_limit)['solution']
+            for seed in seeds
+        ]
+        runs[name + ' time'] = time.time() - start_time
+    
+    result = SolutionPool(dict(data, solverOptions=options), args.size, args.min_distance).solve(
+        args.time_limit * args.size
+    )
+    pooled = [entry['solution'] for entry in result['solutions']]
+    
+    print(f"{'method':<16} {'schedules':>9} {'closest pair':>12} {'total':>8}")
+    for name in ('repeated runs', 'seeded runs'):
+        print(f"{name:<16} {len(runs[name]):>9} {closest_pair(runs[name]):>12} {runs[name + ' time']:7.2f}s")
+    print(f"{'solution pool':<16} {len(pooled):>9} {closest_pair(pooled):>12} {result['totalTime']:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
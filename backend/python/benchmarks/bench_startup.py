@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for entry point start-up
+
+For every script entry point, measures the module import time in a fresh
+interpreter (and whether it loaded OR-Tools), and the latency of a first
+request from process start to complete output.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Add the parent directory to the path so we can import the benchmark helpers
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PYTHON_DIR)
+from benchmarks.synthetic import generate_instance
+
+SOLVER_DIR = os.path.join(PYTHON_DIR, 'solver')
+
+IMPORT_PROBE = '''
+import sys, time
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+import solver.{module}
+elapsed = time.perf_counter() - start
+print(elapsed, any(name.startswith('ortools') for name in sys.modules))
+'''
+
+
+def make_inputs():
+    """Create the request payload for every entry point."""
+    data = generate_instance(16, conflict_density=0.2)
+    assignments = [
+        {'classId': class_obj['id'], 'week': 1, 'day': ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY'][i % 5], 'period': 1 + 2 * (i // 5)}
+        for i, class_obj in enumerate(data['classes'])
+    ]
+    validation = dict(data, assignments=assignments)
+    context = json.dumps(data)
+    
+    return [
+        ('constraint_solver', [], json.dumps(data)),
+        ('portfolio', [], json.dumps(data)),
+        ('solution_validator', [], json.dumps(validation)),
+        ('solution_validator', ['--stream'], '\n'.join([context] + [json.dumps(a) for a in assignments])),
+        ('incremental_validator', [], json.dumps(validation)),
+        ('slot_query', [], json.dumps(dict(validation, classIds=[data['classes'][0]['id']]))),
+    ]
+
+
+def measure_import(module):
+    """Measure the import time of a solver module in a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, '-c', IMPORT_PROBE.format(path=PYTHON_DIR, module=module)],
+        capture_output=True, text=True, check=True
+    )
+    elapsed, ortools_loaded = completed.stdout.split()
+    return float(elapsed), ortools_loaded == 'True'
+
+
+def measure_request(module, args, payload):
+    """Measure the wall time of one request to a script, from process start to exit."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, f'{module}.py')] + args,
+        input=payload, capture_output=True, text=True, check=True
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark entry point start-up')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+    
+    print(f"{'entry point':<35} {'import':>9} {'OR-Tools':>9} {'first request':>14}")
+    for module, script_args, payload in make_inputs():
+        imports = [measure_import(module) for _ in range(args.repeat)]
+        import_time = min(elapsed for elapsed, _ in imports)
+        ortools_loaded = imports[0][1]
+        request_time = min(measure_request(module, script_args, payload) for _ in range(args.repeat))
+        
+        name = ' '.join([f'{module}.py'] + script_args)
+        print(f"{name:<35} {import_time * 1000:7.1f}ms {'yes' if ortools_loaded else 'no':>9} {request_time * 1000:12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
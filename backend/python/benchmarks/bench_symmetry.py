@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark for symmetry reduction
+
+Solves synthetic instances whose classes share a few conflict profiles,
+with and without the symmetryReduction solver option, and prints model
+size, solve time and status.
+
+Usage:
+    python benchmarks/bench_symmetry.py [--time-limit SECONDS]
+"""
+
+import argparse
+import os
+import sys
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE
+from benchmarks.synthetic import generate_instance
+
+# (classes, rotation weeks, distinct conflict profiles)
+INSTANCES = [
+    (60, 4, 12),
+    (120, 8, 12),
+    (120, 8, 40),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark symmetry reduction')
+    parser.add_argument('--time-limit', type=float, default=60, help='Time limit per solve in seconds')
+    args = parser.parse_args()
+    
+    print(f"{'classes':>7} {'profiles':>8} {'reduction':>9} {'variables':>10} {'solve':>8} {'status':>10}")
+    for num_classes, rotation_weeks, num_profiles in INSTANCES:
+        data = generate_instance(num_classes, rotation_weeks=rotation_weeks, num_profiles=num_profiles)
+        for reduction in (False, True):
+            options = {'symmetryReduction': reduction, 'encoding': 'sparse', 'randomSeed': 0}
+            result = ScheduleSolver(dict(data, solverOptions=options)).solve(time_limit_seconds=args.time_limit)
+            
+            if result['status'] == 'success':
+                status = result['statusString']
+            else:
+                status = 'infeasible' if result['statusCode'] == INFEASIBLE else 'timeout'
+            print(f"{num_classes:>7} {num_profiles:>8} {'on' if reduction else 'off':>9} "
+                  f"{result['modelStats']['numVariables']:>10} {result['solveTime']:7.2f}s {status:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Synthetic instance generator for Thunder Scheduler benchmarks
+
+Generates solver input data with random class conflicts so benchmarks can
+scale rosters beyond the CSV test data.
+"""
+
+import random
+
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+PERIODS = list(range(1, 9))
+
+
+def generate_instance(num_classes, rotation_weeks=1, conflict_density=0.3,
+                      teacher_availability=None, constraints=None, seed=0, num_profiles=None):
+    """Generate a random scheduling instance.
+    
+    Args:
+        num_classes: Number of classes to schedule
+        rotation_weeks: Number of weeks in the rotation
+        conflict_density: Probability that a class conflicts with a given period
+        teacher_availability: Optional dictionary mapping days to blocked periods
+        constraints: Optional dictionary with constraint settings
+        seed: Random seed
+        num_profiles: Optional number of distinct conflict profiles; classes
+            share them round-robin, like sections of one grade level
+        
+    Returns:
+        Dictionary with solver input data
+    """
+    rng = random.Random(seed)
+    
+    default_constraints = {
+        'maxClassesPerDay': 4,
+        'maxClassesPerWeek': 16,
+        'maxConsecutiveClasses': 2,
+        'requireBreakAfterClass': False
+    }
+    if constraints:
+        default_constraints.update(constraints)
+    
+    classes = []
+    conflicts = {}
+    for i in range(num_classes):
+        class_id = f"class{i+1}"
+        grade = i % 6
+        classes.append({'id': class_id, 'name': f"Class {grade}-{i+1}", 'gradeLevel': grade})
+        if num_profiles and i >= num_profiles:
+            conflicts[class_id] = conflicts[f"class{i % num_profiles + 1}"]
+            continue
+        conflicts[class_id] = {}
+        for day in DAYS:
+            periods = [period for period in PERIODS if rng.random() < conflict_density]
+            if periods:
+                conflicts[class_id][day] = periods
+    
+    return {
+        'classes': classes,
+        'conflicts': conflicts,
+        'teacherAvailability': teacher_availability or {},
+        'constraints': default_constraints,
+        'rotationWeeks': rotation_weeks
+    }
@@ -41,4 +41,67 @@ $PYTHON_PATH -m pytest tests/test_solver_pytest.py::test_small_csv_data -v
 echo -e "\n2. Medium dataset test..."
 $PYTHON_PATH -m pytest tests/test_solver_pytest.py::test_medium_csv_data -v
 
+# Run solver extension tests
+echo -e "\nRunning solver extension tests..."
+
+echo -e "\n1. Portfolio solver tests..."
+$PYTHON_PATH -m pytest tests/test_portfolio.py -v
+
+echo -e "\n2. Binary wire format tests..."
+$PYTHON_PATH -m pytest tests/test_wire_format.py -v
+
+echo -e "\n3. Solution validator tests..."
+$PYTHON_PATH -m pytest tests/test_solution_validator.py -v
+
+echo -e "\n4. Incremental validator tests..."
+$PYTHON_PATH -m pytest tests/test_incremental_validator.py -v
+
+echo -e "\n5. Day mask calendar tests..."
+$PYTHON_PATH -m pytest tests/test_day_masks.py -v
+
+echo -e "\n6. Slot query tests..."
+$PYTHON_PATH -m pytest tests/test_slot_query.py -v
+
+echo -e "\n7. Lazy import tests..."
+$PYTHON_PATH -m pytest tests/test_lazy_imports.py -v
+
+echo -e "\n8. Schedule diff tests..."
+$PYTHON_PATH -m pytest tests/test_schedule_diff.py -v
+
+echo -e "\n9. Parameter sweep tests..."
+$PYTHON_PATH -m pytest tests/test_parameter_sweep.py -v
+
+echo -e "\n10. Reproducible solve tests..."
+$PYTHON_PATH -m pytest tests/test_reproducible.py -v
+
+echo -e "\n11. Saved model tests..."
+$PYTHON_PATH -m pytest tests/test_saved_model.py -v
+
+echo -e "\n12. Symmetry reduction tests..."
+$PYTHON_PATH -m pytest tests/test_symmetry.py -v
+
+echo -e "\n13. Presolve tests..."
+$PYTHON_PATH -m pytest tests/test_presolve.py -v
+
+echo -e "\n14. Locked assignment tests..."
+$PYTHON_PATH -m pytest tests/test_locked_assignments.py -v
+
+echo -e "\n15. Solution pool tests..."
+$PYTHON_PATH -m pytest tests/test_solution_pool.py -v
+
+echo -e "\n16. Large neighbourhood search tests..."
+$PYTHON_PATH -m pytest tests/test_lns.py -v
+
+echo -e "\n17. Schedule repair tests..."
+$PYTHON_PATH -m pytest tests/test_repair.py -v
+
+echo -e "\n18. Batch solver tests..."
+$PYTHON_PATH -m pytest tests/test_batch.py -v
+
+echo -e "\n19. Shared problem tests..."
+$PYTHON_PATH -m pytest tests/test_shared_problem.py -v
+
+echo -e "\n20. Metrics tests..."
+$PYTHON_PATH -m pytest tests/test_metrics.py -v
+
 echo -e "\nAll tests completed."
\ No newline at end of file
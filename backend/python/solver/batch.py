@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Batch Solver
+This script solves many independent scheduling problems in one process and
+streams each result back as soon as it is ready.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Allow running as a script as well as importing as solver.batch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.constraint_solver import UNKNOWN, ScheduleSolver, _cp_model
+
+# CP-SAT search workers by instance size, as (largest class-weeks, workers);
+# small instances finish fastest on one thread and leave the cores to other jobs
+WORKER_TIERS = ((200, 1), (2000, 4))
+MAX_JOB_WORKERS = 8
+
+
+def job_workers(data, num_threads):
+    """Choose the number of CP-SAT search workers for one job.
+
+    Args:
+        data: Scheduling input data of the job
+        num_threads: Search threads the whole batch may use
+
+    Returns:
+        Number of search workers, between 1 and num_threads
+    """
+    size = len(data.get('classes', [])) * data.get('rotationWeeks', 1)
+    workers = next((workers for limit, workers in WORKER_TIERS if size <= limit), MAX_JOB_WORKERS)
+    return max(1, min(workers, num_threads))
+
+
+class _ThreadBudget:
+    """Counter of the search threads not taken by running jobs."""
+
+    def __init__(self, num_threads):
+        self.available = num_threads
+        self.condition = threading.Condition()
+
+    def acquire(self, num_threads):
+        with self.condition:
+            self.condition.wait_for(lambda: self.available >= num_threads)
+            self.available -= num_threads
+
+    def release(self, num_threads):
+        with self.condition:
+            self.available += num_threads
+            self.condition.notify_all()
+
+
+class BatchSolver:
+    """Class for solving the problems of many tenants on a bounded thread pool.
+
+    All jobs share the interpreter and the OR-Tools import. Model building
+    runs in Python, while CP-SAT releases the GIL while it searches, so the
+    searches of several jobs run in parallel. Each job gets CP-SAT search
+    workers by its size (see WORKER_TIERS) and waits until that many of the
+    batch's search threads are free, so large jobs don't oversubscribe the
+    cores. A job whose solverOptions set numWorkers keeps it.
+    """
+
+    def __init__(self, jobs, max_workers=None, num_threads=None):
+        """Initialize the batch with its jobs.
+
+        Args:
+            jobs: List of jobs, each a dictionary with a 'tenantId', the
+                scheduling input 'data' (see ScheduleSolver) and an optional
+                'timeLimit' in seconds
+            max_workers: Largest number of jobs solved at once (default: number of cores)
+            num_threads: Search threads shared by the running jobs (default: number of cores)
+        """
+        num_cores = os.cpu_count() or 1
+        self.jobs = jobs
+        self.max_workers = max_workers or num_cores
+        self.num_threads = num_threads or num_cores
+        self.budget = _ThreadBudget(self.num_threads)
+
+    def results(self, time_limit_seconds=60):
+        """Solve every job and yield the results in the order they finish.
+
+        Args:
+            time_limit_seconds: Time limit of each job without its own 'timeLimit'
+
+        Yields:
+            Solver result of each job with its 'tenantId', its 'index' in the
+            batch and its 'batch' timing: time queued, time to solve
+            (building included) and search workers used
+        """
+        # Load OR-Tools once for every job instead of on the first job's build
+        _cp_model()
+        start_time = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='batch') as executor:
+            futures = [
+                executor.submit(self._solve_job, index, job, time_limit_seconds, start_time)
+                for index, job in enumerate(self.jobs)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def solve(self, time_limit_seconds=60):
+        """Solve every job and collect the results.
+
+        Args:
+            time_limit_seconds: Time limit of each job without its own 'timeLimit'
+
+        Returns:
+            Dictionary with the 'results' in job order and batch totals
+        """
+        start_time = time.time()
+        results = sorted(self.results(time_limit_seconds), key=lambda result: result['index'])
+        return {
+            'results': results,
+            'numJobs': len(results),
+            'numSolved': sum(1 for result in results if result['status'] == 'success'),
+            'totalTime': time.time() - start_time
+        }
+
+    def _solve_job(self, index, job, time_limit_seconds, batch_start):
+        """Solve one job on a pool thread.
+
+        Args:
+            index: Index of the job in the batch
+            job: Job dictionary
+            time_limit_seconds: Default time limit of the job
+            batch_start: Time the batch started
+
+        Returns:
+            Solver result with the job's tenant, index and timing
+        """
+        data = job.get('data', {})
+        options = data.get('solverOptions', {})
+        workers = options.get('numWorkers') or job_workers(data, self.num_threads)
+        reserved = min(workers, self.num_threads)
+
+        self.budget.acquire(reserved)
+        start_time = time.time()
+        try:
+            solver_data = dict(data, solverOptions={**options, 'numWorkers': workers})
+            result = ScheduleSolver(solver_data).solve(job.get('timeLimit', time_limit_seconds))
+        except Exception as error:
+            result = {
+                'status': 'error',
+                'statusCode': UNKNOWN,
+                'message': str(error),
+                'solveTime': 0
+            }
+            metrics.record_solve(result, None)
+        finally:
+            self.budget.release(reserved)
+
+        result['tenantId'] = job.get('tenantId')
+        result['index'] = index
+        result['batch'] = {
+            'queueTime': start_time - batch_start,
+            'wallTime': time.time() - start_time,
+            'numWorkers': workers
+        }
+        return result
+
+
+def main():
+    """Main function to read a batch and stream its results.
+
+    The stdin input holds the 'jobs' (see BatchSolver), an optional
+    'maxWorkers', 'numThreads' and a default 'timeLimit' in seconds. Each
+    result is written as one JSON line as soon as its job finishes.
+    """
+    metrics.configure('batch')
+    input_data = json.loads(sys.stdin.read())
+    batch = BatchSolver(input_data['jobs'], input_data.get('maxWorkers'), input_data.get('numThreads'))
+    for result in batch.results(input_data.get('timeLimit', 60)):
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
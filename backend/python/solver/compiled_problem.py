@@ -0,0 +1,103 @@
+"""
+Thunder Scheduler Compiled Problem
+Index tables and period bitmasks compiled once from solver input data.
+"""
+
+from array import array
+
+
+class CompiledProblem:
+    """Class holding class/day indices and blocked-period masks for fast lookups.
+
+    Masks use bit (period - 1) for each period. Per-class masks are stored in
+    flat arrays indexed by class_index * len(days) + day_index.
+    """
+
+    def __init__(self, data):
+        """Compile the input data.
+
+        Args:
+            data: Dictionary containing scheduling input data (see ScheduleSolver)
+        """
+        self.classes = data['classes']
+        self.constraints = data['constraints']
+        self.rotation_weeks = data.get('rotationWeeks', 1)
+        self.days = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+        self.periods = list(range(1, 9))  # 8 periods per day
+        self.day_index = {day: index for index, day in enumerate(self.days)}
+        self.class_ids = [class_obj['id'] for class_obj in self.classes]
+        self.class_index = {class_id: index for index, class_id in enumerate(self.class_ids)}
+
+        self.max_classes_per_day = self.constraints.get('maxClassesPerDay', 4)
+        self.max_classes_per_week = self.constraints.get('maxClassesPerWeek', 16)
+        self.max_consecutive = self.constraints.get('maxConsecutiveClasses', 2)
+        self.require_break = self.constraints.get('requireBreakAfterClass', False)
+
+        self.teacher_masks = array('B', [0] * len(self.days))
+        for day, periods in data['teacherAvailability'].items():
+            self._check_slots('Teacher availability', day, periods)
+            self.teacher_masks[self.day_index[day]] = _periods_mask(periods)
+
+        self.conflict_masks = array('B', [0] * (len(self.class_ids) * len(self.days)))
+        for class_id, days in data['conflicts'].items():
+            if class_id not in self.class_index:
+                continue
+            for day, periods in days.items():
+                self._check_slots(f'Conflicts of class {class_id}', day, periods)
+                self.conflict_masks[self.mask_index(class_id, day)] = _periods_mask(periods)
+
+    def _check_slots(self, owner, day, periods):
+        """Check that a day and its periods exist before they are turned into a mask.
+
+        Raises:
+            ValueError: If the day is unknown or a period is outside the day
+        """
+        if day not in self.day_index:
+            raise ValueError(f'{owner}: unknown day {day}')
+        outside = [period for period in periods if period not in self.periods]
+        if outside:
+            raise ValueError(f'{owner}: period {outside[0]} on {day} is outside periods 1-{len(self.periods)}')
+
+    def mask_index(self, class_id, day):
+        """Get the flat array index of a class and day."""
+        return self.class_index[class_id] * len(self.days) + self.day_index[day]
+
+    def conflict_mask(self, class_id, day):
+        """Get the periods a class can't take on a day because of its conflicts."""
+        if class_id not in self.class_index:
+            return 0
+        return self.conflict_masks[self.mask_index(class_id, day)]
+
+    def conflict_periods(self):
+        """Decode the conflict masks back into the input's conflicts dictionary.
+
+        Returns:
+            Dictionary mapping class IDs to days to sorted conflict periods,
+            without empty entries
+        """
+        conflicts = {}
+        for class_id in self.class_ids:
+            days = {}
+            for day in self.days:
+                mask = self.conflict_mask(class_id, day)
+                if mask:
+                    days[day] = [period for period in self.periods if mask & (1 << (period - 1))]
+            if days:
+                conflicts[class_id] = days
+        return conflicts
+
+    def teacher_mask(self, day):
+        """Get the periods on a day when the teacher is unavailable."""
+        return self.teacher_masks[self.day_index[day]]
+
+    def blocked_mask(self, class_id, day):
+        """Get the periods a class can never take on a day."""
+        return self.conflict_mask(class_id, day) | self.teacher_mask(day)
+
+
+def _periods_mask(periods):
+    """Convert a list of periods into a bitmask."""
+    mask = 0
+    for period in periods:
+        mask |= 1 << (period - 1)
+    return mask
@@ -4,15 +4,58 @@ Thunder Scheduler Constraint Solver
 This script uses Google OR-Tools to solve the class scheduling problem.
 """
 
-from ortools.sat.python import cp_model
+import argparse
+import hashlib
 import json
+import os
 import sys
 import time
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Allow running as a script as well as importing as solver.constraint_solver
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.compiled_problem import CompiledProblem
+from solver.presolve import presolve
+from solver.schedule_diff import diff_schedules
+from solver.solution_validator import check_schedule
+from solver.symmetry import class_groups, expand_solution
+
+# CP-SAT status codes (CpSolverStatus in cp_model.proto), usable without importing OR-Tools
+UNKNOWN = 0
+MODEL_INVALID = 1
+FEASIBLE = 2
+INFEASIBLE = 3
+OPTIMAL = 4
+
+# Solve time limit when none is given
+DEFAULT_TIME_LIMIT_SECONDS = 60
+
+# Approximate process memory per model variable (Python wrapper, index
+# entries and CP-SAT proto), per constraint and per linear term, measured on Linux
+BYTES_PER_VARIABLE = 500
+BYTES_PER_CONSTRAINT = 600
+BYTES_PER_TERM = 20
+
+
+def _cp_model():
+    """Import the OR-Tools CP-SAT module on first use.
+    
+    Loading OR-Tools dominates start-up time, so it is deferred until a model
+    is actually built; validation and parsing paths never pay for it.
+    """
+    from ortools.sat.python import cp_model
+    return cp_model
+
+
 class ScheduleSolver:
     """Class for solving the scheduling problem using OR-Tools CP-SAT solver."""
     
-    def __init__(self, data):
+    def __init__(self, data, compiled=None):
         """Initialize the solver with input data.
         
         Args:
@@ -24,33 +67,132 @@ class ScheduleSolver:
                 - startDate: Start date of the schedule
                 - endDate: End date of the schedule
                 - rotationWeeks: Number of weeks in the rotation
+                - lockedAssignments: Optional list of assignments (classId,
+                  week, day, period) that must stay as they are; locked
+                  classes get no variables and their slots and capacity are
+                  taken before the other classes are scheduled (implies presolve)
+                - solverOptions: Optional dictionary with solver tuning options:
+                    - encoding: 'boolean' (one variable per class and slot, default)
+                      or 'sparse' (no variables for conflict/unavailable slots)
+                    - breakEncoding: 'sum' (default), 'implication' or 'slot'
+                      (one constraint per pair of adjacent slots, so the model
+                      grows linearly instead of quadratically with the classes)
+                    - calendarEncoding: 'direct' (default: calendar rules sum the
+                      class literals of every slot they cover) or 'occupancy'
+                      (one occupancy literal per slot, channelled from its class
+                      literals, and the calendar rules stated over those)
+                    - redundantConstraints: Also post implied day/week/class capacity
+                      constraints to strengthen propagation (default: False)
+                    - randomSeed: Random seed for the CP-SAT search
+                    - numWorkers: Number of CP-SAT search workers
+                    - verifySolution: Validate the extracted solution before
+                      returning it and report the result (default: False)
+                    - referenceSchedule: List of assignments from an earlier run;
+                      moving a class away from its reference slot is penalised
+                      and the result reports the diff against it
+                    - presolve: Fix classes left with a single slot and propagate
+                      what they rule out before building the model (see
+                      solver.presolve); fixed classes and ruled-out slots get
+                      no variables (default: False)
+                    - symmetryReduction: Decide slots per group of classes with
+                      identical conflicts instead of per class, then hand the
+                      slots to the members (default: False; ignored with a
+                      referenceSchedule, which tells the members apart)
+                    - variableNames: Name the model variables (default: True);
+                      disable in production to save memory
+                    - memoryBudgetMB: Estimated model size above which the build
+                      switches to the sparse encoding, slot break encoding,
+                      occupancy calendar encoding and unnamed variables, and
+                      gives up if that is still too large
+                    - reproducible: Solve deterministically so a recorded request
+                      can be replayed with identical results (default: False):
+                      the seed defaults to 0, numWorkers to 1, and the time limit
+                      is deterministic (deterministicTimeLimit, default: the
+                      solve time limit) instead of wall-clock
+                    - exportModelDir: Directory to export the built model, its
+                      input and solver parameters to (see solver.saved_model)
+            compiled: Optional CompiledProblem already built from the input
+                data, to share between solvers of the same problem; required
+                when the data leaves out conflicts because they arrived as
+                masks (see wire_format.unpack_compiled)
         """
+        self.data = data
         self.classes = data['classes']
-        self.conflicts = data['conflicts']
         self.teacher_availability = data['teacherAvailability']
         self.constraints = data['constraints']
         self.rotation_weeks = data.get('rotationWeeks', 1)
+        self.options = data.get('solverOptions', {})
+        self.locked_assignments = data.get('lockedAssignments', [])
+        self.locked_classes = {assignment['classId'] for assignment in self.locked_assignments}
         self.days = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
         self.periods = list(range(1, 9))  # 8 periods per day
-        self.model = cp_model.CpModel()
-        self.solver = cp_model.CpSolver()
+        self.compiled = compiled or CompiledProblem(data)
+        self.model = None
+        self.solver = None
         self.assignments = {}
+        self.variable_indices = []
+        self.slot_literals = {}
+        self.occupancy = {}
+        self.class_literals = {}
+        self.groups = {}
+        self.group_of = {}
+        self.presolved = None
+        self.fixed_slots = {}
         self.solution_found = False
+        self.build_time = None
         
     def build_model(self):
         """Build the constraint model with all variables and constraints."""
+        self.model = _cp_model().CpModel()
+        sparse = self.options.get('encoding', 'boolean') == 'sparse'
+        named = self.options.get('variableNames', True)
+        
+        if self.options.get('presolve', False) or self.locked_assignments:
+            if self.presolved is None:
+                self.presolved = presolve(self.compiled, self.locked_assignments)
+            self.fixed_slots = {slot: class_id for class_id, slot in self.presolved.fixed.items()}
+        
+        # Classes the model decides on, each standing for a group of interchangeable classes
+        self.groups = {
+            class_id: members for class_id, members in self._class_groups().items()
+            if class_id not in self.presolved.fixed
+        } if self.presolved is not None else self._class_groups()
+        self.group_of = {member: class_id for class_id, members in self.groups.items() for member in members}
+        
         # Create variables
-        for class_obj in self.classes:
-            class_id = class_obj['id']
+        for week in range(1, self.rotation_weeks + 1):
+            for day in self.days:
+                for period in self.periods:
+                    self.slot_literals[(week, day, period)] = []
+        
+        for class_id in self.groups:
+            self.class_literals[class_id] = []
             for week in range(1, self.rotation_weeks + 1):
                 for day in self.days:
                     for period in self.periods:
-                        var_name = f'class_{class_id}_week_{week}_day_{day}_period_{period}'
-                        self.assignments[(class_id, week, day, period)] = self.model.NewBoolVar(var_name)
+                        # Presolve and the sparse encoding never create variables for slots the class can't take
+                        if self.presolved is not None:
+                            if not self.presolved.allows(class_id, week, day, period):
+                                continue
+                        elif sparse and self._is_blocked(class_id, day, period):
+                            continue
+                        var_name = f'class_{class_id}_week_{week}_day_{day}_period_{period}' if named else ''
+                        var = self.model.NewBoolVar(var_name)
+                        self.assignments[(class_id, week, day, period)] = var
+                        self.variable_indices.append(var.Index())
+                        self.slot_literals[(week, day, period)].append(var)
+                        self.class_literals[class_id].append(var)
+        
+        if self.options.get('calendarEncoding', 'direct') == 'occupancy':
+            for slot, literals in self.slot_literals.items():
+                if literals:
+                    week, day, period = slot
+                    self.occupancy[slot] = self.model.NewBoolVar(f'occupied_week_{week}_day_{day}_period_{period}' if named else '')
         
         # Add constraints
-        self._add_class_conflict_constraints()
-        self._add_teacher_availability_constraints()
+        if not sparse and self.presolved is None:
+            self._add_class_conflict_constraints()
+            self._add_teacher_availability_constraints()
         self._add_one_class_per_slot_constraints()
         self._add_each_class_once_constraints()
         self._add_max_classes_per_day_constraints()
@@ -59,14 +201,91 @@ class ScheduleSolver:
         
         if self.constraints.get('requireBreakAfterClass', False):
             self._add_break_after_class_constraints()
+        
+        if self.options.get('redundantConstraints', False):
+            self._add_redundant_constraints()
+        
+        if self.options.get('referenceSchedule'):
+            self._add_stability_objective()
+    
+    def _is_blocked(self, class_id, day, period):
+        """Check whether a class can never be scheduled in a period.
+        
+        Args:
+            class_id: ID of the class
+            day: Day name
+            period: Period number
             
+        Returns:
+            True if the period is a class conflict or the teacher is unavailable
+        """
+        return bool(self.compiled.blocked_mask(class_id, day) & (1 << (period - 1)))
+            
+    def _class_groups(self, options=None):
+        """Get the classes the model decides on.
+        
+        Args:
+            options: Solver options to group for (default: the solver's own)
+            
+        Returns:
+            Dictionary mapping each modelled class ID to the class IDs it
+            stands for: itself alone, or its group under symmetry reduction
+        """
+        options = self.options if options is None else options
+        if options.get('symmetryReduction', False) and not options.get('referenceSchedule'):
+            # Fixed classes get no variables, so they can't stand in for a group
+            return class_groups(self.compiled, singletons=self._fixed_classes())
+        return {class_id: [class_id] for class_id in self.compiled.class_ids}
+    
+    def _fixed_classes(self):
+        """Get the IDs of the classes that are not left to the model."""
+        if self.presolved is not None:
+            return self.presolved.fixed.keys()
+        return self.locked_classes
+    
+    def _slot_terms(self, week, day, period):
+        """Get the literals whose sum tells whether a slot is occupied.
+        
+        Args:
+            week: Week number
+            day: Day name
+            period: Period number
+            
+        Returns:
+            The constant 1 for a slot taken by a class fixed in presolve, the
+            slot's occupancy literal in the occupancy calendar encoding,
+            otherwise the class literals of the slot
+        """
+        slot = (week, day, period)
+        if slot in self.fixed_slots:
+            return [1]
+        if slot in self.occupancy:
+            return [self.occupancy[slot]]
+        return self.slot_literals[slot]
+    
+    def _add_slot_limit(self, terms, limit):
+        """Limit a sum of slot terms, moving the constants of fixed slots into the bound.
+        
+        Args:
+            terms: Slot terms as returned by _slot_terms
+            limit: Most occupied slots allowed
+            
+        Returns:
+            The constraint, or None when the terms hold no literals; presolve
+            never fixes classes beyond a limit, so such limits always hold
+        """
+        literals = [term for term in terms if not isinstance(term, int)]
+        if not literals:
+            return None
+        return self.model.Add(sum(literals) <= limit - (len(terms) - len(literals)))
+    
     def _add_class_conflict_constraints(self):
         """Add constraints for class conflicts (when classes can't be scheduled)."""
-        for class_obj in self.classes:
-            class_id = class_obj['id']
-            if class_id in self.conflicts:
-                for day, periods in self.conflicts[class_id].items():
-                    for period in periods:
+        for class_id in self.groups:
+            for day in self.days:
+                mask = self.compiled.conflict_mask(class_id, day)
+                for period in self.periods:
+                    if mask & (1 << (period - 1)):
                         for week in range(1, self.rotation_weeks + 1):
                             # Class can't be scheduled during conflict periods
                             self.model.Add(self.assignments[(class_id, week, day, period)] == 0)
@@ -77,8 +296,7 @@ class ScheduleSolver:
             for period in periods:
                 for week in range(1, self.rotation_weeks + 1):
                     # No classes can be scheduled when teacher is unavailable
-                    for class_obj in self.classes:
-                        class_id = class_obj['id']
+                    for class_id in self.groups:
                         self.model.Add(self.assignments[(class_id, week, day, period)] == 0)
     
     def _add_one_class_per_slot_constraints(self):
@@ -86,23 +304,22 @@ class ScheduleSolver:
         for week in range(1, self.rotation_weeks + 1):
             for day in self.days:
                 for period in self.periods:
-                    # Sum of all classes assigned to this slot must be <= 1
-                    self.model.Add(sum(
-                        self.assignments[(class_obj['id'], week, day, period)]
-                        for class_obj in self.classes
-                    ) <= 1)
+                    literals = self.slot_literals[(week, day, period)]
+                    # Slots nobody can take (sparse encoding) need no constraint
+                    if not literals:
+                        continue
+                    if (week, day, period) in self.occupancy:
+                        # The occupancy literal is a boolean, so this also allows one class at most
+                        self.model.Add(sum(literals) == self.occupancy[(week, day, period)])
+                    else:
+                        # Sum of all classes assigned to this slot must be <= 1
+                        self.model.Add(sum(literals) <= 1)
     
     def _add_each_class_once_constraints(self):
         """Add constraints to ensure each class is scheduled exactly once per rotation."""
-        for class_obj in self.classes:
-            class_id = class_obj['id']
-            # Sum of all assignments for this class must be exactly 1
-            self.model.Add(sum(
-                self.assignments[(class_id, week, day, period)]
-                for week in range(1, self.rotation_weeks + 1)
-                for day in self.days
-                for period in self.periods
-            ) == 1)
+        for class_id, members in self.groups.items():
+            # Sum of all assignments for this class (or each member of its group) must be exactly 1
+            self.model.Add(sum(self.class_literals[class_id]) == len(members))
     
     def _add_max_classes_per_day_constraints(self):
         """Add constraints for maximum classes per day."""
@@ -111,11 +328,11 @@ class ScheduleSolver:
         for week in range(1, self.rotation_weeks + 1):
             for day in self.days:
                 # Sum of all classes on this day must be <= max_classes_per_day
-                self.model.Add(sum(
-                    self.assignments[(class_obj['id'], week, day, period)]
-                    for class_obj in self.classes
+                self._add_slot_limit([
+                    literal
                     for period in self.periods
-                ) <= max_classes_per_day)
+                    for literal in self._slot_terms(week, day, period)
+                ], max_classes_per_day)
     
     def _add_max_classes_per_week_constraints(self):
         """Add constraints for maximum classes per week."""
@@ -123,12 +340,12 @@ class ScheduleSolver:
         
         for week in range(1, self.rotation_weeks + 1):
             # Sum of all classes in this week must be <= max_classes_per_week
-            self.model.Add(sum(
-                self.assignments[(class_obj['id'], week, day, period)]
-                for class_obj in self.classes
+            self._add_slot_limit([
+                literal
                 for day in self.days
                 for period in self.periods
-            ) <= max_classes_per_week)
+                for literal in self._slot_terms(week, day, period)
+            ], max_classes_per_week)
     
     def _add_consecutive_class_constraints(self):
         """Add constraints to limit consecutive classes."""
@@ -140,27 +357,161 @@ class ScheduleSolver:
                     # For each possible consecutive sequence of periods
                     consecutive_periods = list(range(start_period, start_period + max_consecutive + 1))
                     # Sum of all classes in these consecutive periods must be <= max_consecutive
-                    self.model.Add(sum(
-                        self.assignments[(class_obj['id'], week, day, period)]
-                        for class_obj in self.classes
+                    self._add_slot_limit([
+                        literal
                         for period in consecutive_periods
-                    ) <= max_consecutive)
+                        for literal in self._slot_terms(week, day, period)
+                    ], max_consecutive)
     
     def _add_break_after_class_constraints(self):
         """Add constraints to require a break after each class."""
+        break_encoding = self.options.get('breakEncoding', 'sum')
+        use_implications = break_encoding == 'implication'
+        
         for week in range(1, self.rotation_weeks + 1):
             for day in self.days:
-                for period in range(1, 7):  # Only up to period 7 (since period 8 is the last)
-                    for class_obj in self.classes:
-                        class_id = class_obj['id']
+                for period in self.periods[:-1]:  # The last period has no next period
+                    next_slot = self._slot_terms(week, day, period + 1)
+                    if not next_slot:
+                        continue
+                    if break_encoding == 'slot' or self.occupancy:
+                        # Each slot holds one class at most, so both slots together may hold one
+                        self._add_slot_limit(self._slot_terms(week, day, period) + next_slot, 1)
+                        continue
+                    for literal in self.slot_literals[(week, day, period)]:
                         # If a class is scheduled in this period, no class can be scheduled in the next period
-                        self.model.Add(
-                            self.assignments[(class_id, week, day, period)] + 
-                            sum(self.assignments[(other_class['id'], week, day, period + 1)] 
-                                for other_class in self.classes) <= 1
-                        )
+                        if use_implications:
+                            self.model.Add(sum(next_slot) == 0).OnlyEnforceIf(literal)
+                        else:
+                            self.model.Add(literal + sum(next_slot) <= 1)
+    
+    def _add_redundant_constraints(self):
+        """Add implied constraints that strengthen propagation on dense instances.
+        
+        None of these remove solutions: they restate consequences of the other
+        rules so CP-SAT can prune near-capacity instances early in the search.
+        """
+        max_classes_per_day = self.constraints.get('maxClassesPerDay', 4)
+        max_classes_per_week = self.constraints.get('maxClassesPerWeek', 16)
+        
+        # Per-day capacity implied by teacher availability and the consecutive/break rules
+        day_capacity = {
+            day: min(max_classes_per_day, self._max_usable_periods(day))
+            for day in self.days
+        }
+        
+        # Classes fixed in presolve use up capacity without literals
+        fixed_per_day = {}
+        for week, day, _ in self.fixed_slots:
+            fixed_per_day[(week, day)] = fixed_per_day.get((week, day), 0) + 1
+        
+        for week in range(1, self.rotation_weeks + 1):
+            for day in self.days:
+                if day_capacity[day] < max_classes_per_day:
+                    self.model.Add(sum(
+                        literal
+                        for period in self.periods
+                        for literal in self.slot_literals[(week, day, period)]
+                    ) <= day_capacity[day] - fixed_per_day.get((week, day), 0))
+        
+        # Per-week capacity implied by the per-day capacities
+        week_capacity = min(max_classes_per_week, sum(day_capacity.values()))
+        if week_capacity < max_classes_per_week:
+            for week in range(1, self.rotation_weeks + 1):
+                self.model.Add(sum(
+                    literal
+                    for day in self.days
+                    for period in self.periods
+                    for literal in self.slot_literals[(week, day, period)]
+                ) <= week_capacity - sum(
+                    count for (fixed_week, _), count in fixed_per_day.items() if fixed_week == week
+                ))
+        
+        # Every class is scheduled once, so the rotation must hold all of them
+        all_literals = [literal for literals in self.slot_literals.values() for literal in literals]
+        self.model.Add(sum(all_literals) == len(self.classes) - len(self.fixed_slots))
+        self.model.Add(sum(all_literals) <= week_capacity * self.rotation_weeks - len(self.fixed_slots))
+        
+        # Classes confined to a set of allowed slots must all fit into those slots
+        pattern_counts = {}
+        for class_obj in self.classes:
+            if class_obj['id'] not in self.group_of:
+                # Fixed in presolve, so not counted by the literals below
+                continue
+            allowed = frozenset(
+                (day, period)
+                for day in self.days
+                for period in self.periods
+                if not self._is_blocked(class_obj['id'], day, period)
+            )
+            pattern_counts[allowed] = pattern_counts.get(allowed, 0) + 1
+        
+        all_slots = len(self.days) * len(self.periods)
+        for allowed in pattern_counts:
+            if len(allowed) == all_slots:
+                continue
+            confined = sum(
+                count for pattern, count in pattern_counts.items() if pattern <= allowed
+            )
+            if confined == 1:
+                # A single class in its own slots is already covered by the each-class-once rule
+                continue
+            self.model.Add(sum(
+                literal
+                for week in range(1, self.rotation_weeks + 1)
+                for day, period in allowed
+                for literal in self.slot_literals[(week, day, period)]
+            ) >= confined)
+    
+    def _add_stability_objective(self):
+        """Penalise moving classes away from their slot in the reference schedule.
+        
+        The reference slots are also given to CP-SAT as a hint, so a re-solve
+        starts from the previous schedule and only repairs what changed.
+        """
+        kept = []
+        
+        for assignment in self.options['referenceSchedule']:
+            key = (assignment['classId'], assignment.get('week', 1), assignment['day'], assignment['period'])
+            # Classes whose reference slot no longer exists have to move anyway
+            if key in self.assignments:
+                kept.append(self.assignments[key])
+                self.model.AddHint(self.assignments[key], 1)
+        
+        if kept:
+            self.model.Minimize(len(kept) - sum(kept))
+    
+    def _max_usable_periods(self, day):
+        """Compute the most classes that can be scheduled on a day.
+        
+        Takes teacher availability and the longest allowed run of consecutive
+        classes into account (a single period when a break is required).
+        
+        Args:
+            day: Day name
+            
+        Returns:
+            Maximum number of periods usable on the day
+        """
+        if self.constraints.get('requireBreakAfterClass', False):
+            max_run = 1
+        else:
+            max_run = self.constraints.get('maxConsecutiveClasses', 2)
+        blocked = self.teacher_availability.get(day, [])
+        
+        # Most classes placed so far, keyed by the length of the current run
+        best = {0: 0}
+        for period in self.periods:
+            next_best = {0: max(best.values())}
+            if period not in blocked:
+                for run, count in best.items():
+                    if run < max_run:
+                        next_best[run + 1] = max(next_best.get(run + 1, 0), count + 1)
+            best = next_best
+        
+        return max(best.values())
     
-    def solve(self, time_limit_seconds=60):
+    def solve(self, time_limit_seconds=DEFAULT_TIME_LIMIT_SECONDS):
         """Solve the constraint model.
         
         Args:
@@ -169,25 +520,288 @@ class ScheduleSolver:
         Returns:
             Dictionary with solution status and assignments if found
         """
+        self.build_time = None
+        result = self._solve(time_limit_seconds)
+        if self.options.get('reproducible', False):
+            if self.solver is None:
+                # Presolve settled the solve before the search; record the parameters it would have used
+                self.create_solver(time_limit_seconds)
+            result['reproducibility'] = self.reproducibility_info(result)
+        metrics.record_solve(result, self.build_time)
+        return result
+    
+    def _solve(self, time_limit_seconds):
+        """Presolve, build and solve the model, timing the build in self.build_time."""
+        build_start = time.time()
+        
+        # A presolve the caller already ran (and maybe narrowed further) is kept
+        if self.presolved is None and (self.options.get('presolve', False) or self.locked_assignments):
+            self.presolved = presolve(self.compiled, self.locked_assignments)
+        if self.presolved is not None and self.presolved.infeasible_class is not None:
+            class_id = self.presolved.infeasible_class
+            if class_id in self.locked_classes:
+                message = f'Locked assignment of class {class_id} breaks the scheduling constraints'
+            else:
+                message = f'Presolve left no slot for class {class_id}'
+            return {
+                'status': 'infeasible',
+                'statusCode': INFEASIBLE,
+                'message': message,
+                'solveTime': 0,
+                'presolve': self.presolved.stats
+            }
+        if self.presolved is not None and len(self.presolved.fixed) == len(self.compiled.class_ids):
+            # Presolve placed every class, so there is nothing left to search
+            self.build_time = time.time() - build_start
+            self.solution_found = True
+            result = self._extract_solution(OPTIMAL, 0)
+            result['presolve'] = self.presolved.stats
+            return result
+        
+        estimate = self._apply_memory_budget()
+        if estimate is not None and estimate['estimatedBytes'] > self.options['memoryBudgetMB'] * 2 ** 20:
+            return {
+                'status': 'error',
+                'statusCode': UNKNOWN,
+                'message': f"Model needs about {estimate['estimatedBytes'] // 2 ** 20} MB, "
+                           f"more than the {self.options['memoryBudgetMB']} MB memory budget",
+                'solveTime': 0,
+                'modelStats': estimate
+            }
+        
         self.build_model()
+        self.create_solver(time_limit_seconds)
+        self.build_time = time.time() - build_start
         
-        # Set time limit
-        self.solver.parameters.max_time_in_seconds = time_limit_seconds
+        export_path = None
+        if 'exportModelDir' in self.options:
+            from solver.saved_model import export_model
+            export_path = export_model(self, self.options['exportModelDir'])
         
         start_time = time.time()
-        status = self.solver.Solve(self.model)
+        status = int(self.solver.Solve(self.model))
         solve_time = time.time() - start_time
         
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        if status == OPTIMAL or status == FEASIBLE:
             self.solution_found = True
-            return self._extract_solution(status, solve_time)
+            result = self._extract_solution(status, solve_time)
         else:
-            return {
+            result = {
                 'status': 'infeasible',
                 'statusCode': status,
                 'message': 'No solution found that satisfies all constraints',
                 'solveTime': solve_time
             }
+        
+        result['modelStats'] = self.model_stats()
+        if self.presolved is not None:
+            result['presolve'] = self.presolved.stats
+        if export_path is not None:
+            result['exportPath'] = export_path
+        return result
+    
+    def estimate_model_size(self, options=None):
+        """Estimate the size of the model before building it.
+        
+        Counts the variables, constraints and linear terms build_model would
+        create, without importing OR-Tools.
+        
+        Args:
+            options: Solver options to estimate for (default: the solver's own)
+            
+        Returns:
+            Dictionary with numVariables, numConstraints, numTerms and
+            estimatedBytes
+        """
+        options = self.options if options is None else options
+        sparse = options.get('encoding', 'boolean') == 'sparse'
+        occupancy = options.get('calendarEncoding', 'direct') == 'occupancy'
+        slot_breaks = occupancy or options.get('breakEncoding', 'sum') == 'slot'
+        weeks = self.rotation_weeks
+        max_consecutive = self.constraints.get('maxConsecutiveClasses', 2)
+        fixed_classes = self._fixed_classes()
+        model_classes = [class_id for class_id in self._class_groups(options) if class_id not in fixed_classes]
+        num_classes = len(model_classes)
+        
+        # Literals per (day, period) in one week, and the terms a calendar rule sums for the slot
+        literals = {}
+        for day in self.days:
+            for period in self.periods:
+                blocked = sum(
+                    1 for class_id in model_classes if self._is_blocked(class_id, day, period)
+                )
+                literals[(day, period)] = num_classes - blocked if sparse else num_classes
+        terms = {slot: min(count, 1) if occupancy else count for slot, count in literals.items()}
+        
+        per_week = sum(literals.values())
+        num_slots = sum(1 for count in literals.values() if count)
+        num_variables = weeks * per_week
+        
+        # Slot and class rules sum every literal once, day and week rules every slot's terms
+        num_constraints = weeks * (num_slots + len(self.days) + 1) + num_classes
+        num_terms = weeks * 2 * (per_week + sum(terms.values()))
+        
+        if occupancy:
+            # One occupancy literal per usable slot, also part of its slot's channelling constraint
+            num_variables += weeks * num_slots
+            num_terms += weeks * num_slots
+        
+        if not sparse:
+            # Conflict and teacher availability rules fix blocked literals one by one
+            num_fixed = sum(
+                bin(self.compiled.conflict_mask(class_id, day)).count('1')
+                for class_id in model_classes
+                for day in self.days
+            )
+            num_fixed += num_classes * sum(bin(mask).count('1') for mask in self.compiled.teacher_masks)
+            num_constraints += weeks * num_fixed
+            num_terms += weeks * num_fixed
+        
+        for day in self.days:
+            for start_period in range(1, len(self.periods) + 1 - max_consecutive):
+                num_constraints += weeks
+                num_terms += weeks * sum(
+                    terms[(day, period)] for period in range(start_period, start_period + max_consecutive + 1)
+                )
+            
+            if self.constraints.get('requireBreakAfterClass', False):
+                for period in self.periods[:-1]:
+                    if not terms[(day, period + 1)]:
+                        continue
+                    if slot_breaks:
+                        num_constraints += weeks
+                        num_terms += weeks * (terms[(day, period)] + terms[(day, period + 1)])
+                    else:
+                        num_constraints += weeks * literals[(day, period)]
+                        num_terms += weeks * literals[(day, period)] * (1 + literals[(day, period + 1)])
+        
+        return {
+            'numVariables': num_variables,
+            'numConstraints': num_constraints,
+            'numTerms': num_terms,
+            'estimatedBytes': (
+                num_variables * BYTES_PER_VARIABLE
+                + num_constraints * BYTES_PER_CONSTRAINT
+                + num_terms * BYTES_PER_TERM
+            )
+        }
+    
+    def _apply_memory_budget(self):
+        """Switch to leaner model options when the estimated model exceeds the memory budget.
+        
+        Returns:
+            Size estimate for the options finally used, or None without a budget
+        """
+        if 'memoryBudgetMB' not in self.options:
+            return None
+        
+        budget = self.options['memoryBudgetMB'] * 2 ** 20
+        estimate = self.estimate_model_size()
+        
+        fallbacks = (
+            {'encoding': 'sparse'},
+            {'breakEncoding': 'slot'},
+            {'calendarEncoding': 'occupancy'},
+            {'variableNames': False},
+        )
+        for fallback in fallbacks:
+            if estimate['estimatedBytes'] <= budget:
+                break
+            self.options = {**self.options, **fallback}
+            estimate = self.estimate_model_size()
+        
+        return estimate
+    
+    def model_stats(self):
+        """Report the size of the built model and the peak memory of the process.
+        
+        Returns:
+            Dictionary with variable and constraint counts, the options that
+            shaped the model and the peak resident set size in bytes
+        """
+        proto = self.model.Proto()
+        return {
+            'numVariables': len(proto.variables),
+            'numConstraints': len(proto.constraints),
+            'encoding': self.options.get('encoding', 'boolean'),
+            'breakEncoding': self.options.get('breakEncoding', 'sum'),
+            'calendarEncoding': self.options.get('calendarEncoding', 'direct'),
+            'variableNames': self.options.get('variableNames', True),
+            'peakRssBytes': _peak_rss_bytes()
+        }
+    
+    def create_solver(self, time_limit_seconds):
+        """Create the CP-SAT solver with the time limit and search options.
+        
+        Args:
+            time_limit_seconds: Maximum time to spend in each solve
+        """
+        self.solver = _cp_model().CpSolver()
+        
+        parameters = self.solver.parameters
+        if self.options.get('reproducible', False):
+            # Pin everything the search depends on and bound it by work done rather than wall time
+            parameters.random_seed = self.options.get('randomSeed', 0)
+            parameters.num_workers = self.options.get('numWorkers', 1)
+            parameters.max_deterministic_time = self.options.get('deterministicTimeLimit', time_limit_seconds)
+            if parameters.num_workers > 1:
+                parameters.interleave_search = True
+            return
+        
+        # Set time limit and search parameters
+        parameters.max_time_in_seconds = time_limit_seconds
+        if 'randomSeed' in self.options:
+            parameters.random_seed = self.options['randomSeed']
+        if 'numWorkers' in self.options:
+            parameters.num_workers = self.options['numWorkers']
+    
+    def input_data(self):
+        """Get the input data in its JSON form.
+        
+        Returns:
+            The input data, with the conflicts decoded from the compiled
+            masks when they arrived as a binary frame
+        """
+        if 'conflicts' in self.data:
+            return self.data
+        return dict(self.data, conflicts=self.compiled.conflict_periods())
+    
+    def reproducibility_info(self, result):
+        """Describe a solve well enough to check a replay against it.
+        
+        Args:
+            result: Solver result of this solve
+            
+        Returns:
+            Dictionary with fingerprints of the input, solver parameters and
+            solution, the parameters themselves and the OR-Tools version
+        """
+        from ortools import __version__ as ortools_version
+        
+        parameters = str(self.solver.parameters)
+        return {
+            'inputFingerprint': input_fingerprint(self.input_data()),
+            'parametersFingerprint': _fingerprint(parameters),
+            'solutionFingerprint': _fingerprint(result.get('solution')),
+            'parameters': parameters,
+            'ortoolsVersion': ortools_version
+        }
+    
+    def chosen_positions(self):
+        """Get the positions in self.assignments of the literals true in the last solution.
+        
+        Returns:
+            List of positions, empty when presolve or locks left nothing to decide
+        """
+        if not self.variable_indices:
+            return []
+        
+        # Only needed once a solution exists, so importing it doesn't slow start-up
+        import numpy as np
+        
+        # Read every variable value in one call and pick the true assignments vectorially
+        values = np.array(self.solver.ResponseProto().solution)
+        return np.flatnonzero(values[np.asarray(self.variable_indices, dtype=np.int64)]).tolist()
     
     def _extract_solution(self, status, solve_time):
         """Extract the solution from the solver.
@@ -199,24 +813,26 @@ class ScheduleSolver:
         Returns:
             Dictionary with solution details
         """
+        keys = list(self.assignments)
+        
         solution = []
+        for position in self.chosen_positions():
+            class_id, week, day, period = keys[position]
+            solution.append({
+                'classId': class_id,
+                'week': week,
+                'day': day,
+                'period': period
+            })
         
-        for class_obj in self.classes:
-            class_id = class_obj['id']
-            for week in range(1, self.rotation_weeks + 1):
-                for day in self.days:
-                    for period in self.periods:
-                        if self.solver.Value(self.assignments[(class_id, week, day, period)]) == 1:
-                            solution.append({
-                                'classId': class_id,
-                                'week': week,
-                                'day': day,
-                                'period': period
-                            })
+        if len(self.group_of) > len(self.groups):
+            solution = expand_solution(solution, self.groups, self.compiled.day_index)
+        if self.presolved is not None:
+            solution.extend(self.presolved.fixed_assignments())
         
-        status_str = 'optimal' if status == cp_model.OPTIMAL else 'feasible'
+        status_str = 'optimal' if status == OPTIMAL else 'feasible'
         
-        return {
+        result = {
             'status': 'success',
             'statusCode': status,
             'statusString': status_str,
@@ -225,6 +841,16 @@ class ScheduleSolver:
             'numClasses': len(self.classes),
             'numAssignments': len(solution)
         }
+        
+        if self.options.get('referenceSchedule'):
+            result['diff'] = diff_schedules(self.options['referenceSchedule'], solution)
+        
+        if self.options.get('verifySolution', False):
+            start_time = time.time()
+            result['validation'] = self.validate_solution(solution)
+            result['verificationTime'] = time.time() - start_time
+        
+        return result
     
     def validate_solution(self, assignments):
         """Validate if a given solution satisfies all constraints.
@@ -233,30 +859,123 @@ class ScheduleSolver:
             assignments: List of assignments to validate
             
         Returns:
-            Dictionary with validation results
+            Dictionary with validation results, as ScheduleValidator.validate
         """
-        # Implementation for validating an existing solution
-        # This would check all constraints against the provided assignments
-        # For now, return a placeholder
-        return {
-            'valid': True,
-            'violations': []
-        }
+        # Reuse the solver's compiled indices and masks instead of re-parsing the input
+        return check_schedule(self.compiled, assignments)
+
+
+def _fingerprint(value):
+    """Hash a JSON-serialisable value in a canonical encoding."""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def input_fingerprint(data):
+    """Fingerprint scheduling input data independently of its wire format.
+    
+    Conflicts are normalised (sorted periods, no empty entries) so the same
+    request gives the same fingerprint whether it arrived as JSON or binary.
+    
+    Args:
+        data: Dictionary containing scheduling input data
+        
+    Returns:
+        Hex SHA-256 digest
+    """
+    conflicts = {}
+    for class_id, days in data['conflicts'].items():
+        class_conflicts = {day: sorted(periods) for day, periods in days.items() if periods}
+        if class_conflicts:
+            conflicts[class_id] = class_conflicts
+    return _fingerprint(dict(data, conflicts=conflicts))
+
+
+def replay(record):
+    """Re-run a recorded reproducible solve and compare it with the recording.
+    
+    Args:
+        record: Dictionary with the recorded 'input' data, its
+            'timeLimitSeconds' and its 'result'
+        
+    Returns:
+        Dictionary with 'identical', the list of 'mismatches' (names of the
+        fingerprints or versions that differ) and the new 'result'
+    """
+    expected = record['result'].get('reproducibility')
+    if expected is None:
+        raise ValueError('The recorded result was not solved in reproducible mode')
+    
+    # The limit shapes the reproducible parameters; older recordings used the default
+    time_limit_seconds = record.get('timeLimitSeconds', DEFAULT_TIME_LIMIT_SECONDS)
+    result = ScheduleSolver(record['input']).solve(time_limit_seconds)
+    actual = result['reproducibility']
+    mismatches = [
+        key for key in ('inputFingerprint', 'parametersFingerprint', 'ortoolsVersion', 'solutionFingerprint')
+        if expected[key] != actual[key]
+    ]
+    if result['status'] != record['result']['status']:
+        mismatches.append('status')
+    
+    return {
+        'identical': not mismatches,
+        'mismatches': mismatches,
+        'result': result
+    }
+
+
+def _peak_rss_bytes():
+    """Get the peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
 
 
 def main():
     """Main function to read input and run solver."""
+    parser = argparse.ArgumentParser(description='Thunder Scheduler constraint solver')
+    parser.add_argument('--format', choices=['json', 'binary'], default='json',
+                        help='Wire format of stdin input and stdout output (default: json)')
+    parser.add_argument('--record', metavar='PATH',
+                        help='Also write the input and result to PATH for a later --replay')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='Re-run the solve recorded in PATH and report whether it is identical')
+    args = parser.parse_args()
+    metrics.configure('constraint_solver')
+    
+    if args.replay:
+        with open(args.replay) as record_file:
+            print(json.dumps(replay(json.load(record_file))))
+        return
+    
     # Read input from stdin
-    input_data = json.loads(sys.stdin.read())
+    if args.format == 'binary':
+        from solver.wire_format import pack_result, unpack_compiled
+        input_data, compiled, _ = unpack_compiled(sys.stdin.buffer.read())
+    else:
+        input_data = json.loads(sys.stdin.read())
+        compiled = None
     
     # Create solver
-    solver = ScheduleSolver(input_data)
+    solver = ScheduleSolver(input_data, compiled=compiled)
     
     # Solve and get result
-    result = solver.solve()
+    time_limit_seconds = DEFAULT_TIME_LIMIT_SECONDS
+    result = solver.solve(time_limit_seconds)
+    
+    if args.record:
+        with open(args.record, 'w') as record_file:
+            json.dump({'input': solver.input_data(), 'timeLimitSeconds': time_limit_seconds, 'result': result}, record_file)
     
-    # Output result as JSON
-    print(json.dumps(result))
+    # Output result in the requested format
+    if args.format == 'binary':
+        class_ids = [class_obj['id'] for class_obj in input_data['classes']]
+        sys.stdout.buffer.write(pack_result(result, class_ids))
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Thunder Scheduler Day Masks
+Compact calendar with one period occupancy bitmask per (week, day).
+
+Bit (period - 1) of a mask is set when the period is occupied. With 8
+periods per day there are only 256 masks, so runs of consecutive classes
+and back-to-back periods are precomputed for every mask and the calendar
+rules become table lookups.
+"""
+
+from array import array
+from functools import lru_cache
+
+NUM_PERIODS = 8
+
+
+def build_run_tables(num_periods=NUM_PERIODS):
+    """Precompute run information for every possible day mask.
+
+    Args:
+        num_periods: Number of periods per day
+
+    Returns:
+        Tuple of (runs, max_run, break_periods) lists indexed by mask:
+            - runs: tuple of (first period, length) for each maximal run
+            - max_run: length of the longest run
+            - break_periods: periods directly followed by an occupied period
+    """
+    runs = []
+    max_run = []
+    break_periods = []
+
+    for mask in range(1 << num_periods):
+        mask_runs = []
+        period = 1
+        while period <= num_periods:
+            if mask & (1 << (period - 1)):
+                start = period
+                while period <= num_periods and mask & (1 << (period - 1)):
+                    period += 1
+                mask_runs.append((start, period - start))
+            else:
+                period += 1
+
+        runs.append(tuple(mask_runs))
+        max_run.append(max((length for _, length in mask_runs), default=0))
+        break_periods.append(tuple(
+            period for period in range(1, num_periods) if (mask >> (period - 1)) & 3 == 3
+        ))
+
+    return runs, max_run, break_periods
+
+
+RUNS, MAX_RUN, BREAK_PERIODS = build_run_tables()
+
+
+@lru_cache(maxsize=None)
+def build_extension_table(max_run, num_periods=NUM_PERIODS):
+    """Precompute which free periods would make a run of classes too long.
+
+    Args:
+        max_run: Longest allowed run of consecutive classes
+        num_periods: Number of periods per day
+
+    Returns:
+        Tuple indexed by mask, holding the mask of free periods whose
+        occupation would create a run longer than max_run
+    """
+    max_run_table = MAX_RUN if num_periods == NUM_PERIODS else build_run_tables(num_periods)[1]
+    table = []
+    for mask in range(1 << num_periods):
+        blocked = 0
+        for period in range(num_periods):
+            bit = 1 << period
+            if not mask & bit and max_run_table[mask | bit] > max_run:
+                blocked |= bit
+        table.append(blocked)
+    return tuple(table)
+
+
+class DayMaskCalendar:
+    """Class holding a period occupancy bitmask for every (week, day) in a flat array."""
+
+    def __init__(self, days, rotation_weeks=1, num_periods=NUM_PERIODS):
+        """Initialize an empty calendar.
+
+        Args:
+            days: List of day names
+            rotation_weeks: Number of weeks to allocate up front (grows on demand)
+            num_periods: Number of periods per day
+        """
+        self.days = days
+        self.day_index = {day: index for index, day in enumerate(days)}
+        self.num_periods = num_periods
+        self.masks = array('B' if num_periods <= 8 else 'L')
+        self.num_weeks = 0
+        self.ensure_week(rotation_weeks)
+
+    @classmethod
+    def from_assignments(cls, assignments, days, num_periods=NUM_PERIODS):
+        """Build a calendar from a list of assignments.
+
+        Args:
+            assignments: Iterable of assignment dictionaries
+            days: List of day names
+            num_periods: Number of periods per day
+
+        Returns:
+            DayMaskCalendar with every assignment's period marked occupied
+        """
+        calendar = cls(days, num_periods=num_periods)
+        for assignment in assignments:
+            calendar.add(assignment.get('week', 1), assignment['day'], assignment['period'])
+        return calendar
+
+    def ensure_week(self, week):
+        """Grow the calendar so it covers the given week."""
+        if week > self.num_weeks:
+            self.masks.extend([0] * (len(self.days) * (week - self.num_weeks)))
+            self.num_weeks = week
+
+    def index(self, week, day):
+        """Get the array index of a (week, day)."""
+        if week < 1:
+            raise ValueError(f'Week {week} is outside the calendar')
+        if day not in self.day_index:
+            raise ValueError(f'Unknown day {day}')
+        return (week - 1) * len(self.days) + self.day_index[day]
+
+    def mask(self, week, day):
+        """Get the occupancy mask of a (week, day)."""
+        if week > self.num_weeks:
+            return 0
+        return self.masks[self.index(week, day)]
+
+    def add(self, week, day, period):
+        """Mark a period occupied.
+
+        Returns:
+            Mask of the day before the period was added
+        """
+        if not 1 <= period <= self.num_periods:
+            raise ValueError(f'Period {period} is outside the day')
+        index = self.index(week, day)
+        self.ensure_week(week)
+        mask = self.masks[index]
+        self.masks[index] = mask | (1 << (period - 1))
+        return mask
+
+    def remove(self, week, day, period):
+        """Mark a period free."""
+        index = self.index(week, day)
+        self.masks[index] &= ~(1 << (period - 1))
+
+    def occupied_days(self):
+        """Iterate over the days with at least one occupied period.
+
+        Yields:
+            (week, day, mask) tuples in calendar order
+        """
+        num_days = len(self.days)
+        for index, mask in enumerate(self.masks):
+            if mask:
+                yield index // num_days + 1, self.days[index % num_days], mask
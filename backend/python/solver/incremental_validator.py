@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Incremental Validator
+This script keeps a schedule loaded and validates individual edits to it.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+# Allow running as a script as well as importing as solver.incremental_validator
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.compiled_problem import CompiledProblem
+from solver.day_masks import BREAK_PERIODS
+from solver.occupancy import ScheduleOccupancy
+from solver.slot_query import SlotQuery
+from solver.solution_validator import (
+    class_conflict_violation, class_count_violations, consecutive_classes_violations, invalid_slot_violation,
+    max_classes_per_day_violation, max_classes_per_week_violation, multiple_classes_violation, no_break_violation,
+    normalise_slot, teacher_unavailable_violation
+)
+
+
+class IncrementalScheduleValidator:
+    """Class for validating move/add/remove edits against a loaded schedule.
+
+    Occupancy is kept per slot, day, week and class together with a period
+    bitset per day. An edit only re-checks the slots, days, weeks and class it
+    touches, so each delta costs O(periods) instead of a full validation.
+
+    Loaded assignments outside the calendar take no slot; they count for
+    their class and are reported as invalid_slot violations until removed.
+    Edits never place a class outside the calendar.
+    """
+
+    def __init__(self, data):
+        """Initialize the validator and load the schedule.
+
+        Args:
+            data: Dictionary containing validation input data (see ScheduleValidator)
+        """
+        self.compiled = CompiledProblem(data)
+        self.classes = self.compiled.classes
+        self.constraints = self.compiled.constraints
+        self.days = self.compiled.days
+        self.periods = self.compiled.periods
+        self.max_classes_per_day = self.compiled.max_classes_per_day
+        self.max_classes_per_week = self.compiled.max_classes_per_week
+        self.max_consecutive = self.compiled.max_consecutive
+        self.require_break = self.compiled.require_break
+
+        self.occupancy = ScheduleOccupancy(self.days, [class_obj['id'] for class_obj in self.classes])
+        self.invalid_assignments = []
+        for assignment in data.get('assignments', []):
+            slot = normalise_slot(self.compiled, assignment)
+            if slot is None:
+                self.invalid_assignments.append(assignment)
+            else:
+                self.occupancy.insert(assignment, slot)
+        self.num_violations = len(self.violations())
+        self.slot_query = SlotQuery(self.compiled, self.occupancy, self.invalid_assignments)
+
+    def violations(self):
+        """List all violations of the loaded schedule.
+
+        Returns:
+            List of violations
+        """
+        scopes = set()
+        for week, day, period in self.occupancy.slot_assignments:
+            scopes.update([('slot', (week, day, period)), ('day', (week, day)), ('week', week)])
+        for class_id in self.occupancy.class_counts:
+            scopes.add(('class', class_id))
+        for assignment in self.invalid_assignments:
+            scopes.add(('class', assignment['classId']))
+        return [violation for _, violation in self._scope_violations(scopes)]
+
+    def validate(self):
+        """Validate the loaded schedule.
+
+        Returns:
+            Dictionary with validation results, as ScheduleValidator.validate
+        """
+        start_time = time.time()
+        violations = self.violations()
+        metrics.record_validation('schedule', time.time() - start_time, len(violations) == 0)
+        return {
+            'valid': len(violations) == 0,
+            'violations': violations,
+            'numAssignments': self.occupancy.num_assignments + len(self.invalid_assignments),
+            'numClasses': len(self.classes)
+        }
+
+    def apply(self, delta):
+        """Apply an edit and report how it changed the violations.
+
+        Args:
+            delta: Dictionary with 'op' ('add', 'remove' or 'move'), the
+                'assignment' concerned and, for moves, the target slot in 'to'
+                (week, day, period)
+
+        Returns:
+            Dictionary with the violations added and removed by the edit
+
+        Raises:
+            ValueError: If the operation is unknown, the assignment to remove
+                or move isn't scheduled or the new slot is outside the
+                calendar; the schedule is left unchanged
+        """
+        start_time = time.time()
+        op = delta['op']
+        assignment = delta['assignment']
+        if op not in ('add', 'remove', 'move'):
+            raise ValueError(f'Unknown delta operation: {op}')
+
+        # Check both ends of the edit before changing anything
+        source = target = None
+        if op in ('remove', 'move'):
+            source = normalise_slot(self.compiled, assignment)
+            if source is None and assignment not in self.invalid_assignments:
+                raise ValueError(f"Class {assignment['classId']} is not scheduled on {assignment['day']} "
+                                 f"period {assignment['period']} in week {assignment.get('week', 1)}")
+        if op in ('add', 'move'):
+            placed = dict(assignment, **delta['to']) if op == 'move' else assignment
+            target = normalise_slot(self.compiled, placed)
+            if target is None:
+                raise ValueError(invalid_slot_violation(placed)['message'])
+
+        scopes = {('class', assignment['classId'])}
+        for week, day, period in filter(None, (source, target)):
+            scopes.update([('slot', (week, day, period)), ('day', (week, day)), ('week', week)])
+
+        before = self._scope_violations(scopes)
+        if op in ('remove', 'move'):
+            if source is None:
+                self.invalid_assignments.remove(assignment)
+            else:
+                self.occupancy.delete(assignment, source)
+        if target is not None:
+            self.occupancy.insert(placed, target)
+        after = self._scope_violations(scopes)
+
+        before_keys = Counter(key for key, _ in before)
+        after_keys = Counter(key for key, _ in after)
+        removed = _take(before, before_keys - after_keys)
+        added = _take(after, after_keys - before_keys)
+        self.num_violations += len(added) - len(removed)
+        metrics.record_validation('delta', time.time() - start_time)
+
+        return {
+            'added': added,
+            'removed': removed,
+            'valid': self.num_violations == 0,
+            'numViolations': self.num_violations
+        }
+
+    def _scope_violations(self, scopes):
+        """List the violations within a set of scopes.
+
+        Args:
+            scopes: Set of ('slot', (week, day, period)), ('day', (week, day)),
+                ('week', week) and ('class', class_id) tuples
+
+        Returns:
+            List of (key, violation) tuples; keys identify a violation across edits
+        """
+        violations = []
+        for scope, value in scopes:
+            if scope == 'slot':
+                violations.extend(self._slot_violations(*value))
+            elif scope == 'day':
+                violations.extend(self._day_violations(*value))
+            elif scope == 'week':
+                violations.extend(self._week_violations(value))
+            else:
+                violations.extend(self._class_violations(value))
+        return violations
+
+    def _slot_violations(self, week, day, period):
+        """Check conflicts, teacher availability and double booking in one slot."""
+        violations = []
+        slot = self.occupancy.slot_assignments.get((week, day, period), [])
+        bit = 1 << (period - 1)
+
+        for assignment in slot:
+            class_id = assignment['classId']
+            if self.compiled.conflict_mask(class_id, day) & bit:
+                violations.append((
+                    ('class_conflict', class_id, week, day, period),
+                    class_conflict_violation(assignment, week, day, period)
+                ))
+            if self.compiled.teacher_mask(day) & bit:
+                violations.append((
+                    ('teacher_unavailable', class_id, week, day, period),
+                    teacher_unavailable_violation(assignment, week, day, period)
+                ))
+
+        for other in slot[1:]:
+            key = ('multiple_classes_per_slot', week, day, period, slot[0]['classId'], other['classId'])
+            violations.append((key, multiple_classes_violation(slot[0], other, week, day, period)))
+
+        return violations
+
+    def _day_violations(self, week, day):
+        """Check the per-day, consecutive class and break rules on one day."""
+        violations = []
+        count = self.occupancy.day_counts.get((week, day), 0)
+        mask = self.occupancy.calendar.mask(week, day)
+
+        if count > self.max_classes_per_day:
+            violations.append((
+                ('max_classes_per_day_exceeded', week, day, count),
+                max_classes_per_day_violation(week, day, count, self.max_classes_per_day)
+            ))
+
+        for violation in consecutive_classes_violations(week, day, mask, self.max_consecutive):
+            key = ('max_consecutive_classes_exceeded', week, day, violation['periods'][0], len(violation['periods']))
+            violations.append((key, violation))
+
+        if self.require_break:
+            for period in BREAK_PERIODS[mask]:
+                violations.append((('no_break_after_class', week, day, period), no_break_violation(week, day, period)))
+
+        return violations
+
+    def _week_violations(self, week):
+        """Check the per-week rule for one week."""
+        count = self.occupancy.week_counts.get(week, 0)
+        if count <= self.max_classes_per_week:
+            return []
+        return [(
+            ('max_classes_per_week_exceeded', week, count),
+            max_classes_per_week_violation(week, count, self.max_classes_per_week)
+        )]
+
+    def _class_violations(self, class_id):
+        """Check that one class is scheduled exactly once and inside the calendar."""
+        invalid = [assignment for assignment in self.invalid_assignments if assignment['classId'] == class_id]
+        violations = [
+            (('invalid_slot', class_id, json.dumps(assignment, sort_keys=True)), invalid_slot_violation(assignment))
+            for assignment in invalid
+        ]
+        count = self.occupancy.class_counts.get(class_id)
+        if count is not None:
+            count += len(invalid)
+            violations.extend(
+                ((violation['type'], class_id, count), violation) for violation in class_count_violations(class_id, count)
+            )
+        return violations
+
+
+def _take(violations, keys):
+    """Select violations whose keys are in a multiset of keys.
+
+    Args:
+        violations: List of (key, violation) tuples
+        keys: Counter of keys to select
+
+    Returns:
+        List of selected violations
+    """
+    remaining = Counter(keys)
+    selected = []
+    for key, violation in violations:
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            selected.append(violation)
+    return selected
+
+
+def main():
+    """Main function to run an incremental validation session.
+
+    The first stdin line holds the validation input data with the schedule;
+    the full validation result is printed for it. Every following line holds
+    one delta, answered by one line with the violations it added and removed,
+    or an {'op': 'explain', 'classId': ...} query, answered with the slots the
+    class can move to (see SlotQuery.explain), or an {'op': 'metrics'} query,
+    answered with the process's metrics in Prometheus text format.
+    """
+    metrics.configure('incremental_validator')
+    validator = IncrementalScheduleValidator(json.loads(sys.stdin.readline()))
+    print(json.dumps(validator.validate()), flush=True)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            delta = json.loads(line)
+            if delta['op'] == 'explain':
+                result = validator.slot_query.explain(delta['classId'])
+            elif delta['op'] == 'metrics':
+                result = {'metrics': metrics.REGISTRY.render()}
+            else:
+                result = validator.apply(delta)
+        except (KeyError, ValueError) as error:
+            result = {'error': str(error)}
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Large Neighbourhood Search
+This script improves a schedule by re-solving small parts of it with the rest fixed.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+# Allow running as a script as well as importing as solver.lns
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.compiled_problem import CompiledProblem
+from solver.constraint_solver import ScheduleSolver
+from solver.presolve import presolve
+from solver.solution_validator import check_schedule
+
+# Ways of choosing the classes to free in an iteration
+NEIGHBOURHOODS = ('day', 'week', 'grade', 'random')
+
+# Solver options that only make sense for a full solve
+FULL_SOLVE_OPTIONS = ('exportModelDir', 'memoryBudgetMB', 'verifySolution')
+
+
+def _slot(assignment):
+    """Get the (week, day, period) slot of an assignment."""
+    return assignment.get('week', 1), assignment['day'], assignment['period']
+
+
+class LargeNeighbourhoodSearch:
+    """Class for improving the stability objective of a schedule by large neighbourhood search.
+
+    Every iteration frees the classes of one neighbourhood and re-solves them
+    with all other classes locked in place. A day or week neighbourhood
+    frees the classes placed in it and the classes whose reference slot lies
+    in it, so a class can move back when its reference slot's occupant moves
+    out. Freed classes may only take the slots of the day or week, the
+    current slots of the freed classes and their reference slots, which
+    keeps each sub-model to a few variables per freed class. Sub-solves
+    share the compiled problem, and a result only replaces the schedule when
+    it moves fewer classes from the reference schedule.
+    """
+
+    def __init__(self, data, neighbourhoods=NEIGHBOURHOODS, neighbourhood_size=30, seed=0):
+        """Initialize the search with input data.
+
+        Args:
+            data: Dictionary containing scheduling input data (see
+                ScheduleSolver); solverOptions must hold the
+                referenceSchedule that defines the objective
+            neighbourhoods: Neighbourhood kinds to cycle through (see NEIGHBOURHOODS)
+            neighbourhood_size: Number of classes a random neighbourhood frees
+            seed: Random seed for choosing neighbourhoods
+        """
+        options = data.get('solverOptions', {})
+        if not options.get('referenceSchedule'):
+            raise ValueError('Large neighbourhood search needs a referenceSchedule to improve against')
+        unknown = set(neighbourhoods) - set(NEIGHBOURHOODS)
+        if unknown:
+            raise ValueError(f'Unknown neighbourhoods {", ".join(sorted(unknown))}')
+
+        self.data = data
+        self.compiled = CompiledProblem(data)
+        self.neighbourhoods = list(neighbourhoods)
+        self.neighbourhood_size = neighbourhood_size
+        self.rng = random.Random(seed)
+        self.reference = {assignment['classId']: _slot(assignment) for assignment in options['referenceSchedule']}
+        self.sub_options = {key: value for key, value in options.items() if key not in FULL_SOLVE_OPTIONS}
+        self.grades = {}
+        for class_obj in self.compiled.classes:
+            self.grades.setdefault(class_obj.get('gradeLevel'), []).append(class_obj['id'])
+
+    def objective(self, schedule):
+        """Compute the stability penalty of a schedule.
+
+        Args:
+            schedule: List of assignments
+
+        Returns:
+            Number of classes away from their reference slot
+        """
+        return sum(
+            1 for assignment in schedule
+            if assignment['classId'] in self.reference and self.reference[assignment['classId']] != _slot(assignment)
+        )
+
+    def improve(self, initial_schedule=None, time_limit_seconds=10, iteration_time_limit=1):
+        """Improve a schedule until the wall budget runs out or it matches the reference schedule.
+
+        Neighbourhoods are drawn at random, so an iteration without an
+        improvement doesn't mean the next one can't find one; only an
+        objective of 0 ends the search before the budget.
+
+        Args:
+            initial_schedule: Valid schedule to start from (default: the
+                result of a full solve limited to iteration_time_limit)
+            time_limit_seconds: Wall-clock budget for the whole search
+            iteration_time_limit: Time limit of each sub-solve
+
+        Returns:
+            Dictionary with the best 'solution', its 'objective', the
+            'initialObjective', the 'trajectory' of improvements (iteration,
+            elapsed time, objective and neighbourhood) and search totals
+        """
+        start_time = time.time()
+
+        if initial_schedule is None:
+            solver = ScheduleSolver(dict(self.data, solverOptions=self.sub_options), compiled=self.compiled)
+            result = solver.solve(iteration_time_limit)
+            if result['status'] != 'success':
+                return result
+            initial_schedule = result['solution']
+        elif not check_schedule(self.compiled, initial_schedule)['valid']:
+            raise ValueError('The initial schedule breaks the scheduling constraints')
+
+        schedule = list(initial_schedule)
+        objective = self.objective(schedule)
+        trajectory = [{'iteration': 0, 'time': time.time() - start_time, 'objective': objective, 'neighbourhood': None}]
+        iteration = 0
+        sub_solve_time = 0
+
+        while objective > 0 and time.time() - start_time < time_limit_seconds:
+            iteration += 1
+            kind = self.neighbourhoods[(iteration - 1) % len(self.neighbourhoods)]
+            freed, region = self._neighbourhood(kind, schedule)
+            if not freed:
+                continue
+
+            remaining = time_limit_seconds - (time.time() - start_time)
+            result = self._solve_neighbourhood(schedule, freed, region, min(iteration_time_limit, remaining))
+            sub_solve_time += result['solveTime']
+            if result['status'] != 'success':
+                continue
+
+            candidate = self.objective(result['solution'])
+            if candidate < objective:
+                schedule, objective = result['solution'], candidate
+                trajectory.append({
+                    'iteration': iteration,
+                    'time': time.time() - start_time,
+                    'objective': objective,
+                    'neighbourhood': kind
+                })
+
+        return {
+            'status': 'success',
+            'solution': schedule,
+            'objective': objective,
+            'initialObjective': trajectory[0]['objective'],
+            'trajectory': trajectory,
+            'numIterations': iteration,
+            'numImprovements': len(trajectory) - 1,
+            'subSolveTime': sub_solve_time,
+            'totalTime': time.time() - start_time
+        }
+
+    def _solve_neighbourhood(self, schedule, freed, region, time_limit_seconds):
+        """Re-solve the freed classes of a schedule with the others locked in place.
+
+        Args:
+            schedule: Current schedule
+            freed: Set of class IDs to re-solve
+            region: Set of (week, day, period) slots open to every freed class
+            time_limit_seconds: Time limit of the sub-solve
+
+        Returns:
+            Solver result for the whole schedule
+        """
+        locked = [assignment for assignment in schedule if assignment['classId'] not in freed]
+        slots = set(region)
+        slots.update(_slot(assignment) for assignment in schedule if assignment['classId'] in freed)
+        slots.update(self.reference[class_id] for class_id in freed if class_id in self.reference)
+
+        solver = ScheduleSolver(
+            dict(self.data, lockedAssignments=locked, solverOptions=self.sub_options), compiled=self.compiled
+        )
+        solver.presolved = presolve(self.compiled, locked)
+        for class_id in freed:
+            solver.presolved.restrict(class_id, slots)
+        return solver.solve(time_limit_seconds)
+
+    def _neighbourhood(self, kind, schedule):
+        """Choose the classes to free in an iteration.
+
+        Args:
+            kind: Neighbourhood kind (see NEIGHBOURHOODS)
+            schedule: Current schedule
+
+        Returns:
+            Tuple of (set of class IDs to re-solve, set of slots of the
+            neighbourhood's day or week, empty for the other kinds)
+        """
+        if kind == 'grade':
+            return set(self.grades[self.rng.choice(list(self.grades))]), set()
+        if kind == 'random':
+            class_ids = self.compiled.class_ids
+            return set(self.rng.sample(class_ids, min(self.neighbourhood_size, len(class_ids)))), set()
+
+        week = self.rng.randint(1, self.compiled.rotation_weeks)
+        days = [self.rng.choice(self.compiled.days)] if kind == 'day' else self.compiled.days
+        region = {(week, day, period) for day in days for period in self.compiled.periods}
+
+        freed = {assignment['classId'] for assignment in schedule if _slot(assignment) in region}
+        freed.update(class_id for class_id, slot in self.reference.items() if slot in region)
+        return freed & self.compiled.class_index.keys(), region
+
+
+def main():
+    """Main function to read input and improve a schedule.
+
+    The stdin input holds the scheduling input data, with a referenceSchedule
+    in its solverOptions, plus an optional 'initialSchedule', 'lnsTimeLimit'
+    (default: 10) and 'lnsIterationTimeLimit' (default: 1) in seconds.
+    """
+    metrics.configure('lns')
+    input_data = json.loads(sys.stdin.read())
+    search = LargeNeighbourhoodSearch(input_data)
+    result = search.improve(
+        input_data.get('initialSchedule'),
+        input_data.get('lnsTimeLimit', 10),
+        input_data.get('lnsIterationTimeLimit', 1)
+    )
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
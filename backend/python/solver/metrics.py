@@ -0,0 +1,332 @@
+"""
+Thunder Scheduler Metrics
+Counters and histograms of solver and validator operations in the Prometheus
+text exposition format.
+
+Every ScheduleSolver.solve and every validation records into the process's
+REGISTRY, labelled with the entry point the process runs (set by the
+script's main function through configure). Two environment variables
+expose the metrics:
+    - THUNDER_METRICS_FILE: path the metrics are merged into when the
+      process exits, for a node exporter textfile collector; counts of
+      earlier processes in the file are added up, so short-lived solver
+      processes accumulate into one file
+    - THUNDER_METRICS_PORT: port of an HTTP endpoint serving /metrics,
+      for long-running modes such as batch or incremental validation
+"""
+
+import atexit
+import os
+import re
+import threading
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets in seconds
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Upper bounds of the model size buckets in variables or constraints
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Sample lines as written by render: series name and labels, then the value
+SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*(?:\{.*\})?) (\S+)$')
+
+
+def _format_labels(names, values, extra=()):
+    """Format label names and values as a Prometheus label set."""
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    """Format a sample value, integral ones without a fraction."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        """Add to the count of a label set.
+
+        Args:
+            labels: Tuple of label values in label_names order
+            amount: Amount to add
+        """
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        """List the (series, value) samples of the counter."""
+        with self.lock:
+            return [
+                (self.name + _format_labels(self.label_names, labels), value)
+                for labels, value in sorted(self.values.items())
+            ]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        """Record an observation.
+
+        Args:
+            labels: Tuple of label values in label_names order
+            value: Observed value
+        """
+        with self.lock:
+            counts, total = self.values.get(labels, ([0] * (len(self.buckets) + 1), 0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self.values[labels] = (counts, total + value)
+
+    def samples(self):
+        """List the (series, value) samples of the histogram, buckets cumulative."""
+        samples = []
+        with self.lock:
+            for labels, (counts, total) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += count
+                    bucket_labels = _format_labels(self.label_names, labels, [('le', bound)])
+                    samples.append((f'{self.name}_bucket{bucket_labels}', cumulative))
+                label_set = _format_labels(self.label_names, labels)
+                samples.append((f'{self.name}_sum{label_set}', total))
+                samples.append((f'{self.name}_count{label_set}', cumulative))
+        return samples
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics = []
+        self.entry_point = 'library'
+
+    def counter(self, name, help_text, label_names):
+        """Create and register a counter."""
+        metric = Counter(name, help_text, label_names)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names, buckets):
+        """Create and register a histogram."""
+        metric = Histogram(name, help_text, label_names, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self, base=None):
+        """Render every metric in the Prometheus text exposition format.
+
+        Args:
+            base: Optional dictionary mapping series to values of an earlier
+                exposition (see parse_exposition), added to this registry's
+
+        Returns:
+            Exposition text
+        """
+        base = dict(base or {})
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for series, value in metric.samples():
+                lines.append(f'{series} {_format_value(value + base.pop(series, 0))}')
+            # Label sets only earlier processes recorded
+            names = {metric.name}
+            if metric.kind == 'histogram':
+                names = {metric.name + suffix for suffix in ('_bucket', '_sum', '_count')}
+            for series in [series for series in base if series.split('{')[0] in names]:
+                lines.append(f'{series} {_format_value(base.pop(series))}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Merge the metrics into an exposition file.
+
+        The counts already in the file are added to this registry's, and the
+        file is replaced in one rename, under a lock so that concurrent
+        processes don't lose each other's counts.
+
+        Args:
+            path: Path of the exposition file
+        """
+        import fcntl
+
+        with open(path + '.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with open(path) as metrics_file:
+                    base = parse_exposition(metrics_file.read())
+            except FileNotFoundError:
+                base = {}
+            temporary_path = f'{path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w') as metrics_file:
+                metrics_file.write(self.render(base))
+            os.replace(temporary_path, path)
+
+    def serve(self, port, host=''):
+        """Serve the metrics over HTTP from a daemon thread.
+
+        Args:
+            port: Port to listen on (0 picks a free one)
+            host: Address to bind (default: all interfaces)
+
+        Returns:
+            The running ThreadingHTTPServer; its server_address holds the port
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                # Keep stderr free of access logs; stdout carries the results
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def parse_exposition(text):
+    """Read the samples of an exposition written by Registry.render.
+
+    Args:
+        text: Exposition text
+
+    Returns:
+        Dictionary mapping series (name with labels) to values
+    """
+    samples = {}
+    for line in text.splitlines():
+        match = SAMPLE_PATTERN.match(line)
+        if match and not line.startswith('#'):
+            samples[match.group(1)] = samples.get(match.group(1), 0) + float(match.group(2))
+    return samples
+
+
+REGISTRY = Registry()
+
+SOLVES = REGISTRY.counter(
+    'thunder_solver_solves_total', 'Solves by entry point and outcome', ('entry_point', 'status')
+)
+BUILD_SECONDS = REGISTRY.histogram(
+    'thunder_solver_build_seconds', 'Time to presolve and build the CP-SAT model', ('entry_point',), TIME_BUCKETS
+)
+SOLVE_SECONDS = REGISTRY.histogram(
+    'thunder_solver_solve_seconds', 'Time CP-SAT spent searching', ('entry_point',), TIME_BUCKETS
+)
+MODEL_VARIABLES = REGISTRY.histogram(
+    'thunder_solver_model_variables', 'Variables of the built model', ('entry_point',), SIZE_BUCKETS
+)
+MODEL_CONSTRAINTS = REGISTRY.histogram(
+    'thunder_solver_model_constraints', 'Constraints of the built model', ('entry_point',), SIZE_BUCKETS
+)
+VALIDATIONS = REGISTRY.counter(
+    'thunder_validator_validations_total', 'Validations by entry point and outcome', ('entry_point', 'valid')
+)
+VALIDATION_SECONDS = REGISTRY.histogram(
+    'thunder_validator_seconds', 'Time to validate a schedule or apply an edit', ('entry_point', 'kind'), TIME_BUCKETS
+)
+
+
+def solve_status(result):
+    """Classify a solver result for the status label.
+
+    Args:
+        result: Dictionary returned by ScheduleSolver.solve
+
+    Returns:
+        'optimal', 'feasible', 'infeasible', 'timeout', 'model_invalid' or 'error'
+    """
+    if result['status'] == 'success':
+        return result['statusString']
+    if result['status'] == 'error':
+        return 'error'
+    # CP-SAT status codes: 0 unknown (stopped by the time limit), 1 model invalid, 3 infeasible
+    return {0: 'timeout', 1: 'model_invalid'}.get(result.get('statusCode'), 'infeasible')
+
+
+def record_solve(result, build_time):
+    """Record a finished ScheduleSolver.solve.
+
+    Args:
+        result: Solver result
+        build_time: Seconds spent on presolve and model building, or None
+            when the solve ended before building
+    """
+    entry_point = (REGISTRY.entry_point,)
+    SOLVES.inc((REGISTRY.entry_point, solve_status(result)))
+    if build_time is None:
+        return
+    BUILD_SECONDS.observe(entry_point, build_time)
+    SOLVE_SECONDS.observe(entry_point, result['solveTime'])
+    if 'modelStats' in result:
+        MODEL_VARIABLES.observe(entry_point, result['modelStats']['numVariables'])
+        MODEL_CONSTRAINTS.observe(entry_point, result['modelStats']['numConstraints'])
+
+
+def record_validation(kind, seconds, valid=None):
+    """Record a validation.
+
+    Args:
+        kind: 'schedule' for a full validation, 'delta' for an incremental edit
+        seconds: Time spent
+        valid: Whether the schedule was valid, for full validations
+    """
+    VALIDATION_SECONDS.observe((REGISTRY.entry_point, kind), seconds)
+    if valid is not None:
+        VALIDATIONS.inc((REGISTRY.entry_point, 'true' if valid else 'false'))
+
+
+def configure(entry_point, environ=None):
+    """Label this process's metrics and expose them as the environment asks.
+
+    Args:
+        entry_point: Name of the running script, used as the entry_point label
+        environ: Environment to read (default: os.environ)
+
+    Returns:
+        The metrics HTTP server when THUNDER_METRICS_PORT is set, else None
+    """
+    environ = os.environ if environ is None else environ
+    REGISTRY.entry_point = entry_point
+    if environ.get('THUNDER_METRICS_FILE'):
+        atexit.register(REGISTRY.dump, environ['THUNDER_METRICS_FILE'])
+    if environ.get('THUNDER_METRICS_PORT'):
+        return REGISTRY.serve(int(environ['THUNDER_METRICS_PORT']))
+    return None
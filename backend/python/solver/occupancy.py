@@ -0,0 +1,79 @@
+"""
+Thunder Scheduler Schedule Occupancy
+Counters describing which slots, days, weeks and classes a schedule uses.
+"""
+
+from solver.day_masks import DayMaskCalendar
+
+
+class ScheduleOccupancy:
+    """Class tracking the occupancy of a schedule as assignments are added and removed."""
+
+    def __init__(self, days, class_ids=()):
+        """Initialize empty occupancy.
+
+        Args:
+            days: List of day names
+            class_ids: IDs of the classes whose scheduled count is tracked
+        """
+        self.slot_assignments = {}
+        self.day_counts = {}
+        self.week_counts = {}
+        self.class_counts = {class_id: 0 for class_id in class_ids}
+        self.class_slots = {}
+        self.calendar = DayMaskCalendar(days)
+        self.num_assignments = 0
+
+    def insert(self, assignment, slot=None):
+        """Add an assignment.
+
+        Args:
+            assignment: Assignment dictionary
+            slot: Optional (week, day, period) to file it under instead of
+                its own fields, such as its slot read by normalise_slot
+
+        Raises:
+            ValueError: If the slot is outside the calendar; the occupancy is
+                left unchanged
+        """
+        week, day, period = slot or (assignment.get('week', 1), assignment['day'], assignment['period'])
+        class_id = assignment['classId']
+
+        # The calendar checks the slot, so it goes first
+        self.calendar.add(week, day, period)
+        self.slot_assignments.setdefault((week, day, period), []).append(assignment)
+        self.day_counts[(week, day)] = self.day_counts.get((week, day), 0) + 1
+        self.week_counts[week] = self.week_counts.get(week, 0) + 1
+        self.class_slots.setdefault(class_id, []).append((week, day, period))
+        if class_id in self.class_counts:
+            self.class_counts[class_id] += 1
+        self.num_assignments += 1
+
+    def delete(self, assignment, slot=None):
+        """Remove an assignment.
+
+        Args:
+            assignment: Assignment dictionary
+            slot: Optional (week, day, period) it was filed under (see insert)
+
+        Raises:
+            ValueError: If the class isn't scheduled in the slot
+        """
+        week, day, period = slot or (assignment.get('week', 1), assignment['day'], assignment['period'])
+        class_id = assignment['classId']
+        slot = self.slot_assignments.get((week, day, period), [])
+
+        index = next((i for i, other in enumerate(slot) if other['classId'] == class_id), None)
+        if index is None:
+            raise ValueError(f"Class {class_id} is not scheduled on {day} period {period} in week {week}")
+
+        slot.pop(index)
+        if not slot:
+            del self.slot_assignments[(week, day, period)]
+            self.calendar.remove(week, day, period)
+        self.day_counts[(week, day)] -= 1
+        self.week_counts[week] -= 1
+        self.class_slots[class_id].remove((week, day, period))
+        if class_id in self.class_counts:
+            self.class_counts[class_id] -= 1
+        self.num_assignments -= 1
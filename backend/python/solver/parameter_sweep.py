@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Parameter Sweep
+This script checks a grid of constraint limits against one model build.
+"""
+
+import itertools
+import json
+import os
+import sys
+import time
+
+# Allow running as a script as well as importing as solver.parameter_sweep
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.constraint_solver import ScheduleSolver, FEASIBLE, INFEASIBLE, OPTIMAL
+from solver.day_masks import DayMaskCalendar, MAX_RUN
+
+# Constraint limits that can be swept, with their defaults
+SWEEP_PARAMETERS = {
+    'maxClassesPerDay': 4,
+    'maxClassesPerWeek': 16,
+    'maxConsecutiveClasses': 2,
+}
+
+# Load figures reported for every feasible setting, keyed to the limit they are checked against
+LOAD_LIMITS = {
+    'maxDayLoad': 'maxClassesPerDay',
+    'maxWeekLoad': 'maxClassesPerWeek',
+    'maxRun': 'maxConsecutiveClasses',
+}
+
+
+class ParameterSweep:
+    """Class for solving one scheduling problem under a grid of constraint limits.
+
+    The model is built once with the loosest value of every swept limit. Each
+    tighter value gets an enforcement literal guarding its constraints, and a
+    setting is solved by fixing the literals of its values. Settings whose
+    answer follows from earlier ones are not solved at all: a schedule found
+    for one setting is reused for every setting it satisfies, and a setting
+    at least as tight as an infeasible one is infeasible too.
+    """
+
+    def __init__(self, data, grid):
+        """Initialize the sweep with input data.
+
+        Args:
+            data: Dictionary containing scheduling input data (see ScheduleSolver)
+            grid: Dictionary mapping swept limits (keys of SWEEP_PARAMETERS) to
+                lists of values; limits not in the grid keep their input value
+        """
+        unknown = set(grid) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f'Cannot sweep {", ".join(sorted(unknown))}')
+
+        self.data = data
+        self.constraints = data['constraints']
+        self.grid = {
+            name: sorted(set(grid.get(name, [self.constraints.get(name, default)])))
+            for name, default in SWEEP_PARAMETERS.items()
+        }
+
+        # The base model uses the loosest value of every limit
+        loosest = {name: values[-1] for name, values in self.grid.items()}
+        self.solver = ScheduleSolver(dict(data, constraints={**self.constraints, **loosest}))
+        self.literals = {}
+
+    def build_model(self):
+        """Build the base model and the guarded constraints for tighter limits."""
+        self.solver.build_model()
+        model = self.solver.model
+        weeks = range(1, self.solver.rotation_weeks + 1)
+        days = self.solver.days
+        periods = self.solver.periods
+
+        def add_guarded_limit(week, day_periods, value, literal):
+            terms = [term for day, period in day_periods for term in self.solver._slot_terms(week, day, period)]
+            constraint = self.solver._add_slot_limit(terms, value)
+            if constraint is not None:
+                constraint.OnlyEnforceIf(literal)
+            elif len(terms) > value:
+                # Classes fixed in presolve alone exceed the value
+                model.Add(literal == 0)
+
+        for name, values in self.grid.items():
+            for value in values[:-1]:
+                literal = model.NewBoolVar(f'sweep_{name}_{value}')
+                self.literals[(name, value)] = literal
+
+                for week in weeks:
+                    if name == 'maxClassesPerWeek':
+                        add_guarded_limit(week, itertools.product(days, periods), value, literal)
+                        continue
+                    for day in days:
+                        if name == 'maxClassesPerDay':
+                            add_guarded_limit(week, [(day, period) for period in periods], value, literal)
+                            continue
+                        for start_period in range(1, len(periods) + 1 - value):
+                            window = [(day, period) for period in range(start_period, start_period + value + 1)]
+                            add_guarded_limit(week, window, value, literal)
+
+    def solve(self, time_limit_seconds=10):
+        """Solve every setting of the grid.
+
+        Args:
+            time_limit_seconds: Maximum time to spend solving each setting
+
+        Returns:
+            Dictionary with one row per setting and sweep totals
+        """
+        start_time = time.time()
+        self.build_model()
+        build_time = time.time() - start_time
+        self.solver.create_solver(time_limit_seconds)
+
+        names = list(self.grid)
+        # Loosest settings first: their schedules and infeasibility proofs settle the most other settings
+        settings = [
+            dict(zip(names, values))
+            for values in itertools.product(*(reversed(self.grid[name]) for name in names))
+        ]
+
+        rows = []
+        feasible_loads = []
+        infeasible = []
+        num_solves = 0
+
+        for setting in settings:
+            row = {'constraints': setting}
+            reused = next((loads for loads in feasible_loads if _satisfies(loads, setting)), None)
+
+            if reused is not None:
+                row.update(status='feasible', source='reused', solveTime=0, **reused)
+            elif any(_at_least_as_tight(setting, other) for other in infeasible):
+                row.update(status='infeasible', source='inferred', solveTime=0)
+            else:
+                num_solves += 1
+                row.update(self._solve_setting(setting))
+                if row['status'] == 'feasible':
+                    feasible_loads.append({key: row[key] for key in LOAD_LIMITS})
+                elif row['statusCode'] == INFEASIBLE:
+                    infeasible.append(setting)
+
+            rows.append(row)
+
+        return {
+            'settings': rows,
+            'numSettings': len(rows),
+            'numSolves': num_solves,
+            'buildTime': build_time,
+            'totalTime': time.time() - start_time
+        }
+
+    def _solve_setting(self, setting):
+        """Solve one setting by fixing the literals of its values.
+
+        Fixing the literals in the model, rather than passing them as solver
+        assumptions, lets presolve drop the guarded constraints of the other
+        values, which keeps proofs of infeasibility as fast as in a fresh model.
+
+        Args:
+            setting: Dictionary mapping swept limits to values
+
+        Returns:
+            Dictionary with the setting's status, solve time and schedule loads
+        """
+        model = self.solver.model
+        for (name, value), literal in self.literals.items():
+            domain = model.Proto().variables[literal.Index()].domain
+            domain.clear()
+            domain.extend([1, 1] if setting[name] == value else [0, 0])
+
+        start_time = time.time()
+        status = int(self.solver.solver.Solve(model))
+        solve_time = time.time() - start_time
+
+        if status not in (OPTIMAL, FEASIBLE):
+            return {
+                'status': 'infeasible' if status == INFEASIBLE else 'unknown',
+                'statusCode': status,
+                'source': 'solved',
+                'solveTime': solve_time
+            }
+
+        solution = self.solver._extract_solution(status, solve_time)['solution']
+
+        # Start the next setting from this schedule
+        model.ClearHints()
+        for assignment in solution:
+            # Classes fixed in presolve have no variables to hint
+            class_id = self.solver.group_of.get(assignment['classId'])
+            key = (class_id, assignment['week'], assignment['day'], assignment['period'])
+            if key in self.solver.assignments:
+                model.AddHint(self.solver.assignments[key], 1)
+
+        return {
+            'status': 'feasible',
+            'statusCode': status,
+            'source': 'solved',
+            'solveTime': solve_time,
+            **_schedule_loads(solution, self.solver.days)
+        }
+
+
+def _schedule_loads(solution, days):
+    """Measure the busiest day, busiest week and longest run of a schedule."""
+    calendar = DayMaskCalendar.from_assignments(solution, days)
+    week_counts = {}
+    for assignment in solution:
+        week_counts[assignment['week']] = week_counts.get(assignment['week'], 0) + 1
+
+    return {
+        'maxDayLoad': max((bin(mask).count('1') for mask in calendar.masks), default=0),
+        'maxWeekLoad': max(week_counts.values(), default=0),
+        'maxRun': max((MAX_RUN[mask] for mask in calendar.masks), default=0)
+    }
+
+
+def _satisfies(loads, setting):
+    """Check whether a schedule with the given loads meets a setting's limits."""
+    return all(loads[key] <= setting[name] for key, name in LOAD_LIMITS.items())
+
+
+def _at_least_as_tight(setting, other):
+    """Check whether every limit of a setting is at most the other's."""
+    return all(setting[name] <= other[name] for name in setting)
+
+
+def main():
+    """Main function to read input and run the sweep.
+
+    The stdin input holds the scheduling input data plus a 'sweep' grid and
+    an optional 'sweepTimeLimit' in seconds per setting.
+    """
+    metrics.configure('parameter_sweep')
+    input_data = json.loads(sys.stdin.read())
+    sweep = ParameterSweep(input_data, input_data['sweep'])
+    result = sweep.solve(input_data.get('sweepTimeLimit', 10))
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Portfolio Solver
+This script races several solver configurations in separate processes and
+returns the first conclusive answer.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+# Allow running as a script as well as importing as solver.portfolio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE, UNKNOWN, _cp_model
+
+# Configurations raced by default: different seeds, encodings and break rule encodings
+DEFAULT_CONFIGURATIONS = [
+    {'randomSeed': 0},
+    {'randomSeed': 1, 'encoding': 'sparse'},
+    {'randomSeed': 2, 'breakEncoding': 'implication'},
+    {'randomSeed': 3, 'encoding': 'sparse', 'breakEncoding': 'implication'},
+]
+
+# Extra seconds allowed beyond the solve time limit for model building and start-up
+BUILD_GRACE_SECONDS = 5
+
+
+def _solve_configuration(index, data, configuration, time_limit_seconds, results):
+    """Solve the problem with one configuration and report the result.
+
+    Args:
+        index: Index of the configuration in the portfolio
+        data: Scheduling input data
+        configuration: Solver options overriding the input's solverOptions
+        time_limit_seconds: Maximum time to spend solving
+        results: Queue receiving (index, result) tuples
+    """
+    config_data = dict(data)
+    config_data['solverOptions'] = {**data.get('solverOptions', {}), **configuration}
+
+    try:
+        result = ScheduleSolver(config_data).solve(time_limit_seconds)
+    except Exception as error:
+        result = {
+            'status': 'error',
+            'message': str(error),
+            'solveTime': 0
+        }
+
+    results.put((index, result))
+
+
+class PortfolioSolver:
+    """Class for racing several ScheduleSolver configurations against each other."""
+
+    def __init__(self, data, configurations=None):
+        """Initialize the portfolio with input data.
+
+        Args:
+            data: Dictionary containing scheduling input data (see ScheduleSolver)
+            configurations: Optional list of solverOptions dictionaries to race
+                (default: DEFAULT_CONFIGURATIONS)
+        """
+        self.data = data
+        self.configurations = configurations or DEFAULT_CONFIGURATIONS
+
+    def solve(self, time_limit_seconds=60):
+        """Race all configurations and return the first conclusive result.
+
+        A result is conclusive when a configuration reports an optimal solution
+        or proves the problem infeasible. If no configuration is conclusive
+        within the time budget, the best result seen so far is returned.
+
+        Args:
+            time_limit_seconds: Maximum time each configuration spends solving
+
+        Returns:
+            Dictionary with the winning solver result and portfolio details
+        """
+        # Load OR-Tools once before forking so the workers inherit it
+        _cp_model()
+
+        # Split the available cores between the configurations
+        workers_per_configuration = max(1, (os.cpu_count() or 1) // len(self.configurations))
+
+        results = multiprocessing.Queue()
+        processes = []
+        start_time = time.time()
+
+        for index, configuration in enumerate(self.configurations):
+            configuration = {'numWorkers': workers_per_configuration, **configuration}
+            process = multiprocessing.Process(
+                target=_solve_configuration,
+                args=(index, self.data, configuration, time_limit_seconds, results),
+                daemon=True
+            )
+            process.start()
+            processes.append(process)
+
+        deadline = start_time + time_limit_seconds + BUILD_GRACE_SECONDS
+        finished = {}
+        winner = None
+
+        while len(finished) < len(processes):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                index, result = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            finished[index] = result
+            if self._is_conclusive(result):
+                winner = index
+                break
+
+        # Stop the configurations that are still running
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+        if winner is None:
+            winner = self._select_best(finished)
+
+        wall_time = time.time() - start_time
+
+        if winner is None:
+            result = {
+                'status': 'infeasible',
+                'statusCode': UNKNOWN,
+                'message': 'No configuration finished within the time limit',
+                'solveTime': wall_time
+            }
+        else:
+            result = dict(finished[winner])
+
+        result['portfolio'] = {
+            'winner': winner,
+            'configuration': self.configurations[winner] if winner is not None else None,
+            'numConfigurations': len(self.configurations),
+            'wallTime': wall_time,
+            'runs': [
+                {
+                    'index': index,
+                    'configuration': self.configurations[index],
+                    'status': run['status'],
+                    'statusCode': run.get('statusCode'),
+                    'solveTime': run['solveTime']
+                }
+                for index, run in sorted(finished.items())
+            ]
+        }
+
+        # The configurations solve in their own processes, so only the outcome is recorded here
+        metrics.record_solve(result, None)
+        return result
+
+    def _is_conclusive(self, result):
+        """Check whether a result ends the race.
+
+        Args:
+            result: Solver result from one configuration
+
+        Returns:
+            True if the result is optimal or a proof of infeasibility
+        """
+        if result['status'] == 'success':
+            return result['statusString'] == 'optimal'
+        return result.get('statusCode') == INFEASIBLE
+
+    def _select_best(self, finished):
+        """Select the best result among the configurations that finished.
+
+        Successes rank by optimality, then, with a referenceSchedule, by the
+        share of classes kept in their reference slot; ties go to the lowest
+        index.
+
+        Args:
+            finished: Dictionary mapping configuration index to result
+
+        Returns:
+            Index of the best result, or None if nothing finished
+        """
+        successes = [index for index, result in finished.items() if result['status'] == 'success']
+        if successes:
+            return min(successes, key=lambda index: (
+                finished[index]['statusString'] != 'optimal',
+                -finished[index].get('diff', {}).get('stability', 0),
+                index
+            ))
+        if finished:
+            return min(finished)
+        return None
+
+
+def main():
+    """Main function to read input and run the portfolio."""
+    metrics.configure('portfolio')
+
+    # Read input from stdin
+    input_data = json.loads(sys.stdin.read())
+
+    # Create portfolio, optionally with configurations from the input
+    portfolio = PortfolioSolver(input_data, input_data.get('portfolioConfigurations'))
+
+    # Solve and get result
+    result = portfolio.solve()
+
+    # Output result as JSON
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
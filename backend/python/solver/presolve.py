@@ -0,0 +1,214 @@
+"""
+Thunder Scheduler Presolve
+Propagation over the compiled input that settles part of the schedule before CP-SAT.
+
+Every class starts with the slots that its conflicts and the teacher's
+availability leave open. Locked classes are fixed in their given slots, and
+a class with a single slot left is fixed there. A
+fixed class takes its slot, and with a required break also the neighbouring
+periods, from every other class. It also counts towards the day, week and
+consecutive-class limits, which can close more slots. These rules are
+applied until nothing changes, so the model only has to decide the open
+classes, over the slots they still have.
+"""
+
+import time
+from array import array
+
+from solver.day_masks import DayMaskCalendar, build_extension_table
+
+# Number of periods set in every day mask
+POPCOUNT = tuple(bin(mask).count('1') for mask in range(256))
+
+
+class PresolveResult:
+    """Class holding the fixed classes and reduced slot domains found by presolve.
+
+    Domains are period bitmasks in a flat array indexed by
+    (class_index * rotation_weeks + week - 1) * len(days) + day_index.
+    """
+
+    def __init__(self, compiled):
+        """Start from the slots the compiled input leaves open to each class.
+
+        Args:
+            compiled: CompiledProblem built from the input data
+        """
+        self.compiled = compiled
+        self.num_weeks = compiled.rotation_weeks
+        self.fixed = {}
+        self.infeasible_class = None
+        self.stats = {}
+
+        num_days = len(compiled.days)
+        full_day = (1 << len(compiled.periods)) - 1
+        self.domains = array('B')
+        for class_index in range(len(compiled.class_ids)):
+            # Every week of the rotation starts with the same open periods
+            week_domains = array('B', [
+                full_day & ~(compiled.conflict_masks[class_index * num_days + day_index] | compiled.teacher_masks[day_index])
+                for day_index in range(num_days)
+            ])
+            self.domains.extend(week_domains * self.num_weeks)
+
+    def domain_index(self, class_id, week, day):
+        """Get the flat array index of a class, week and day."""
+        class_index = self.compiled.class_index[class_id]
+        return (class_index * self.num_weeks + week - 1) * len(self.compiled.days) + self.compiled.day_index[day]
+
+    def allows(self, class_id, week, day, period):
+        """Check whether a slot is still in a class's domain."""
+        return bool(self.domains[self.domain_index(class_id, week, day)] & (1 << (period - 1)))
+
+    def restrict(self, class_id, slots):
+        """Remove every slot but the given ones from a class's domain.
+
+        Args:
+            class_id: ID of the class
+            slots: Iterable of (week, day, period) slots the class may keep;
+                slots outside the calendar are dropped
+        """
+        num_days = len(self.compiled.days)
+        base = self.domain_index(class_id, 1, self.compiled.days[0])
+        keep = array('B', [0] * (self.num_weeks * num_days))
+        for week, day, period in slots:
+            if not (1 <= week <= self.num_weeks and day in self.compiled.day_index and period in self.compiled.periods):
+                continue
+            keep[(week - 1) * num_days + self.compiled.day_index[day]] |= 1 << (period - 1)
+        for offset, mask in enumerate(keep):
+            self.domains[base + offset] &= mask
+
+    def fixed_assignments(self):
+        """Get the assignments of the fixed classes, in input order."""
+        return [
+            {'classId': class_id, 'week': week, 'day': day, 'period': period}
+            for class_id, (week, day, period) in sorted(
+                self.fixed.items(), key=lambda item: self.compiled.class_index[item[0]]
+            )
+        ]
+
+
+def presolve(compiled, locked_assignments=()):
+    """Fix locked and forced classes and shrink the slot domains of the others to a fixpoint.
+
+    Args:
+        compiled: CompiledProblem built from the input data
+        locked_assignments: Assignments of classes that must keep their slot
+
+    Returns:
+        PresolveResult; its infeasible_class is set when a class has no slot
+        left or its locked slot is not allowed, and its stats report how much
+        was removed:
+            - numSlots: class/slot pairs before presolve
+            - numBlocked: pairs ruled out by conflicts and teacher availability
+            - numPropagated: pairs ruled out by fixed classes
+            - numLocked: classes fixed by locked assignments
+            - numFixed: classes fixed, locked ones included
+            - numOpen: slots left to the classes the model still decides
+            - rounds: propagation rounds until the fixpoint
+            - presolveTime: seconds spent
+    """
+    start_time = time.time()
+    result = PresolveResult(compiled)
+    days = compiled.days
+    num_days = len(days)
+    num_weeks = result.num_weeks
+    span = num_weeks * num_days
+    full_day = (1 << len(compiled.periods)) - 1
+    extension = build_extension_table(compiled.max_consecutive, len(compiled.periods))
+    domains = result.domains
+
+    calendar = DayMaskCalendar(days, num_weeks, len(compiled.periods))
+    # Periods of each (week, day) that no open class may take any more
+    closed = array('B', [0] * span)
+
+    def close_week(week):
+        week_full = sum(POPCOUNT[calendar.mask(week, day)] for day in days) >= compiled.max_classes_per_week
+        for day_index, day in enumerate(days):
+            mask = calendar.mask(week, day)
+            if week_full or POPCOUNT[mask] >= compiled.max_classes_per_day:
+                closed_mask = full_day
+            else:
+                closed_mask = mask | extension[mask]
+                if compiled.require_break:
+                    closed_mask |= ((mask << 1) | (mask >> 1)) & full_day
+            closed[(week - 1) * num_days + day_index] = closed_mask
+
+    def fix(class_index, offset, period):
+        week, day = offset // num_days + 1, days[offset % num_days]
+        result.fixed[compiled.class_ids[class_index]] = (week, day, period)
+        calendar.add(week, day, period)
+        close_week(week)
+
+    num_candidates = sum(POPCOUNT[mask] for mask in domains)
+
+    for assignment in locked_assignments:
+        class_id = assignment['classId']
+        week = assignment.get('week', 1)
+        if class_id not in compiled.class_index:
+            raise ValueError(f'Locked assignment for unknown class {class_id}')
+        if (not 1 <= week <= num_weeks or assignment['day'] not in compiled.day_index
+                or assignment['period'] not in compiled.periods):
+            raise ValueError(f'Locked assignment of class {class_id} is outside the calendar')
+
+        class_index = compiled.class_index[class_id]
+        base = class_index * span
+        offset = (week - 1) * num_days + compiled.day_index[assignment['day']]
+        bit = 1 << (assignment['period'] - 1)
+        if class_id in result.fixed or not domains[base + offset] & ~closed[offset] & bit:
+            # Locked twice, or into a blocked slot or one the earlier locks rule out
+            result.infeasible_class = class_id
+            break
+
+        domains[base:base + span] = array('B', [0] * span)
+        domains[base + offset] = bit
+        fix(class_index, offset, assignment['period'])
+
+    num_locked = len(result.fixed)
+    open_classes = [
+        class_index for class_index, class_id in enumerate(compiled.class_ids) if class_id not in result.fixed
+    ]
+    rounds = 0
+    changed = True
+
+    while changed and result.infeasible_class is None:
+        changed = False
+        rounds += 1
+        still_open = []
+
+        for class_index in open_classes:
+            base = class_index * span
+            size = 0
+            for offset in range(span):
+                mask = domains[base + offset] & ~closed[offset]
+                domains[base + offset] = mask
+                size += POPCOUNT[mask]
+
+            if size == 0:
+                result.infeasible_class = compiled.class_ids[class_index]
+                break
+            if size > 1:
+                still_open.append(class_index)
+                continue
+
+            # The only slot left: fix the class there and close what it rules out
+            offset = next(offset for offset in range(span) if domains[base + offset])
+            fix(class_index, offset, domains[base + offset].bit_length())
+            changed = True
+
+        open_classes = still_open
+
+    num_open = sum(POPCOUNT[domains[class_index * span + offset]] for class_index in open_classes for offset in range(span))
+    num_slots = len(compiled.class_ids) * span * len(compiled.periods)
+    num_blocked = num_slots - num_candidates
+    result.stats = {
+        'numSlots': num_slots,
+        'numBlocked': num_blocked,
+        'numPropagated': num_slots - num_blocked - num_open - len(result.fixed),
+        'numLocked': num_locked,
+        'numFixed': len(result.fixed),
+        'numOpen': num_open,
+        'rounds': rounds,
+        'presolveTime': time.time() - start_time
+    }
+    return result
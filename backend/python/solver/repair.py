@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Schedule Repair
+This script fixes the violations of an edited schedule while keeping the rest of it in place.
+"""
+
+import json
+import os
+import sys
+import time
+
+# Allow running as a script as well as importing as solver.repair
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.compiled_problem import CompiledProblem
+from solver.constraint_solver import ScheduleSolver
+from solver.schedule_diff import diff_schedules
+from solver.solution_validator import check_schedule
+
+# Neighbourhoods freed around the violations, from the smallest to the whole schedule
+LEVELS = ('slot', 'day', 'week', 'all')
+
+
+def _slot(assignment):
+    """Get the (week, day, period) slot of an assignment."""
+    return assignment.get('week', 1), assignment['day'], assignment['period']
+
+
+class ScheduleRepair:
+    """Class for repairing a schedule that fails validation.
+
+    The classes involved in a violation are freed together with their
+    calendar neighbours and re-solved with every other class locked in
+    place, preferring each freed class's current slot. When that leaves no
+    schedule, the neighbourhood widens level by level (see LEVELS):
+        - slot: the involved classes and the classes in adjacent periods
+        - day: every class on the same days as the involved classes
+        - week: every class in the same weeks
+        - all: every class
+    """
+
+    def __init__(self, data):
+        """Initialize the repair with input data.
+
+        Args:
+            data: Dictionary containing scheduling input data (see ScheduleSolver)
+        """
+        self.data = data
+        self.compiled = CompiledProblem(data)
+
+    def repair(self, assignments, violations=None, time_limit_seconds=10):
+        """Repair a schedule.
+
+        Args:
+            assignments: List of assignments of the edited schedule;
+                assignments of unknown classes are dropped
+            violations: Violations of the schedule as ScheduleValidator
+                reports them (default: validate the schedule here)
+            time_limit_seconds: Time limit of each repair solve
+
+        Returns:
+            Dictionary with the repaired 'solution', its 'diff' against the
+            edited schedule, the 'level' of the neighbourhood that was
+            solved, the 'freedClasses' and one entry per solve in 'attempts'
+        """
+        start_time = time.time()
+        schedule = [assignment for assignment in assignments if assignment['classId'] in self.compiled.class_index]
+        if violations is None:
+            violations = check_schedule(self.compiled, schedule)['violations']
+
+        result = {
+            'status': 'success',
+            'solution': schedule,
+            'numViolations': len(violations),
+            'level': None,
+            'freedClasses': [],
+            'attempts': []
+        }
+        if not violations:
+            result.update(diff=diff_schedules(schedule, schedule), totalTime=time.time() - start_time)
+            return result
+
+        by_class = {}
+        by_day = {}
+        for assignment in schedule:
+            by_class.setdefault(assignment['classId'], []).append(assignment)
+            week, day, _ = _slot(assignment)
+            by_day.setdefault((week, day), []).append(assignment)
+
+        involved, slots = self._involved(violations, by_class, by_day)
+        # The user's slots are what the repair should keep, one per class
+        current = [entries[0] for entries in by_class.values()]
+        freed = set()
+
+        for level in LEVELS:
+            widened = self._neighbourhood(level, involved, slots, by_day)
+            if widened == freed:
+                continue
+            freed = widened
+
+            locked = [assignment for assignment in current if assignment['classId'] not in freed]
+            solver_data = dict(
+                self.data,
+                lockedAssignments=locked,
+                solverOptions={**self.data.get('solverOptions', {}), 'referenceSchedule': current}
+            )
+            attempt = ScheduleSolver(solver_data, compiled=self.compiled).solve(time_limit_seconds)
+            result['attempts'].append({
+                'level': level,
+                'numFreed': len(freed),
+                'status': attempt['status'],
+                'solveTime': attempt['solveTime']
+            })
+            if attempt['status'] == 'success':
+                result.update(
+                    solution=attempt['solution'],
+                    diff=diff_schedules(current, attempt['solution']),
+                    level=level,
+                    freedClasses=sorted(freed, key=self.compiled.class_index.get)
+                )
+                break
+        else:
+            result.update(status='infeasible', message='No repair found, not even by rescheduling every class')
+
+        result['totalTime'] = time.time() - start_time
+        return result
+
+    def _involved(self, violations, by_class, by_day):
+        """Collect the classes and slots a list of violations involves.
+
+        Args:
+            violations: List of violations
+            by_class: Dictionary mapping class IDs to their assignments
+            by_day: Dictionary mapping (week, day) to its assignments
+
+        Returns:
+            Tuple of (set of class IDs, set of (week, day, period) slots)
+        """
+        involved = set()
+        slots = set()
+
+        for violation in violations:
+            kind = violation['type']
+            if kind in ('class_conflict', 'teacher_unavailable'):
+                assignments = [violation['assignment']]
+            elif kind == 'multiple_classes_per_slot':
+                assignments = violation['assignments']
+            elif kind in ('class_not_scheduled', 'class_scheduled_multiple_times'):
+                involved.add(violation['classId'])
+                assignments = by_class.get(violation['classId'], [])
+            elif kind == 'invalid_slot':
+                # The class has to move into the calendar; its slot has no neighbours
+                involved.add(violation['assignment']['classId'])
+                assignments = []
+            elif kind == 'max_classes_per_week_exceeded':
+                week = int(violation['week'])
+                assignments = [
+                    assignment for (day_week, _), entries in by_day.items() if day_week == week for assignment in entries
+                ]
+            else:
+                # Day capacity, consecutive run and break violations name a day
+                entries = by_day.get((int(violation['week']), violation['day']), [])
+                if kind == 'max_consecutive_classes_exceeded':
+                    periods = set(violation['periods'])
+                elif kind == 'no_break_after_class':
+                    periods = {violation['period'], violation['period'] + 1}
+                else:
+                    periods = None
+                assignments = [
+                    assignment for assignment in entries if periods is None or assignment['period'] in periods
+                ]
+
+            for assignment in assignments:
+                involved.add(assignment['classId'])
+                slots.add(_slot(assignment))
+
+        # Violations passed in may name classes the input doesn't know
+        return involved & self.compiled.class_index.keys(), slots
+
+    def _neighbourhood(self, level, involved, slots, by_day):
+        """Get the classes to free at a neighbourhood level.
+
+        Args:
+            level: Neighbourhood level (see LEVELS)
+            involved: Set of class IDs involved in the violations
+            slots: Set of slots of the involved assignments
+            by_day: Dictionary mapping (week, day) to its assignments
+
+        Returns:
+            Set of class IDs
+        """
+        if level == 'all':
+            return set(self.compiled.class_ids)
+
+        freed = set(involved)
+        if level == 'week':
+            weeks = {week for week, _, _ in slots}
+            for (week, _), entries in by_day.items():
+                if week in weeks:
+                    freed.update(assignment['classId'] for assignment in entries)
+            return freed
+
+        # Only the days of the violations are looked at, so the cost follows the violations
+        for week, day, period in slots:
+            for assignment in by_day.get((week, day), []):
+                if level == 'day' or abs(assignment['period'] - period) <= 1:
+                    freed.add(assignment['classId'])
+        return freed
+
+
+def main():
+    """Main function to read an edited schedule and repair it.
+
+    The stdin input holds the scheduling input data plus the 'assignments'
+    of the edited schedule, optionally its 'violations' as reported by the
+    validator and a 'repairTimeLimit' in seconds per repair solve.
+    """
+    metrics.configure('repair')
+    input_data = json.loads(sys.stdin.read())
+    result = ScheduleRepair(input_data).repair(
+        input_data['assignments'],
+        input_data.get('violations'),
+        input_data.get('repairTimeLimit', 10)
+    )
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Saved Models
+This script solves CP-SAT models exported by ScheduleSolver without rebuilding them.
+
+An export directory holds:
+    - model.pbtxt: the built CpModel proto in text format
+    - parameters.pbtxt: the CP-SAT parameters of the solve
+    - input.json: the solver input data
+    - variables.json: [classId, week, day, period, variable index] for every
+      assignment variable, to decode solutions of the saved model
+    - groups.json: the class groups, for models built with symmetry reduction
+    - fixed.json: the assignments of classes fixed in presolve, which have
+      no variables in the model
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Allow running as a script as well as importing as solver.saved_model
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import FEASIBLE, OPTIMAL, _cp_model, input_fingerprint
+from solver.symmetry import expand_solution
+from solver.wire_format import DAYS
+
+MODEL_FILE = 'model.pbtxt'
+PARAMETERS_FILE = 'parameters.pbtxt'
+INPUT_FILE = 'input.json'
+VARIABLES_FILE = 'variables.json'
+GROUPS_FILE = 'groups.json'
+FIXED_FILE = 'fixed.json'
+
+
+def export_model(solver, directory):
+    """Export a built model with its input and parameters.
+
+    Each input gets its own subdirectory, named after its fingerprint, so
+    repeated exports into one directory build up a corpus of instances.
+
+    Args:
+        solver: ScheduleSolver whose model is built and solver created
+        directory: Directory to export into
+
+    Returns:
+        Path of the export subdirectory
+    """
+    path = os.path.join(directory, input_fingerprint(solver.input_data())[:16])
+    os.makedirs(path, exist_ok=True)
+
+    solver.model.ExportToFile(os.path.join(path, MODEL_FILE))
+    with open(os.path.join(path, PARAMETERS_FILE), 'w') as parameters_file:
+        parameters_file.write(str(solver.solver.parameters))
+    with open(os.path.join(path, INPUT_FILE), 'w') as input_file:
+        json.dump(solver.input_data(), input_file)
+    with open(os.path.join(path, VARIABLES_FILE), 'w') as variables_file:
+        json.dump([
+            [class_id, week, day, period, index]
+            for (class_id, week, day, period), index in zip(solver.assignments, solver.variable_indices)
+        ], variables_file)
+    if len(solver.group_of) > len(solver.groups):
+        with open(os.path.join(path, GROUPS_FILE), 'w') as groups_file:
+            json.dump(solver.groups, groups_file)
+    if solver.fixed_slots:
+        with open(os.path.join(path, FIXED_FILE), 'w') as fixed_file:
+            json.dump(solver.presolved.fixed_assignments(), fixed_file)
+
+    return path
+
+
+def load_model(path):
+    """Load an exported model and its solver parameters.
+
+    Args:
+        path: Export subdirectory written by export_model
+
+    Returns:
+        Tuple of (CpModel, CpSolver configured with the saved parameters)
+    """
+    cp_model = _cp_model()
+    model = cp_model.CpModel()
+    with open(os.path.join(path, MODEL_FILE)) as model_file:
+        _parse_text_format(model_file.read(), model.Proto())
+
+    solver = cp_model.CpSolver()
+    with open(os.path.join(path, PARAMETERS_FILE)) as parameters_file:
+        _parse_text_format(parameters_file.read(), solver.parameters)
+
+    return model, solver
+
+
+def solve_saved_model(path, time_limit_seconds=None, num_workers=None):
+    """Solve an exported model directly, skipping the model build.
+
+    Args:
+        path: Export subdirectory written by export_model
+        time_limit_seconds: Optional wall-clock limit replacing the saved one
+        num_workers: Optional number of search workers replacing the saved one
+
+    Returns:
+        Dictionary with the status, solution and solve time as
+        ScheduleSolver.solve reports them, plus the time spent loading the model
+    """
+    start_time = time.time()
+    model, solver = load_model(path)
+    with open(os.path.join(path, VARIABLES_FILE)) as variables_file:
+        variables = json.load(variables_file)
+    load_time = time.time() - start_time
+
+    if time_limit_seconds is not None:
+        solver.parameters.max_time_in_seconds = time_limit_seconds
+    if num_workers is not None:
+        solver.parameters.num_workers = num_workers
+
+    start_time = time.time()
+    status = int(solver.Solve(model))
+    solve_time = time.time() - start_time
+
+    if status not in (OPTIMAL, FEASIBLE):
+        return {
+            'status': 'infeasible',
+            'statusCode': status,
+            'message': 'No solution found that satisfies all constraints',
+            'solveTime': solve_time,
+            'loadTime': load_time
+        }
+
+    values = np.array(solver.ResponseProto().solution)
+    indices = np.array([variable[4] for variable in variables], dtype=np.int64)
+    solution = [
+        dict(zip(('classId', 'week', 'day', 'period'), variables[position][:4]))
+        for position in np.flatnonzero(values[indices]).tolist()
+    ]
+
+    groups_path = os.path.join(path, GROUPS_FILE)
+    if os.path.exists(groups_path):
+        with open(groups_path) as groups_file:
+            groups = json.load(groups_file)
+        solution = expand_solution(solution, groups, {day: index for index, day in enumerate(DAYS)})
+
+    fixed_path = os.path.join(path, FIXED_FILE)
+    if os.path.exists(fixed_path):
+        with open(fixed_path) as fixed_file:
+            solution.extend(json.load(fixed_file))
+
+    return {
+        'status': 'success',
+        'statusCode': status,
+        'statusString': 'optimal' if status == OPTIMAL else 'feasible',
+        'solution': solution,
+        'solveTime': solve_time,
+        'loadTime': load_time,
+        'numAssignments': len(solution)
+    }
+
+
+def _parse_text_format(text, message):
+    """Parse a text format proto into a message of either OR-Tools proto flavour."""
+    if hasattr(message, 'parse_text_format'):
+        message.parse_text_format(text)
+    else:
+        from google.protobuf import text_format
+        text_format.Parse(text, message)
+
+
+def main():
+    """Main function to solve an exported model."""
+    parser = argparse.ArgumentParser(description='Solve a model exported by the Thunder Scheduler solver')
+    parser.add_argument('path', help='Export directory written with the exportModelDir solver option')
+    parser.add_argument('--time-limit', type=float, help='Wall-clock time limit in seconds')
+    parser.add_argument('--num-workers', type=int, help='Number of search workers')
+    args = parser.parse_args()
+
+    result = solve_saved_model(args.path, args.time_limit, args.num_workers)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Schedule Diff
+This script compares two schedules and reports which classes moved.
+"""
+
+import json
+import sys
+
+
+def _slot(assignment):
+    """Get the (week, day, period) slot of an assignment."""
+    return assignment.get('week', 1), assignment['day'], assignment['period']
+
+
+def _index_by_class(assignments):
+    """Index a schedule by class ID.
+
+    Args:
+        assignments: List of assignment dictionaries
+
+    Returns:
+        Dictionary mapping class IDs to their first assignment
+    """
+    index = {}
+    for assignment in assignments:
+        index.setdefault(assignment['classId'], assignment)
+    return index
+
+
+def diff_schedules(previous, current):
+    """Compare two schedules class by class in linear time.
+
+    Args:
+        previous: List of assignments of the earlier schedule
+        current: List of assignments of the later schedule
+
+    Returns:
+        Dictionary with:
+            - moved: classes whose slot changed, with their 'from' and 'to' slots
+            - added: assignments of classes only in the current schedule
+            - removed: assignments of classes only in the previous schedule
+            - numUnchanged: number of classes that kept their slot
+            - stability: share of all classes that kept their slot (1.0 when
+              both schedules are empty)
+    """
+    previous_index = _index_by_class(previous)
+    current_index = _index_by_class(current)
+
+    moved = []
+    removed = []
+    num_unchanged = 0
+
+    for class_id, before in previous_index.items():
+        after = current_index.get(class_id)
+        if after is None:
+            removed.append(before)
+        elif _slot(before) == _slot(after):
+            num_unchanged += 1
+        else:
+            moved.append({
+                'classId': class_id,
+                'from': dict(zip(('week', 'day', 'period'), _slot(before))),
+                'to': dict(zip(('week', 'day', 'period'), _slot(after)))
+            })
+
+    added = [
+        assignment for class_id, assignment in current_index.items()
+        if class_id not in previous_index
+    ]
+    num_classes = len(previous_index) + len(added)
+
+    return {
+        'moved': moved,
+        'added': added,
+        'removed': removed,
+        'numUnchanged': num_unchanged,
+        'stability': num_unchanged / num_classes if num_classes else 1.0
+    }
+
+
+def main():
+    """Main function to read two schedules and print their diff.
+
+    The stdin input holds 'previous' and 'current' lists of assignments.
+    """
+    input_data = json.loads(sys.stdin.read())
+    result = diff_schedules(input_data['previous'], input_data['current'])
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
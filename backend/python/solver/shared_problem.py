@@ -0,0 +1,242 @@
+"""
+Thunder Scheduler Shared Problem
+Compiled problems and schedules in shared memory for process-pool workers.
+
+The compiled input is packed once into a binary frame (see wire_format) in
+a multiprocessing.shared_memory block. Workers attach to the block by name
+and read the period bitmasks and class index tables in place, so a task
+only has to carry block names, however large the roster is. Schedules are
+shared the same way, as the columnar assignment arrays of the wire format.
+
+A typical pool hands the problem's name to every worker once:
+
+    with SharedProblem.create(data) as problem:
+        with multiprocessing.Pool(initializer=attach_worker, initargs=(problem.name,)) as pool:
+            results = pool.map(check_shared_schedule, schedule_names)
+        problem.unlink()
+"""
+
+import json
+import sys
+from functools import cached_property
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from solver.compiled_problem import CompiledProblem
+from solver.solution_validator import check_schedule
+from solver.wire_format import decode_assignments, encode_assignments, pack_frame, unpack_frame
+
+# Problem attached by attach_worker in each pool worker
+_worker_problem = None
+
+
+def _create_block(frame):
+    """Copy a frame into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=len(frame))
+    block.buf[:len(frame)] = frame
+    return block
+
+
+def _attach_block(name):
+    """Attach to an existing shared memory block without taking over its cleanup."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older versions always register the block, which is harmless for pool
+    # workers: they share the creating process's resource tracker
+    return shared_memory.SharedMemory(name=name)
+
+
+class _SharedFrame:
+    """Base class for a binary frame held in a shared memory block.
+
+    The creating process owns the block and unlinks it when every worker is
+    done; all processes close their own handle. Array views into the block
+    must not outlive close().
+    """
+
+    def __init__(self, block):
+        self.block = block
+        self.header, self.arrays = unpack_frame(block.buf)
+
+    @property
+    def name(self):
+        """Name under which other processes attach to the block."""
+        return self.block.name
+
+    def close(self):
+        """Release this process's views and handle of the block."""
+        self._release()
+        self.header = self.arrays = None
+        self.block.close()
+
+    def unlink(self):
+        """Free the block once every process has closed it."""
+        self.block.unlink()
+
+    def _release(self):
+        """Drop the views a subclass keeps into the block."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedProblem(_SharedFrame, CompiledProblem):
+    """CompiledProblem backed by a shared memory block.
+
+    Conflict and teacher masks are views into the block with the flat layout
+    of CompiledProblem, so everything that reads a CompiledProblem (the
+    validator, presolve) works on it unchanged. The class ID table, the
+    class index and the class records are decoded on first use only.
+    """
+
+    def __init__(self, block):
+        """Read a problem from a shared memory block.
+
+        Args:
+            block: SharedMemory block holding a frame written by create
+        """
+        _SharedFrame.__init__(self, block)
+        self.constraints = self.header['constraints']
+        self.rotation_weeks = self.header['rotationWeeks']
+        self.days = self.header['days']
+        self.periods = self.header['periods']
+        self.day_index = {day: index for index, day in enumerate(self.days)}
+
+        self.max_classes_per_day = self.constraints.get('maxClassesPerDay', 4)
+        self.max_classes_per_week = self.constraints.get('maxClassesPerWeek', 16)
+        self.max_consecutive = self.constraints.get('maxConsecutiveClasses', 2)
+        self.require_break = self.constraints.get('requireBreakAfterClass', False)
+
+        # memoryviews index to plain ints, as the arrays of CompiledProblem do
+        self.conflict_masks = memoryview(self.arrays['conflictMasks'])
+        self.teacher_masks = memoryview(self.arrays['teacherMasks'])
+
+    @classmethod
+    def create(cls, data):
+        """Compile input data into a new shared memory block.
+
+        Args:
+            data: Dictionary containing scheduling input data (see ScheduleSolver)
+
+        Returns:
+            SharedProblem owning the block
+        """
+        compiled = CompiledProblem(data)
+        id_bytes = [class_id.encode('utf-8') for class_id in compiled.class_ids]
+        header = {
+            'constraints': compiled.constraints,
+            'rotationWeeks': compiled.rotation_weeks,
+            'days': compiled.days,
+            'periods': compiled.periods
+        }
+        arrays = {
+            'conflictMasks': np.frombuffer(compiled.conflict_masks, dtype='u1'),
+            'teacherMasks': np.frombuffer(compiled.teacher_masks, dtype='u1'),
+            'classIdOffsets': np.cumsum([0] + [len(raw) for raw in id_bytes], dtype='<u4'),
+            'classIds': np.frombuffer(b''.join(id_bytes), dtype='u1'),
+            'classRecords': np.frombuffer(json.dumps(compiled.classes).encode('utf-8'), dtype='u1')
+        }
+        return cls(_create_block(pack_frame(header, arrays)))
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a problem another process created.
+
+        Args:
+            name: Name of the shared memory block
+
+        Returns:
+            SharedProblem reading the block in place
+        """
+        return cls(_attach_block(name))
+
+    @cached_property
+    def class_ids(self):
+        """Class IDs in input order, decoded from the ID table."""
+        offsets = self.arrays['classIdOffsets'].tolist()
+        raw = self.arrays['classIds'].tobytes()
+        return [raw[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    @cached_property
+    def class_index(self):
+        """Dictionary mapping class IDs to their indices."""
+        return {class_id: index for index, class_id in enumerate(self.class_ids)}
+
+    @cached_property
+    def classes(self):
+        """Class objects of the input, decoded from the class records."""
+        return json.loads(self.arrays['classRecords'].tobytes())
+
+    def _release(self):
+        self.conflict_masks.release()
+        self.teacher_masks.release()
+
+
+class SharedSchedule(_SharedFrame):
+    """List of assignments backed by a shared memory block, as columnar arrays."""
+
+    @classmethod
+    def create(cls, problem, assignments):
+        """Write a schedule into a new shared memory block.
+
+        Args:
+            problem: CompiledProblem or SharedProblem the schedule belongs to
+            assignments: List of assignment dictionaries
+
+        Returns:
+            SharedSchedule owning the block
+
+        Raises:
+            ValueError: If an assignment names a class the problem doesn't know
+        """
+        return cls(_create_block(pack_frame({}, encode_assignments(assignments, problem.class_index))))
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a schedule another process created.
+
+        Args:
+            name: Name of the shared memory block
+
+        Returns:
+            SharedSchedule reading the block in place
+        """
+        return cls(_attach_block(name))
+
+    def assignments(self, problem):
+        """Decode the schedule into assignment dictionaries.
+
+        Args:
+            problem: Problem the schedule was created for
+
+        Returns:
+            List of assignment dictionaries
+        """
+        return decode_assignments(self.arrays, problem.class_ids)
+
+
+def attach_worker(name):
+    """Pool initializer attaching the worker to a shared problem.
+
+    Args:
+        name: Name of the SharedProblem block
+    """
+    global _worker_problem
+    _worker_problem = SharedProblem.attach(name)
+
+
+def check_shared_schedule(name):
+    """Validate a shared schedule against the worker's shared problem.
+
+    Args:
+        name: Name of a SharedSchedule block
+
+    Returns:
+        Validation result (see check_schedule)
+    """
+    with SharedSchedule.attach(name) as schedule:
+        return check_schedule(_worker_problem, schedule.assignments(_worker_problem))
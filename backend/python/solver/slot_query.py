@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Slot Query
+This script answers "where could this class go?" for a schedule without solving.
+"""
+
+import json
+import os
+import sys
+
+# Allow running as a script as well as importing as solver.slot_query
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.compiled_problem import CompiledProblem
+from solver.day_masks import build_extension_table
+from solver.occupancy import ScheduleOccupancy
+from solver.solution_validator import invalid_slot_violation, normalise_slot
+
+ALL_PERIODS = 0xFF
+
+
+class SlotQuery:
+    """Class for finding the slots a class can move to without breaking any rule.
+
+    Every rule checked by ScheduleValidator is evaluated as a period bitmask
+    per (week, day) from the compiled conflicts and teacher availability and
+    the schedule's occupancy, so a query costs a few bit operations per day.
+    The class's own current assignments are ignored, as the class is moving.
+    """
+
+    def __init__(self, compiled, occupancy, invalid_assignments=()):
+        """Initialize the query with a compiled problem and schedule occupancy.
+
+        Args:
+            compiled: CompiledProblem for the input data
+            occupancy: ScheduleOccupancy of the current schedule (shared, not copied)
+            invalid_assignments: Assignments of the schedule outside the
+                calendar, which occupy no slot (shared, not copied)
+        """
+        self.compiled = compiled
+        self.occupancy = occupancy
+        self.invalid_assignments = invalid_assignments
+        self.consecutive_table = build_extension_table(compiled.max_consecutive)
+
+    @classmethod
+    def from_data(cls, data):
+        """Create a query from validation input data with assignments.
+
+        Args:
+            data: Dictionary containing validation input data (see ScheduleValidator)
+
+        Returns:
+            SlotQuery for the schedule in data['assignments']
+        """
+        compiled = CompiledProblem(data)
+        occupancy = ScheduleOccupancy(compiled.days, compiled.class_ids)
+        invalid_assignments = []
+        for assignment in data.get('assignments', []):
+            slot = normalise_slot(compiled, assignment)
+            if slot is None:
+                invalid_assignments.append(assignment)
+            else:
+                occupancy.insert(assignment, slot)
+        return cls(compiled, occupancy, invalid_assignments)
+
+    def reason_masks(self, class_id):
+        """Compute, for every day, the periods excluded by each rule.
+
+        Args:
+            class_id: ID of the class to place
+
+        Returns:
+            Dictionary mapping (week, day) to a dictionary of violation type to
+            the mask of periods that would cause it
+        """
+        compiled = self.compiled
+        occupancy = self.occupancy
+        calendar = occupancy.calendar
+
+        # Take the class's own assignments out of the occupancy
+        freed_bits = {}
+        day_released = {}
+        week_released = {}
+        for week, day, period in occupancy.class_slots.get(class_id, []):
+            if len(occupancy.slot_assignments[(week, day, period)]) == 1:
+                freed_bits[(week, day)] = freed_bits.get((week, day), 0) | (1 << (period - 1))
+            day_released[(week, day)] = day_released.get((week, day), 0) + 1
+            week_released[week] = week_released.get(week, 0) + 1
+
+        # Validation input often leaves rotationWeeks out, so the schedule's own weeks count too
+        num_weeks = max(compiled.rotation_weeks, calendar.num_weeks)
+        masks = {}
+        for week in range(1, num_weeks + 1):
+            week_full = (
+                occupancy.week_counts.get(week, 0) - week_released.get(week, 0)
+                >= compiled.max_classes_per_week
+            )
+            for day in compiled.days:
+                occupied = calendar.mask(week, day) & ~freed_bits.get((week, day), 0)
+                day_count = occupancy.day_counts.get((week, day), 0) - day_released.get((week, day), 0)
+
+                reasons = {
+                    'class_conflict': compiled.conflict_mask(class_id, day),
+                    'teacher_unavailable': compiled.teacher_mask(day),
+                    'multiple_classes_per_slot': occupied,
+                    'max_classes_per_day_exceeded': ALL_PERIODS if day_count >= compiled.max_classes_per_day else 0,
+                    'max_classes_per_week_exceeded': ALL_PERIODS if week_full else 0,
+                    'max_consecutive_classes_exceeded': self.consecutive_table[occupied],
+                }
+                if compiled.require_break:
+                    reasons['no_break_after_class'] = ((occupied << 1) | (occupied >> 1)) & ALL_PERIODS & ~occupied
+                masks[(week, day)] = reasons
+
+        return masks
+
+    def feasible_masks(self, class_id):
+        """Compute the periods of every day the class can move to.
+
+        Args:
+            class_id: ID of the class to place
+
+        Returns:
+            Dictionary mapping (week, day) to the mask of feasible periods
+        """
+        feasible = {}
+        for day_key, reasons in self.reason_masks(class_id).items():
+            excluded = 0
+            for mask in reasons.values():
+                excluded |= mask
+            feasible[day_key] = ALL_PERIODS & ~excluded
+        return feasible
+
+    def explain(self, class_id):
+        """List the feasible slots of a class and why every other slot is excluded.
+
+        Args:
+            class_id: ID of the class to place
+
+        Returns:
+            Dictionary with the feasible slots, the excluded slots with
+            reasons and the class's invalidSlots violations, for assignments
+            outside the calendar
+        """
+        feasible = []
+        excluded = []
+        for (week, day), reasons in self.reason_masks(class_id).items():
+            for period in self.compiled.periods:
+                bit = 1 << (period - 1)
+                slot_reasons = [reason for reason, mask in reasons.items() if mask & bit]
+                slot = {'week': week, 'day': day, 'period': period}
+                if slot_reasons:
+                    excluded.append(dict(slot, reasons=slot_reasons))
+                else:
+                    feasible.append(slot)
+
+        return {
+            'classId': class_id,
+            'feasible': feasible,
+            'excluded': excluded,
+            'invalidSlots': [
+                invalid_slot_violation(assignment)
+                for assignment in self.invalid_assignments if assignment['classId'] == class_id
+            ]
+        }
+
+
+def main():
+    """Main function to read input and explain the slots of one or more classes.
+
+    Input is validation input data with the current assignments plus
+    'classIds', the classes to explain.
+    """
+    # Read input from stdin
+    input_data = json.loads(sys.stdin.read())
+
+    # Create query
+    query = SlotQuery.from_data(input_data)
+
+    # Explain the requested classes
+    result = [query.explain(class_id) for class_id in input_data['classIds']]
+
+    # Output result as JSON
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
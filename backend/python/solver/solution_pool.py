@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Thunder Scheduler Solution Pool
+This script finds several alternative schedules of one problem with one model build.
+"""
+
+import json
+import os
+import sys
+import time
+
+# Allow running as a script as well as importing as solver.solution_pool
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.constraint_solver import ScheduleSolver, FEASIBLE, INFEASIBLE, OPTIMAL
+from solver.schedule_diff import diff_schedules
+
+
+class SolutionPool:
+    """Class for collecting a pool of mutually different schedules.
+
+    The model is built once. After each schedule found, a cut allowing at
+    most (number of modelled classes - min_distance) of its chosen literals
+    to stay true is added, so the next search has to move at least
+    min_distance classes away from every schedule already in the pool.
+    Classes fixed by presolve or locked assignments never move; under
+    symmetry reduction, swapping interchangeable classes does not count as
+    a move.
+    """
+
+    def __init__(self, data, size, min_distance=1):
+        """Initialize the pool with input data.
+
+        Args:
+            data: Dictionary containing scheduling input data (see ScheduleSolver)
+            size: Largest number of schedules to collect
+            min_distance: Fewest classes in which any two schedules of the
+                pool have to differ
+        """
+        if size < 1 or min_distance < 1:
+            raise ValueError('The pool size and minimum distance must be positive')
+
+        self.size = size
+        self.min_distance = min_distance
+        self.solver = ScheduleSolver(data)
+
+    def solve(self, time_limit_seconds=60):
+        """Collect schedules until the pool is full, no other schedule is far enough away or time runs out.
+
+        Args:
+            time_limit_seconds: Time budget for all searches together
+
+        Returns:
+            Dictionary with the 'solutions' found, each with its solve time and
+            its 'distance' (classes moved) to the closest earlier schedule,
+            the status that ended the search and pool totals
+        """
+        start_time = time.time()
+        solver = self.solver
+        result = solver.solve(time_limit_seconds)
+        if result['status'] != 'success':
+            return dict(result, solutions=[], numSolutions=0, totalTime=time.time() - start_time)
+
+        build_time = time.time() - start_time - result['solveTime']
+        solutions = [{
+            'solution': result['solution'],
+            'statusString': result['statusString'],
+            'solveTime': result['solveTime'],
+            'distance': None
+        }]
+        literals = list(solver.assignments.values())
+        num_model_classes = len(solver.group_of)
+        stop_reason = 'full'
+
+        while len(solutions) < self.size:
+            if solver.model is None:
+                # Presolve placed every class, so no other schedule exists
+                stop_reason = 'exhausted'
+                break
+
+            # Forbid every schedule closer than min_distance to the last one found
+            chosen = [literals[position] for position in solver.chosen_positions()]
+            solver.model.Add(sum(chosen) <= num_model_classes - self.min_distance)
+
+            remaining = time_limit_seconds - (time.time() - start_time)
+            if remaining <= 0:
+                stop_reason = 'timeout'
+                break
+            solver.solver.parameters.max_time_in_seconds = remaining
+
+            solve_start = time.time()
+            status = int(solver.solver.Solve(solver.model))
+            solve_time = time.time() - solve_start
+            if status not in (OPTIMAL, FEASIBLE):
+                stop_reason = 'exhausted' if status == INFEASIBLE else 'timeout'
+                break
+
+            extracted = solver._extract_solution(status, solve_time)
+            solutions.append({
+                'solution': extracted['solution'],
+                'statusString': extracted['statusString'],
+                'solveTime': solve_time,
+                'distance': min(
+                    len(diff_schedules(earlier['solution'], extracted['solution'])['moved'])
+                    for earlier in solutions
+                )
+            })
+
+        return {
+            'status': 'success',
+            'solutions': solutions,
+            'numSolutions': len(solutions),
+            'stopReason': stop_reason,
+            'buildTime': build_time,
+            'totalTime': time.time() - start_time,
+            'modelStats': solver.model_stats() if solver.model is not None else None
+        }
+
+
+def main():
+    """Main function to read input and collect a solution pool.
+
+    The stdin input holds the scheduling input data plus 'poolSize', an
+    optional 'minDistance' (default: 1) and an optional 'poolTimeLimit' in
+    seconds for the whole pool.
+    """
+    metrics.configure('solution_pool')
+    input_data = json.loads(sys.stdin.read())
+    pool = SolutionPool(input_data, input_data['poolSize'], input_data.get('minDistance', 1))
+    result = pool.solve(input_data.get('poolTimeLimit', 60))
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
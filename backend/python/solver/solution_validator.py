@@ -4,8 +4,32 @@ Thunder Scheduler Solution Validator
 This script validates if a schedule meets all the required constraints.
 """
 
+import argparse
+import csv
 import json
+import os
 import sys
+import time
+
+# Allow running as a script as well as importing as solver.solution_validator
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.compiled_problem import CompiledProblem
+from solver.day_masks import DayMaskCalendar, RUNS, MAX_RUN
+
+# Order in which violations are grouped in a full validation result
+RULE_ORDER = {
+    'class_conflict': 0,
+    'teacher_unavailable': 1,
+    'multiple_classes_per_slot': 2,
+    'class_not_scheduled': 3,
+    'class_scheduled_multiple_times': 3,
+    'max_classes_per_day_exceeded': 4,
+    'max_classes_per_week_exceeded': 5,
+    'max_consecutive_classes_exceeded': 6,
+    'no_break_after_class': 7,
+    'invalid_slot': 8,
+}
 
 
 class ScheduleValidator:
@@ -29,6 +53,7 @@ class ScheduleValidator:
         self.constraints = data['constraints']
         self.days = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
         self.periods = list(range(1, 9))  # 8 periods per day
+        self.compiled = CompiledProblem(data)
         
     def validate(self):
         """Validate the schedule against all constraints.
@@ -36,257 +61,429 @@ class ScheduleValidator:
         Returns:
             Dictionary with validation results
         """
-        violations = []
-        
-        # Check each constraint
-        violations.extend(self._validate_class_conflicts())
-        violations.extend(self._validate_teacher_availability())
-        violations.extend(self._validate_one_class_per_slot())
-        violations.extend(self._validate_each_class_once())
-        violations.extend(self._validate_max_classes_per_day())
-        violations.extend(self._validate_max_classes_per_week())
-        violations.extend(self._validate_consecutive_classes())
+        start_time = time.time()
+        result = check_schedule(self.compiled, self.assignments)
+        metrics.record_validation('schedule', time.time() - start_time, result['valid'])
+        return result
+
+
+class StreamingScheduleValidator:
+    """Class for validating a stream of assignments in a single pass.
+    
+    Keeps per-slot, per-day, per-week and per-class counters plus a period
+    bitset per day, so memory is bounded by the calendar size and the number
+    of classes rather than the number of assignments. Violations are reported
+    as soon as they can be decided.
+    """
+    
+    def __init__(self, data, compiled=None):
+        """Initialize the validator with input data.
         
-        if self.constraints.get('requireBreakAfterClass', False):
-            violations.extend(self._validate_break_after_class())
+        Args:
+            data: Dictionary containing validation input data (see
+                ScheduleValidator); assignments are passed separately
+            compiled: Optional CompiledProblem already built from the input
+                data, whose indices and masks are then reused (data is ignored)
+        """
+        self.compiled = compiled or CompiledProblem(data)
+        self.classes = self.compiled.classes
+        self.constraints = self.compiled.constraints
+        self.days = self.compiled.days
+        self.periods = self.compiled.periods
+        self.require_break = self.compiled.require_break
         
-        return {
-            'valid': len(violations) == 0,
-            'violations': violations,
-            'numAssignments': len(self.assignments),
-            'numClasses': len(self.classes)
-        }
+        self.slot_assignments = {}
+        self.day_counts = {}
+        self.calendar = DayMaskCalendar(self.days)
+        self.week_counts = {}
+        self.class_counts = {class_obj['id']: 0 for class_obj in self.classes}
+        self.num_assignments = 0
+        self.num_violations = 0
     
-    def _validate_class_conflicts(self):
-        """Validate that no class is scheduled during its conflict periods."""
-        violations = []
+    def validate_stream(self, assignments):
+        """Validate an iterable of assignments.
         
-        for assignment in self.assignments:
-            class_id = assignment['classId']
-            day = assignment['day']
-            period = assignment['period']
-            week = assignment.get('week', 1)
+        Args:
+            assignments: Iterable of assignment dictionaries
             
-            if class_id in self.conflicts and day in self.conflicts[class_id]:
-                if period in self.conflicts[class_id][day]:
-                    violations.append({
-                        'type': 'class_conflict',
-                        'message': f'Class {class_id} scheduled during conflict period {period} on {day} in week {week}',
-                        'assignment': assignment
-                    })
-        
-        return violations
+        Yields:
+            Violations, each as soon as it is detectable
+        """
+        for assignment in assignments:
+            yield from self.add(assignment)
+        yield from self.finish()
     
-    def _validate_teacher_availability(self):
-        """Validate that no class is scheduled when teacher is unavailable."""
-        violations = []
+    def add(self, assignment):
+        """Validate one assignment against the assignments seen so far.
         
-        for assignment in self.assignments:
-            day = assignment['day']
-            period = assignment['period']
-            week = assignment.get('week', 1)
+        Args:
+            assignment: Assignment dictionary
             
-            if day in self.teacher_availability and period in self.teacher_availability[day]:
-                violations.append({
-                    'type': 'teacher_unavailable',
-                    'message': f'Class scheduled when teacher is unavailable on {day} period {period} in week {week}',
-                    'assignment': assignment
-                })
-        
-        return violations
-    
-    def _validate_one_class_per_slot(self):
-        """Validate that only one class is scheduled per time slot."""
+        Returns:
+            List of violations detectable after this assignment
+        """
         violations = []
-        slot_assignments = {}
+        class_id = assignment['classId']
+        self.num_assignments += 1
+        if class_id in self.class_counts:
+            self.class_counts[class_id] += 1
         
-        for assignment in self.assignments:
-            day = assignment['day']
-            period = assignment['period']
-            week = assignment.get('week', 1)
-            slot_key = f"{week}_{day}_{period}"
-            
-            if slot_key in slot_assignments:
-                violations.append({
-                    'type': 'multiple_classes_per_slot',
-                    'message': f'Multiple classes scheduled on {day} period {period} in week {week}',
-                    'assignments': [slot_assignments[slot_key], assignment]
-                })
-            else:
-                slot_assignments[slot_key] = assignment
+        slot = normalise_slot(self.compiled, assignment)
+        if slot is None:
+            self.num_violations += 1
+            return [invalid_slot_violation(assignment)]
+        week, day, period = slot
+        bit = 1 << (period - 1)
         
-        return violations
-    
-    def _validate_each_class_once(self):
-        """Validate that each class is scheduled exactly once per rotation."""
-        violations = []
-        class_counts = {class_obj['id']: 0 for class_obj in self.classes}
+        if self.compiled.conflict_mask(class_id, day) & bit:
+            violations.append(class_conflict_violation(assignment, week, day, period))
         
-        for assignment in self.assignments:
-            class_id = assignment['classId']
-            if class_id in class_counts:
-                class_counts[class_id] += 1
+        if self.compiled.teacher_mask(day) & bit:
+            violations.append(teacher_unavailable_violation(assignment, week, day, period))
         
-        for class_id, count in class_counts.items():
-            if count == 0:
-                violations.append({
-                    'type': 'class_not_scheduled',
-                    'message': f'Class {class_id} not scheduled',
-                    'classId': class_id
-                })
-            elif count > 1:
-                violations.append({
-                    'type': 'class_scheduled_multiple_times',
-                    'message': f'Class {class_id} scheduled {count} times',
-                    'classId': class_id,
-                    'count': count
-                })
+        slot_key = (week, day, period)
+        if slot_key in self.slot_assignments:
+            violations.append(multiple_classes_violation(self.slot_assignments[slot_key], assignment, week, day, period))
+        else:
+            self.slot_assignments[slot_key] = assignment
         
-        return violations
-    
-    def _validate_max_classes_per_day(self):
-        """Validate that the maximum classes per day constraint is met."""
-        violations = []
-        max_classes_per_day = self.constraints.get('maxClassesPerDay', 4)
+        self.week_counts[week] = self.week_counts.get(week, 0) + 1
         
-        # Group assignments by week and day
-        day_counts = {}
-        for assignment in self.assignments:
-            day = assignment['day']
-            week = assignment.get('week', 1)
-            day_key = f"{week}_{day}"
-            
-            if day_key not in day_counts:
-                day_counts[day_key] = 0
-            day_counts[day_key] += 1
+        day_key = (week, day)
+        self.day_counts[day_key] = self.day_counts.get(day_key, 0) + 1
+        mask = self.calendar.add(week, day, period)
         
-        # Check if any day exceeds the maximum
-        for day_key, count in day_counts.items():
-            if count > max_classes_per_day:
-                week, day = day_key.split('_')
-                violations.append({
-                    'type': 'max_classes_per_day_exceeded',
-                    'message': f'{count} classes scheduled on {day} in week {week} (max: {max_classes_per_day})',
-                    'day': day,
-                    'week': week,
-                    'count': count,
-                    'max': max_classes_per_day
-                })
+        # A newly occupied period can only create break violations with its neighbours
+        if self.require_break and not mask & bit:
+            if mask & (bit >> 1):
+                violations.append(no_break_violation(week, day, period - 1))
+            if mask & (bit << 1):
+                violations.append(no_break_violation(week, day, period))
         
+        self.num_violations += len(violations)
         return violations
     
-    def _validate_max_classes_per_week(self):
-        """Validate that the maximum classes per week constraint is met."""
+    def finish(self):
+        """Report the violations that need the complete stream.
+        
+        Returns:
+            List of class count, day/week capacity and consecutive class violations
+        """
         violations = []
-        max_classes_per_week = self.constraints.get('maxClassesPerWeek', 16)
+        max_classes_per_day = self.compiled.max_classes_per_day
+        max_classes_per_week = self.compiled.max_classes_per_week
+        max_consecutive = self.compiled.max_consecutive
         
-        # Group assignments by week
-        week_counts = {}
-        for assignment in self.assignments:
-            week = assignment.get('week', 1)
-            
-            if week not in week_counts:
-                week_counts[week] = 0
-            week_counts[week] += 1
+        for class_id, count in self.class_counts.items():
+            violations.extend(class_count_violations(class_id, count))
         
-        # Check if any week exceeds the maximum
-        for week, count in week_counts.items():
+        for (week, day), count in self.day_counts.items():
+            if count > max_classes_per_day:
+                violations.append(max_classes_per_day_violation(week, day, count, max_classes_per_day))
+        
+        for week, count in self.week_counts.items():
             if count > max_classes_per_week:
-                violations.append({
-                    'type': 'max_classes_per_week_exceeded',
-                    'message': f'{count} classes scheduled in week {week} (max: {max_classes_per_week})',
-                    'week': week,
-                    'count': count,
-                    'max': max_classes_per_week
-                })
+                violations.append(max_classes_per_week_violation(week, count, max_classes_per_week))
+        
+        for week, day, mask in self.calendar.occupied_days():
+            if MAX_RUN[mask] > max_consecutive:
+                violations.extend(consecutive_classes_violations(week, day, mask, max_consecutive))
         
+        self.num_violations += len(violations)
         return violations
     
-    def _validate_consecutive_classes(self):
-        """Validate that the consecutive classes constraint is met."""
-        violations = []
-        max_consecutive = self.constraints.get('maxConsecutiveClasses', 2)
+    def summary(self):
+        """Summarise the validated stream.
         
-        # Group assignments by week and day
-        day_assignments = {}
-        for assignment in self.assignments:
-            day = assignment['day']
-            week = assignment.get('week', 1)
-            period = assignment['period']
-            day_key = f"{week}_{day}"
-            
-            if day_key not in day_assignments:
-                day_assignments[day_key] = []
-            day_assignments[day_key].append(period)
+        Returns:
+            Dictionary with validation totals
+        """
+        return {
+            'valid': self.num_violations == 0,
+            'numViolations': self.num_violations,
+            'numAssignments': self.num_assignments,
+            'numClasses': len(self.classes)
+        }
+
+
+def normalise_slot(compiled, assignment):
+    """Read the slot of an assignment, checked against the calendar.
+    
+    Weeks and periods sent as numeric strings are read as numbers.
+    
+    Args:
+        compiled: CompiledProblem built from the input data
+        assignment: Assignment dictionary
         
-        # Check for consecutive classes
-        for day_key, periods in day_assignments.items():
-            periods.sort()
-            consecutive_count = 1
-            
-            for i in range(1, len(periods)):
-                if periods[i] == periods[i-1] + 1:
-                    consecutive_count += 1
-                    if consecutive_count > max_consecutive:
-                        week, day = day_key.split('_')
-                        violations.append({
-                            'type': 'max_consecutive_classes_exceeded',
-                            'message': f'{consecutive_count} consecutive classes scheduled on {day} in week {week} (max: {max_consecutive})',
-                            'day': day,
-                            'week': week,
-                            'periods': periods[i-consecutive_count+1:i+1],
-                            'max': max_consecutive
-                        })
-                        break
-                else:
-                    consecutive_count = 1
+    Returns:
+        Tuple of (week, day, period), or None when the week is below 1 or
+        not a number, the day is unknown or the period is outside the day
+    """
+    try:
+        week = int(assignment.get('week', 1))
+        period = int(assignment['period'])
+    except (TypeError, ValueError):
+        return None
+    day = assignment['day']
+    if week < 1 or period not in compiled.periods or day not in compiled.day_index:
+        return None
+    return week, day, period
+
+
+def invalid_slot_violation(assignment):
+    """Build the violation for an assignment outside the calendar."""
+    return {
+        'type': 'invalid_slot',
+        'message': f"Class {assignment['classId']} scheduled outside the calendar: "
+                   f"{assignment['day']} period {assignment['period']} in week {assignment.get('week', 1)}",
+        'assignment': assignment
+    }
+
+
+def class_conflict_violation(assignment, week, day, period):
+    """Build the violation for a class scheduled during one of its conflicts."""
+    return {
+        'type': 'class_conflict',
+        'message': f"Class {assignment['classId']} scheduled during conflict period {period} on {day} in week {week}",
+        'assignment': assignment
+    }
+
+
+def teacher_unavailable_violation(assignment, week, day, period):
+    """Build the violation for a class scheduled when the teacher is unavailable."""
+    return {
+        'type': 'teacher_unavailable',
+        'message': f'Class scheduled when teacher is unavailable on {day} period {period} in week {week}',
+        'assignment': assignment
+    }
+
+
+def multiple_classes_violation(first, other, week, day, period):
+    """Build the violation for a second class in an occupied slot."""
+    return {
+        'type': 'multiple_classes_per_slot',
+        'message': f'Multiple classes scheduled on {day} period {period} in week {week}',
+        'assignments': [first, other]
+    }
+
+
+def class_count_violations(class_id, count):
+    """Build the violations for a class not scheduled exactly once."""
+    if count == 0:
+        return [{
+            'type': 'class_not_scheduled',
+            'message': f'Class {class_id} not scheduled',
+            'classId': class_id
+        }]
+    if count > 1:
+        return [{
+            'type': 'class_scheduled_multiple_times',
+            'message': f'Class {class_id} scheduled {count} times',
+            'classId': class_id,
+            'count': count
+        }]
+    return []
+
+
+def max_classes_per_day_violation(week, day, count, max_classes_per_day):
+    """Build the violation for a day over its class limit."""
+    return {
+        'type': 'max_classes_per_day_exceeded',
+        'message': f'{count} classes scheduled on {day} in week {week} (max: {max_classes_per_day})',
+        'day': day,
+        'week': str(week),
+        'count': count,
+        'max': max_classes_per_day
+    }
+
+
+def max_classes_per_week_violation(week, count, max_classes_per_week):
+    """Build the violation for a week over its class limit."""
+    return {
+        'type': 'max_classes_per_week_exceeded',
+        'message': f'{count} classes scheduled in week {week} (max: {max_classes_per_week})',
+        'week': week,
+        'count': count,
+        'max': max_classes_per_week
+    }
+
+
+def consecutive_classes_violations(week, day, mask, max_consecutive):
+    """Build the violations for the runs of a day's period mask longer than allowed."""
+    return [
+        {
+            'type': 'max_consecutive_classes_exceeded',
+            'message': f'{length} consecutive classes scheduled on {day} in week {week} (max: {max_consecutive})',
+            'day': day,
+            'week': str(week),
+            'periods': list(range(start, start + length)),
+            'max': max_consecutive
+        }
+        for start, length in RUNS[mask]
+        if length > max_consecutive
+    ]
+
+
+def no_break_violation(week, day, period):
+    """Build the violation for a class in a period directly followed by another class."""
+    return {
+        'type': 'no_break_after_class',
+        'message': f'No break after class on {day} period {period} in week {week}',
+        'day': day,
+        'week': str(week),
+        'period': period
+    }
+
+
+def check_schedule(compiled, assignments):
+    """Validate a complete schedule against a compiled problem.
+    
+    Shared by ScheduleValidator and ScheduleSolver.validate_solution: a single
+    pass over the assignments with mask lookups, with the violations grouped
+    by rule in the order ScheduleValidator has always reported them.
+    
+    Args:
+        compiled: CompiledProblem built from the input data
+        assignments: Iterable of assignment dictionaries
         
-        return violations
+    Returns:
+        Dictionary with validation results
+    """
+    checker = StreamingScheduleValidator(None, compiled)
+    violations = sorted(checker.validate_stream(assignments), key=lambda violation: RULE_ORDER[violation['type']])
     
-    def _validate_break_after_class(self):
-        """Validate that there is a break after each class if required."""
-        violations = []
+    return {
+        'valid': len(violations) == 0,
+        'violations': violations,
+        'numAssignments': checker.num_assignments,
+        'numClasses': len(compiled.classes)
+    }
+
+
+def iter_json_lines(lines):
+    """Read assignments from JSON lines.
+    
+    Each non-empty line holds either one assignment or a list (chunk) of them.
+    
+    Args:
+        lines: Iterable of text lines
         
-        # Group assignments by week and day
-        day_assignments = {}
-        for assignment in self.assignments:
-            day = assignment['day']
-            week = assignment.get('week', 1)
-            period = assignment['period']
-            day_key = f"{week}_{day}"
-            
-            if day_key not in day_assignments:
-                day_assignments[day_key] = []
-            day_assignments[day_key].append(period)
+    Yields:
+        Assignment dictionaries
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+
+def iter_exported_schedule(lines, classes):
+    """Read assignments from a schedule exported as CSV.
+    
+    The export has a 'Week N' row per week followed by one row per day with
+    the class name in each period column (see test_data/exported-schedule.csv).
+    
+    Args:
+        lines: Iterable of CSV text lines
+        classes: List of class objects used to map class names to IDs
         
-        # Check for classes without breaks
-        for day_key, periods in day_assignments.items():
-            periods.sort()
-            
-            for i in range(len(periods) - 1):
-                if periods[i+1] == periods[i] + 1:
-                    week, day = day_key.split('_')
-                    violations.append({
-                        'type': 'no_break_after_class',
-                        'message': f'No break after class on {day} period {periods[i]} in week {week}',
-                        'day': day,
+    Yields:
+        Assignment dictionaries
+    """
+    class_ids = {class_obj['name']: class_obj['id'] for class_obj in classes}
+    days = {'MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY'}
+    week = 1
+    
+    reader = csv.reader(lines)
+    next(reader, None)  # Skip header row
+    for row in reader:
+        if not row or not row[0]:
+            continue
+        label = row[0].strip()
+        if label.startswith('Week '):
+            week = int(label.split()[1])
+        elif label.upper() in days:
+            for period, class_name in enumerate(row[1:], 1):
+                class_name = class_name.strip()
+                if class_name:
+                    yield {
+                        'classId': class_ids.get(class_name, class_name),
                         'week': week,
-                        'period': periods[i]
-                    })
-        
-        return violations
+                        'day': label.upper(),
+                        'period': period
+                    }
+
+
+def stream_main(csv_path=None):
+    """Validate a stream of assignments and print violations as JSON lines.
+    
+    Without a CSV file, the first stdin line holds the validation input data
+    (without assignments) and the following lines hold the assignments. With a
+    CSV file, stdin holds the validation input data and the assignments are
+    read from the exported schedule. The last output line is the summary.
+    
+    Args:
+        csv_path: Optional path to an exported schedule CSV
+    """
+    if csv_path:
+        input_data = json.loads(sys.stdin.read())
+        csv_file = open(csv_path, newline='')
+        assignments = iter_exported_schedule(csv_file, input_data['classes'])
+    else:
+        input_data = json.loads(sys.stdin.readline())
+        csv_file = None
+        assignments = iter_json_lines(sys.stdin)
+    
+    start_time = time.time()
+    validator = StreamingScheduleValidator(input_data)
+    try:
+        for violation in validator.validate_stream(assignments):
+            print(json.dumps(violation), flush=True)
+    finally:
+        if csv_file:
+            csv_file.close()
+    
+    summary = validator.summary()
+    metrics.record_validation('schedule', time.time() - start_time, summary['valid'])
+    print(json.dumps(summary))
 
 
 def main():
     """Main function to read input and run validator."""
-    # Read input from stdin
-    input_data = json.loads(sys.stdin.read())
+    parser = argparse.ArgumentParser(description='Thunder Scheduler solution validator')
+    parser.add_argument('--format', choices=['json', 'binary'], default='json',
+                        help='Wire format of stdin input (default: json)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Validate assignments streamed as JSON lines')
+    parser.add_argument('--csv', help='Stream assignments from an exported schedule CSV')
+    args = parser.parse_args()
+    metrics.configure('solution_validator')
     
-    # Create validator
-    validator = ScheduleValidator(input_data)
+    if args.stream or args.csv:
+        stream_main(args.csv)
+        return
     
-    # Validate and get result
-    result = validator.validate()
+    # Read input from stdin
+    if args.format == 'binary':
+        # Check the assignment columns as they are decoded, without a list of them
+        from solver.wire_format import iter_assignments, unpack_compiled
+        _, compiled, columns = unpack_compiled(sys.stdin.buffer.read())
+        start_time = time.time()
+        result = check_schedule(compiled, iter_assignments(columns, compiled.class_ids))
+        metrics.record_validation('schedule', time.time() - start_time, result['valid'])
+    else:
+        input_data = json.loads(sys.stdin.read())
+        
+        # Create validator
+        validator = ScheduleValidator(input_data)
+        
+        # Validate and get result
+        result = validator.validate()
     
     # Output result as JSON
     print(json.dumps(result))
@@ -0,0 +1,60 @@
+"""
+Thunder Scheduler Symmetry Reduction
+Groups of interchangeable classes and the expansion of group schedules.
+
+Two classes are interchangeable when they have the same blocked periods on
+every day: any schedule stays valid when they swap slots. The solver can
+then decide which slots a group takes instead of which member takes which
+slot, and hand the slots to the members afterwards.
+"""
+
+
+def class_groups(compiled, singletons=()):
+    """Group classes by their normalised conflict signature.
+
+    Args:
+        compiled: CompiledProblem built from the input data
+        singletons: Class IDs to keep in groups of their own
+
+    Returns:
+        Dictionary mapping the first class ID of every group to the list of
+        member class IDs, both in input order
+    """
+    num_days = len(compiled.days)
+    groups = {}
+    representatives = {}
+
+    for class_index, class_id in enumerate(compiled.class_ids):
+        if class_id in singletons:
+            groups[class_id] = [class_id]
+            continue
+        signature = tuple(compiled.conflict_masks[class_index * num_days:(class_index + 1) * num_days])
+        representative = representatives.setdefault(signature, class_id)
+        groups.setdefault(representative, []).append(class_id)
+
+    return groups
+
+
+def expand_solution(solution, groups, day_index):
+    """Hand the slots taken by each group to its members.
+
+    Args:
+        solution: List of assignments keyed by group representative
+        groups: Dictionary mapping representatives to member class IDs
+        day_index: Dictionary mapping day names to their index in the week
+
+    Returns:
+        List of assignments keyed by member class ID; members take their
+        group's slots in calendar order
+    """
+    group_slots = {}
+    for assignment in solution:
+        group_slots.setdefault(assignment['classId'], []).append(assignment)
+
+    expanded = []
+    for representative, assignments in group_slots.items():
+        assignments.sort(key=lambda a: (a['week'], day_index[a['day']], a['period']))
+        for class_id, assignment in zip(groups[representative], assignments):
+            expanded.append(dict(assignment, classId=class_id))
+
+    return expanded
@@ -0,0 +1,301 @@
+"""
+Thunder Scheduler Binary Wire Format
+Compact columnar encoding for large solver and validator payloads.
+
+A frame is laid out as:
+    - 4-byte magic b'TSB1'
+    - uint32 little-endian length of the JSON header
+    - JSON header (UTF-8) with the small scalar fields and an 'arrays' table
+    - raw little-endian arrays, in the order listed in the header
+
+Assignments travel as four parallel columns (class index, week, day index,
+period) instead of a list of dicts with repeated string keys, and class
+conflicts as one period bitmask per class and day. Frames are decoded with
+numpy.frombuffer, so array columns are views on the input buffer.
+
+unpack_compiled keeps them that way: the conflict masks become the compiled
+problem's masks and the assignments stay columns until they are iterated.
+unpack_input decodes everything back into the JSON form instead.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from solver.compiled_problem import CompiledProblem
+
+MAGIC = b'TSB1'
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+
+# Column types for assignment arrays
+ASSIGNMENT_DTYPES = {
+    'classIndex': '<u4',
+    'week': '<u2',
+    'dayIndex': 'u1',
+    'period': 'u1',
+}
+
+
+def pack_frame(header, arrays):
+    """Pack a JSON header and named arrays into a binary frame.
+
+    Args:
+        header: JSON-serialisable dictionary
+        arrays: Dictionary mapping array names to numpy arrays
+
+    Returns:
+        Frame as bytes
+    """
+    header = dict(header)
+    header['arrays'] = []
+    chunks = []
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+        header['arrays'].append({
+            'name': name,
+            'dtype': values.dtype.str,
+            'length': int(values.size)
+        })
+        chunks.append(values.tobytes())
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    return b''.join([MAGIC, struct.pack('<I', len(header_bytes)), header_bytes] + chunks)
+
+
+def unpack_frame(buffer):
+    """Unpack a binary frame without copying its arrays.
+
+    Args:
+        buffer: bytes, bytearray or memoryview holding the frame
+
+    Returns:
+        Tuple of (header dictionary, dictionary of numpy array views)
+    """
+    buffer = memoryview(buffer)
+    if bytes(buffer[:4]) != MAGIC:
+        raise ValueError('Not a Thunder Scheduler binary frame')
+
+    (header_length,) = struct.unpack_from('<I', buffer, 4)
+    offset = 8 + header_length
+    header = json.loads(bytes(buffer[8:offset]).decode('utf-8'))
+
+    arrays = {}
+    for array in header.pop('arrays'):
+        dtype = np.dtype(array['dtype'])
+        arrays[array['name']] = np.frombuffer(buffer, dtype=dtype, count=array['length'], offset=offset)
+        offset += dtype.itemsize * array['length']
+
+    return header, arrays
+
+
+def is_binary_frame(buffer):
+    """Check whether a buffer starts with the binary frame magic."""
+    return bytes(buffer[:4]) == MAGIC
+
+
+def encode_assignments(assignments, class_index):
+    """Encode assignments as columnar arrays.
+
+    Args:
+        assignments: List of assignment dictionaries
+        class_index: Dictionary mapping class IDs to indices
+
+    Returns:
+        Dictionary of numpy arrays keyed by column name
+
+    Raises:
+        ValueError: If an assignment names a class missing from class_index
+            or an unknown day
+    """
+    count = len(assignments)
+    columns = {name: np.empty(count, dtype=dtype) for name, dtype in ASSIGNMENT_DTYPES.items()}
+    day_index = {day: index for index, day in enumerate(DAYS)}
+
+    for i, assignment in enumerate(assignments):
+        if assignment['classId'] not in class_index:
+            raise ValueError(f'Assignment of unknown class {assignment["classId"]}')
+        if assignment['day'] not in day_index:
+            raise ValueError(f"Assignment of class {assignment['classId']} on unknown day {assignment['day']}")
+        columns['classIndex'][i] = class_index[assignment['classId']]
+        columns['week'][i] = assignment.get('week', 1)
+        columns['dayIndex'][i] = day_index[assignment['day']]
+        columns['period'][i] = assignment['period']
+
+    return columns
+
+
+def iter_assignments(arrays, class_ids, chunk_size=65536):
+    """Decode columnar arrays into assignment dictionaries one at a time.
+
+    Only one chunk of the columns is converted to Python values at once, so
+    a consumer such as StreamingScheduleValidator never holds the whole
+    schedule as dictionaries.
+
+    Args:
+        arrays: Dictionary of numpy arrays keyed by column name
+        class_ids: List of class IDs indexed by class index
+        chunk_size: Number of rows converted at a time
+
+    Yields:
+        Assignment dictionaries
+
+    Raises:
+        ValueError: If the arrays hold no assignment columns, as in solver input
+    """
+    if 'classIndex' not in arrays:
+        raise ValueError('The frame holds no assignments')
+    for start in range(0, len(arrays['classIndex']), chunk_size):
+        rows = slice(start, start + chunk_size)
+        for class_idx, week, day_idx, period in zip(
+            arrays['classIndex'][rows].tolist(),
+            arrays['week'][rows].tolist(),
+            arrays['dayIndex'][rows].tolist(),
+            arrays['period'][rows].tolist()
+        ):
+            yield {
+                'classId': class_ids[class_idx],
+                'week': week,
+                'day': DAYS[day_idx],
+                'period': period
+            }
+
+
+def decode_assignments(arrays, class_ids):
+    """Decode columnar arrays back into assignment dictionaries.
+
+    Args:
+        arrays: Dictionary of numpy arrays keyed by column name
+        class_ids: List of class IDs indexed by class index
+
+    Returns:
+        List of assignment dictionaries
+    """
+    return list(iter_assignments(arrays, class_ids))
+
+
+def pack_input(data):
+    """Pack solver or validator input data into a binary frame.
+
+    Class conflicts become a uint8 period bitmask per class and day, and
+    assignments (validator input) become columnar arrays.
+
+    Args:
+        data: Dictionary with solver or validator input data
+
+    Returns:
+        Frame as bytes
+    """
+    class_ids = [class_obj['id'] for class_obj in data['classes']]
+    class_index = {class_id: index for index, class_id in enumerate(class_ids)}
+
+    conflict_masks = np.zeros((len(class_ids), len(DAYS)), dtype='u1')
+    for class_id, days in data['conflicts'].items():
+        for day, periods in days.items():
+            for period in periods:
+                conflict_masks[class_index[class_id], DAYS.index(day)] |= 1 << (period - 1)
+
+    header = {key: value for key, value in data.items() if key not in ('conflicts', 'assignments')}
+    arrays = {'conflictMasks': conflict_masks.ravel()}
+
+    if 'assignments' in data:
+        arrays.update(encode_assignments(data['assignments'], class_index))
+
+    return pack_frame(header, arrays)
+
+
+def unpack_compiled(buffer):
+    """Unpack a binary input frame without decoding its arrays.
+
+    The conflict masks of the frame become the conflict masks of the
+    compiled problem as they are, and the assignment columns (validator
+    input) stay numpy views for iter_assignments.
+
+    Args:
+        buffer: Buffer holding a frame written by pack_input
+
+    Returns:
+        Tuple of (input data without conflicts and assignments, CompiledProblem,
+        dictionary of assignment columns, empty for solver input)
+
+    Raises:
+        ValueError: If the conflict masks don't match the classes of the frame
+    """
+    header, arrays = unpack_frame(buffer)
+    compiled = CompiledProblem(dict(header, conflicts={}))
+    if arrays['conflictMasks'].size != len(compiled.conflict_masks):
+        raise ValueError('Conflict masks of the frame do not match its classes')
+    # memoryviews index to plain ints, as the arrays of CompiledProblem do
+    compiled.conflict_masks = memoryview(arrays['conflictMasks'])
+    columns = {name: arrays[name] for name in ASSIGNMENT_DTYPES if name in arrays}
+    return header, compiled, columns
+
+
+def unpack_input(buffer):
+    """Unpack a binary input frame into solver or validator input data.
+
+    Args:
+        buffer: Buffer holding a frame written by pack_input
+
+    Returns:
+        Dictionary with solver or validator input data
+    """
+    header, arrays = unpack_frame(buffer)
+    data = dict(header)
+    class_ids = [class_obj['id'] for class_obj in header['classes']]
+
+    conflict_masks = arrays['conflictMasks'].reshape(len(class_ids), len(DAYS))
+    conflicts = {}
+    for class_idx, class_id in enumerate(class_ids):
+        conflicts[class_id] = {}
+        for day_idx, mask in enumerate(conflict_masks[class_idx].tolist()):
+            if mask:
+                conflicts[class_id][DAYS[day_idx]] = [
+                    bit + 1 for bit in range(8) if mask & (1 << bit)
+                ]
+    data['conflicts'] = conflicts
+
+    if 'classIndex' in arrays:
+        data['assignments'] = decode_assignments(arrays, class_ids)
+
+    return data
+
+
+def pack_result(result, class_ids):
+    """Pack a solver result into a binary frame.
+
+    Args:
+        result: Dictionary returned by ScheduleSolver.solve
+        class_ids: List of class IDs indexed by class index
+
+    Returns:
+        Frame as bytes
+    """
+    header = {key: value for key, value in result.items() if key != 'solution'}
+    header['classIds'] = class_ids
+    arrays = {}
+
+    if 'solution' in result:
+        class_index = {class_id: index for index, class_id in enumerate(class_ids)}
+        arrays = encode_assignments(result['solution'], class_index)
+
+    return pack_frame(header, arrays)
+
+
+def unpack_result(buffer):
+    """Unpack a binary solver result frame.
+
+    Args:
+        buffer: Buffer holding a frame written by pack_result
+
+    Returns:
+        Dictionary in the same shape as ScheduleSolver.solve returns
+    """
+    header, arrays = unpack_frame(buffer)
+    result = dict(header)
+    class_ids = result.pop('classIds')
+
+    if 'classIndex' in arrays:
+        result['solution'] = decode_assignments(arrays, class_ids)
+
+    return result
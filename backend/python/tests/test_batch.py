@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Batch Solver
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.batch import BatchSolver, job_workers, MAX_JOB_WORKERS
+from test_solver_pytest import create_test_data, validate_solution
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def test_job_workers_follow_instance_size():
+    """Test that larger instances get more search workers, up to the batch's threads."""
+    small = create_test_data()
+    large = dict(small, classes=small['classes'] * 100, rotationWeeks=10)
+
+    assert job_workers(small, 8) == 1
+    assert job_workers(large, 16) == MAX_JOB_WORKERS
+    assert job_workers(large, 2) == 2
+
+
+def test_batch_solves_every_tenant():
+    """Test that every job is solved and reported with its tenant and timing."""
+    jobs = [
+        {'tenantId': 'school-a', 'data': create_test_data()},
+        {'tenantId': 'school-b', 'data': create_test_data(rotation_weeks=2), 'timeLimit': 5},
+        {'tenantId': 'school-c', 'data': create_test_data()},
+    ]
+    result = BatchSolver(jobs, max_workers=2).solve(time_limit_seconds=10)
+
+    assert result['numJobs'] == result['numSolved'] == 3
+    assert [job['tenantId'] for job in result['results']] == ['school-a', 'school-b', 'school-c']
+    for job, job_result in zip(jobs, result['results']):
+        assert validate_solution(job_result, job['data'])['valid'] is True
+        assert job_result['batch']['numWorkers'] == 1
+        assert job_result['batch']['wallTime'] >= 0
+
+
+def test_batch_keeps_configured_workers():
+    """Test that a job's own numWorkers is kept."""
+    test_data = create_test_data()
+    test_data['solverOptions'] = {'numWorkers': 2}
+    result = BatchSolver([{'tenantId': 'school-a', 'data': test_data}]).solve()
+
+    assert result['results'][0]['batch']['numWorkers'] == 2
+    assert result['results'][0]['status'] == 'success'
+
+
+def test_batch_reports_failing_job():
+    """Test that a broken job fails alone."""
+    jobs = [
+        {'tenantId': 'broken', 'data': {'classes': [{'id': 'class1'}], 'rotationWeeks': 0}},
+        {'tenantId': 'school-a', 'data': create_test_data()},
+    ]
+    results = {result['tenantId']: result for result in BatchSolver(jobs).results()}
+
+    assert results['broken']['status'] == 'error'
+    assert isinstance(results['broken']['statusCode'], int)
+    assert results['school-a']['status'] == 'success'
+
+
+def test_batch_records_failing_job_metrics():
+    """Test that a job failing before its solve is counted as an error."""
+    series = 'thunder_solver_solves_total{entry_point="library",status="error"}'
+    before = metrics.parse_exposition(metrics.REGISTRY.render()).get(series, 0)
+
+    results = list(BatchSolver([{'tenantId': 'empty', 'data': {}}]).results())
+
+    assert results[0]['status'] == 'error'
+    assert metrics.parse_exposition(metrics.REGISTRY.render())[series] == before + 1
+
+
+def test_batch_cli_streams_results():
+    """Test that the batch script writes one JSON line per job."""
+    jobs = [{'tenantId': f'school-{index}', 'data': create_test_data()} for index in range(3)]
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'batch.py')],
+        input=json.dumps({'jobs': jobs, 'maxWorkers': 2, 'timeLimit': 10}),
+        capture_output=True, text=True, check=True
+    )
+    results = [json.loads(line) for line in completed.stdout.splitlines()]
+
+    assert sorted(result['tenantId'] for result in results) == ['school-0', 'school-1', 'school-2']
+    assert all(result['status'] == 'success' for result in results)
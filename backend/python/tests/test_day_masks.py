@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler day mask calendar
+"""
+
+import sys
+import os
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.day_masks import DayMaskCalendar, RUNS, MAX_RUN, BREAK_PERIODS, build_run_tables
+
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+
+
+def periods_of(mask):
+    """List the occupied periods of a mask."""
+    return [period for period in range(1, 9) if mask & (1 << (period - 1))]
+
+
+def test_tables_cover_every_mask():
+    """Test the lookup tables against a direct scan of the periods."""
+    assert len(RUNS) == len(MAX_RUN) == len(BREAK_PERIODS) == 256
+
+    for mask in range(256):
+        periods = periods_of(mask)
+        assert sum(length for _, length in RUNS[mask]) == len(periods)
+        for start, length in RUNS[mask]:
+            assert all(period in periods for period in range(start, start + length))
+            assert start - 1 not in periods and start + length not in periods
+        assert MAX_RUN[mask] == max((length for _, length in RUNS[mask]), default=0)
+        assert list(BREAK_PERIODS[mask]) == [p for p in periods if p + 1 in periods]
+
+
+def test_tables_for_other_period_counts():
+    """Test that tables can be built for days with a different number of periods."""
+    runs, max_run, break_periods = build_run_tables(10)
+
+    assert len(runs) == 1024
+    assert runs[0b1110000111] == ((1, 3), (8, 3))
+    assert max_run[0b1111111111] == 10
+    assert break_periods[0b1100000000] == (9,)
+
+
+def test_calendar_grows_with_weeks():
+    """Test adding and removing periods across weeks."""
+    calendar = DayMaskCalendar(DAYS)
+
+    assert calendar.add(3, 'FRIDAY', 2) == 0
+    assert calendar.add(3, 'FRIDAY', 3) == 0b10
+    calendar.add(1, 'MONDAY', 8)
+    calendar.remove(3, 'FRIDAY', 2)
+
+    assert calendar.num_weeks == 3
+    assert list(calendar.occupied_days()) == [(1, 'MONDAY', 0b10000000), (3, 'FRIDAY', 0b100)]
+    assert calendar.mask(5, 'MONDAY') == 0
+
+
+@pytest.mark.parametrize("week, period", [(0, 4), (-1, 4), (1, 0), (1, 9)])
+def test_calendar_rejects_slots_outside_it(week, period):
+    """Test that a slot outside the calendar raises instead of writing into another day."""
+    calendar = DayMaskCalendar(DAYS, rotation_weeks=2)
+
+    with pytest.raises(ValueError):
+        calendar.add(week, 'MONDAY', period)
+    assert list(calendar.occupied_days()) == []
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Incremental Validator
+"""
+
+import sys
+import os
+import json
+import random
+import subprocess
+from collections import Counter
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.incremental_validator import IncrementalScheduleValidator
+from solver.solution_validator import StreamingScheduleValidator
+from test_solver_pytest import create_test_data
+from test_solution_validator import random_assignments, DAYS
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def as_multiset(violations):
+    """Turn a list of violations into a comparable multiset."""
+    return Counter(json.dumps(violation, sort_keys=True) for violation in violations)
+
+
+def random_delta(rng, schedule, test_data):
+    """Create a random add, remove or move delta for the current schedule."""
+    slot = {
+        'week': rng.randint(1, test_data['rotationWeeks']),
+        'day': rng.choice(DAYS),
+        'period': rng.randint(1, 8)
+    }
+    op = rng.choice(['add', 'remove', 'move']) if schedule else 'add'
+    if op == 'add':
+        class_id = rng.choice([class_obj['id'] for class_obj in test_data['classes']])
+        return {'op': 'add', 'assignment': dict(slot, classId=class_id)}
+    assignment = rng.choice(schedule)
+    if op == 'remove':
+        return {'op': 'remove', 'assignment': assignment}
+    return {'op': 'move', 'assignment': assignment, 'to': slot}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_deltas_track_full_validation(seed):
+    """Test that applying deltas keeps the same violations as validating from scratch."""
+    rng = random.Random(seed)
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['assignments'] = random_assignments(test_data, 10, seed)
+    schedule = list(test_data['assignments'])
+
+    validator = IncrementalScheduleValidator(test_data)
+    current = as_multiset(validator.validate()['violations'])
+
+    for _ in range(60):
+        delta = random_delta(rng, schedule, test_data)
+        result = validator.apply(delta)
+
+        if delta['op'] in ('remove', 'move'):
+            schedule.remove(delta['assignment'])
+        if delta['op'] == 'add':
+            schedule.append(delta['assignment'])
+        if delta['op'] == 'move':
+            schedule.append(dict(delta['assignment'], **delta['to']))
+
+        current = current - as_multiset(result['removed']) + as_multiset(result['added'])
+        streaming = StreamingScheduleValidator(test_data)
+        expected = as_multiset(streaming.validate_stream(schedule))
+
+        assert current == expected
+        assert result['numViolations'] == sum(expected.values())
+        assert result['valid'] == (not expected)
+
+
+def test_move_reports_only_changes():
+    """Test that a move reports the violations it fixed and introduced."""
+    test_data = create_test_data()
+    test_data['assignments'] = [
+        {'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 3},
+        {'classId': 'class2', 'week': 1, 'day': 'TUESDAY', 'period': 4},
+        {'classId': 'class3', 'week': 1, 'day': 'WEDNESDAY', 'period': 5},
+        {'classId': 'class4', 'week': 1, 'day': 'THURSDAY', 'period': 1},
+    ]
+    validator = IncrementalScheduleValidator(test_data)
+    assert [v['type'] for v in validator.validate()['violations']] == ['no_break_after_class']
+
+    result = validator.apply({
+        'op': 'move',
+        'assignment': test_data['assignments'][1],
+        'to': {'day': 'THURSDAY', 'period': 4}
+    })
+
+    assert [v['type'] for v in result['removed']] == ['no_break_after_class']
+    assert [v['type'] for v in result['added']] == ['class_conflict']
+    assert result['valid'] is False
+
+
+def test_remove_unknown_assignment():
+    """Test that removing an assignment that isn't scheduled is an error."""
+    test_data = create_test_data()
+    test_data['assignments'] = []
+    validator = IncrementalScheduleValidator(test_data)
+
+    with pytest.raises(ValueError):
+        validator.apply({'op': 'remove', 'assignment': {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 2}})
+
+
+def test_move_outside_the_calendar_leaves_the_schedule_unchanged():
+    """Test that a rejected move doesn't change the loaded schedule."""
+    test_data = create_test_data()
+    test_data['assignments'] = random_assignments(test_data, 4, 0)
+    validator = IncrementalScheduleValidator(test_data)
+    before = validator.validate()
+
+    for to in ({'period': 9}, {'week': 0}, {'day': 'SATURDAY'}):
+        with pytest.raises(ValueError, match='outside the calendar'):
+            validator.apply({'op': 'move', 'assignment': test_data['assignments'][0], 'to': to})
+
+    assert validator.validate() == before
+
+
+def test_loaded_assignments_outside_the_calendar_are_violations():
+    """Test that a loaded schedule reports slots outside the calendar as the full validation does."""
+    test_data = create_test_data(rotation_weeks=2)
+    assignments = random_assignments(test_data, 4, 1)
+    outside = dict(assignments[0], week=0)
+    test_data['assignments'] = [outside, dict(assignments[1], week=str(assignments[1].get('week', 1)))] + assignments[2:]
+
+    validator = IncrementalScheduleValidator(test_data)
+    result = validator.validate()
+    expected = StreamingScheduleValidator(test_data).validate_stream(test_data['assignments'])
+
+    assert as_multiset(result['violations']) == as_multiset(expected)
+    assert result['numAssignments'] == len(test_data['assignments'])
+
+    removed = validator.apply({'op': 'remove', 'assignment': outside})['removed']
+    assert 'invalid_slot' in [violation['type'] for violation in removed]
+
+
+def test_session_cli():
+    """Test the incremental validator script session."""
+    test_data = create_test_data()
+    test_data['assignments'] = [{'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 3}]
+    deltas = [
+        {'op': 'add', 'assignment': {'classId': 'class2', 'week': 1, 'day': 'TUESDAY', 'period': 4}},
+        {'op': 'remove', 'assignment': {'classId': 'class9', 'week': 1, 'day': 'TUESDAY', 'period': 4}},
+    ]
+    stdin = '\n'.join(json.dumps(item) for item in [test_data] + deltas)
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'incremental_validator.py')],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    initial, added, error = [json.loads(line) for line in completed.stdout.splitlines()]
+
+    assert initial['numAssignments'] == 1
+    assert [v['type'] for v in added['added']] == ['no_break_after_class']
+    assert 'error' in error
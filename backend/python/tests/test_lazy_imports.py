@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for lazy OR-Tools loading in the Thunder Scheduler solver modules
+"""
+
+import sys
+import os
+import subprocess
+import pytest
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import sys
+sys.path.insert(0, {path!r})
+{code}
+print(sorted({{name.split('.')[0] for name in sys.modules}} & {{'ortools', 'numpy'}}))
+'''
+
+
+def loaded_heavy_modules(code):
+    """Run code in a fresh interpreter and list which of OR-Tools and numpy it loaded."""
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE.format(path=PYTHON_DIR, code=code)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return completed.stdout.strip()
+
+
+@pytest.mark.parametrize("module", [
+    'constraint_solver',
+    'solution_validator',
+    'incremental_validator',
+    'slot_query',
+    'portfolio',
+    'schedule_diff',
+    'parameter_sweep',
+    'solution_pool',
+    'lns',
+    'repair',
+    'batch',
+])
+def test_import_does_not_load_ortools(module):
+    """Test that importing an entry point loads neither OR-Tools nor numpy."""
+    assert loaded_heavy_modules(f'import solver.{module}') == '[]'
+
+
+def test_validation_does_not_load_ortools():
+    """Test that constructing a solver and validating a schedule don't load OR-Tools."""
+    code = '''
+from solver.constraint_solver import ScheduleSolver
+from solver.solution_validator import ScheduleValidator
+data = {
+    'classes': [{'id': 'class1', 'name': 'Class 1A', 'gradeLevel': 1}],
+    'conflicts': {'class1': {'MONDAY': [1, 2]}},
+    'teacherAvailability': {'FRIDAY': [8]},
+    'constraints': {'maxClassesPerDay': 3, 'requireBreakAfterClass': True},
+    'assignments': [{'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 3}]
+}
+ScheduleSolver(data)
+assert ScheduleValidator(data).validate()['valid']
+'''
+
+    assert loaded_heavy_modules(code) == '[]'
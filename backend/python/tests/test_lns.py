@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Large Neighbourhood Search
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.lns import LargeNeighbourhoodSearch
+from solver.solution_pool import SolutionPool
+from test_solver_pytest import create_test_data, validate_solution
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def create_lns_data():
+    """Create test data with two valid schedules that place every class differently."""
+    test_data = create_test_data({'maxClassesPerDay': 4, 'maxClassesPerWeek': 16}, rotation_weeks=3)
+    test_data['classes'] = [
+        {'id': f'class{i}', 'name': f'Class {i}', 'gradeLevel': i % 3} for i in range(1, 13)
+    ]
+    pool = SolutionPool(test_data, 2, min_distance=12).solve()
+    reference, initial = [entry['solution'] for entry in pool['solutions']]
+    test_data['solverOptions'] = {'referenceSchedule': reference}
+    return test_data, initial
+
+
+def slot_of(assignment):
+    """Get the slot fields of an assignment."""
+    return {key: assignment[key] for key in ('week', 'day', 'period')}
+
+
+@pytest.mark.parametrize("neighbourhood", ['day', 'week', 'grade', 'random'])
+def test_lns_improves_towards_the_reference(neighbourhood):
+    """Test that each neighbourhood kind lowers the objective with valid schedules."""
+    test_data, initial = create_lns_data()
+    search = LargeNeighbourhoodSearch(test_data, [neighbourhood], neighbourhood_size=4)
+    result = search.improve(initial, time_limit_seconds=3, iteration_time_limit=0.5)
+
+    assert result['initialObjective'] == 12
+    assert result['objective'] < result['initialObjective']
+    assert result['objective'] == search.objective(result['solution'])
+    assert validate_solution(result, test_data)['valid'] is True
+    objectives = [entry['objective'] for entry in result['trajectory']]
+    assert objectives == sorted(objectives, reverse=True)
+    assert len(objectives) == result['numImprovements'] + 1
+
+
+def test_lns_reaches_a_valid_reference():
+    """Test that the search ends once no class is away from its reference slot."""
+    test_data, initial = create_lns_data()
+    result = LargeNeighbourhoodSearch(test_data).improve(initial, time_limit_seconds=10)
+
+    assert result['objective'] == 0
+    assert result['totalTime'] < 10
+
+
+def test_lns_starts_from_a_full_solve():
+    """Test that the search solves an initial schedule when none is given."""
+    test_data, _ = create_lns_data()
+    result = LargeNeighbourhoodSearch(test_data).improve(time_limit_seconds=2)
+
+    assert result['status'] == 'success'
+    assert validate_solution(result, test_data)['valid'] is True
+
+
+def test_lns_rejects_missing_objective_and_invalid_start():
+    """Test that the search needs a reference schedule and a valid start."""
+    test_data, initial = create_lns_data()
+    with pytest.raises(ValueError):
+        LargeNeighbourhoodSearch(dict(test_data, solverOptions={}))
+
+    clash = [dict(assignment, **slot_of(initial[0])) for assignment in initial]
+    with pytest.raises(ValueError):
+        LargeNeighbourhoodSearch(test_data).improve(clash)
+
+
+def test_lns_cli():
+    """Test the large neighbourhood search script."""
+    test_data, initial = create_lns_data()
+    test_data.update(initialSchedule=initial, lnsTimeLimit=2)
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'lns.py')],
+        input=json.dumps(test_data),
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout)
+    assert result['objective'] < result['initialObjective']
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for locked assignments in the Thunder Scheduler Constraint Solver
+"""
+
+import sys
+import os
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE
+from test_solver_pytest import create_test_data, validate_solution
+
+
+def solve(test_data, locked, options=None):
+    """Solve the test data with locked assignments."""
+    test_data = dict(test_data, lockedAssignments=locked, solverOptions=options or {})
+    solver = ScheduleSolver(test_data)
+    return solver, solver.solve()
+
+
+def test_completion_keeps_locked_classes():
+    """Test that only the unlocked classes are scheduled around the locked ones."""
+    test_data = create_test_data(rotation_weeks=2)
+    schedule = ScheduleSolver(test_data).solve()['solution']
+    locked = [assignment for assignment in schedule if assignment['classId'] != 'class3']
+
+    solver, result = solve(test_data, locked)
+
+    assert result['status'] == 'success'
+    assert validate_solution(result, test_data)['valid'] is True
+    for assignment in locked:
+        assert assignment in result['solution']
+    assert set(solver.groups) == {'class3'}
+    assert result['presolve']['numLocked'] == 3
+
+
+def test_every_class_locked():
+    """Test that a schedule with every class locked comes back as it is."""
+    test_data = create_test_data(rotation_weeks=2)
+    schedule = ScheduleSolver(test_data).solve()['solution']
+
+    solver, result = solve(test_data, schedule)
+
+    assert result['status'] == 'success'
+    assert sorted(result['solution'], key=str) == sorted(schedule, key=str)
+    assert solver.groups == {}
+
+
+def test_locked_classes_use_up_capacity():
+    """Test that a day filled by a locked class is not used by the others."""
+    test_data = create_test_data({'maxClassesPerDay': 1})
+    locked = [{'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 4}]
+    _, result = solve(test_data, locked)
+
+    assert result['status'] == 'success'
+    assert [a['classId'] for a in result['solution'] if a['day'] == 'TUESDAY'] == ['class1']
+
+
+@pytest.mark.parametrize("locked", [
+    # class1 conflicts with Monday period 2
+    [{'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 2}],
+    # Back to back despite the required break
+    [{'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 4},
+     {'classId': 'class2', 'week': 1, 'day': 'TUESDAY', 'period': 5}],
+])
+def test_locks_breaking_constraints_are_infeasible(locked):
+    """Test that locks breaking the rules are reported before building a model."""
+    solver, result = solve(create_test_data(), locked)
+
+    assert result['status'] == 'infeasible'
+    assert result['statusCode'] == INFEASIBLE
+    assert result['message'].startswith(f"Locked assignment of class {locked[-1]['classId']}")
+    assert solver.model is None
+
+
+@pytest.mark.parametrize("assignment", [
+    {'classId': 'class9', 'week': 1, 'day': 'TUESDAY', 'period': 4},
+    {'classId': 'class1', 'week': 2, 'day': 'TUESDAY', 'period': 4},
+    {'classId': 'class1', 'week': 1, 'day': 'SATURDAY', 'period': 4},
+    {'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 9},
+])
+def test_malformed_locks_are_rejected(assignment):
+    """Test that locks of unknown classes or outside the calendar raise."""
+    with pytest.raises(ValueError):
+        solve(create_test_data(), [assignment])
+
+
+def test_locked_representative_keeps_its_group_solvable():
+    """Test that locking one of several interchangeable classes leaves the others to the model."""
+    test_data = create_test_data({'maxClassesPerDay': 6, 'maxClassesPerWeek': 30})
+    test_data['classes'].append({'id': 'class1b', 'name': 'Class 1C', 'gradeLevel': 1})
+    test_data['conflicts']['class1b'] = test_data['conflicts']['class1']
+    locked = [{'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 4}]
+
+    solver, result = solve(test_data, locked, {'symmetryReduction': True})
+
+    assert result['status'] == 'success'
+    assert 'class1b' in solver.groups
+    assert validate_solution(result, test_data)['valid'] is True
+
+
+def test_estimate_counts_only_unlocked_classes():
+    """Test that the model size estimate shrinks with the locked classes."""
+    test_data = create_test_data(rotation_weeks=2)
+    full = ScheduleSolver(test_data).estimate_model_size()
+    locked = [{'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 4}]
+    estimate = ScheduleSolver(dict(test_data, lockedAssignments=locked)).estimate_model_size()
+
+    assert estimate['numVariables'] == full['numVariables'] * 3 // 4
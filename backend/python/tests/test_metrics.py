@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Metrics
+"""
+
+import sys
+import os
+import json
+import subprocess
+import urllib.request
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver import metrics
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE, UNKNOWN
+from solver.solution_validator import ScheduleValidator
+from test_solver_pytest import create_test_data
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def make_registry():
+    """Create a registry with one counter and one histogram."""
+    registry = metrics.Registry()
+    counter = registry.counter('jobs_total', 'Jobs', ('entry_point', 'status'))
+    histogram = registry.histogram('job_seconds', 'Job time', ('entry_point',), (0.1, 1))
+    return registry, counter, histogram
+
+
+def test_render_exposition_format():
+    """Test the text exposition of counters and cumulative histogram buckets."""
+    registry, counter, histogram = make_registry()
+    counter.inc(('batch', 'optimal'), 2)
+    for value in (0.05, 0.5, 0.5, 3):
+        histogram.observe(('batch',), value)
+
+    assert registry.render().splitlines() == [
+        '# HELP jobs_total Jobs',
+        '# TYPE jobs_total counter',
+        'jobs_total{entry_point="batch",status="optimal"} 2',
+        '# HELP job_seconds Job time',
+        '# TYPE job_seconds histogram',
+        'job_seconds_bucket{entry_point="batch",le="0.1"} 1',
+        'job_seconds_bucket{entry_point="batch",le="1"} 3',
+        'job_seconds_bucket{entry_point="batch",le="+Inf"} 4',
+        'job_seconds_sum{entry_point="batch"} 4.05',
+        'job_seconds_count{entry_point="batch"} 4',
+    ]
+
+
+def test_dump_merges_with_earlier_processes(tmp_path):
+    """Test that dumping adds to the counts already in the file."""
+    path = str(tmp_path / 'solver.prom')
+    first, counter, histogram = make_registry()
+    counter.inc(('constraint_solver', 'optimal'))
+    histogram.observe(('constraint_solver',), 0.5)
+    first.dump(path)
+
+    second, counter, histogram = make_registry()
+    counter.inc(('constraint_solver', 'optimal'))
+    counter.inc(('constraint_solver', 'timeout'))
+    second.dump(path)
+
+    with open(path) as metrics_file:
+        samples = metrics.parse_exposition(metrics_file.read())
+    assert samples['jobs_total{entry_point="constraint_solver",status="optimal"}'] == 2
+    assert samples['jobs_total{entry_point="constraint_solver",status="timeout"}'] == 1
+    assert samples['job_seconds_count{entry_point="constraint_solver"}'] == 1
+
+
+def test_solve_status_labels():
+    """Test the status label of solver results."""
+    assert metrics.solve_status({'status': 'success', 'statusString': 'feasible'}) == 'feasible'
+    assert metrics.solve_status({'status': 'infeasible', 'statusCode': INFEASIBLE}) == 'infeasible'
+    assert metrics.solve_status({'status': 'infeasible', 'statusCode': UNKNOWN}) == 'timeout'
+    assert metrics.solve_status({'status': 'error', 'message': 'too big'}) == 'error'
+
+
+def test_solver_and_validator_record_metrics():
+    """Test that solves and validations land in the process registry."""
+    before = metrics.parse_exposition(metrics.REGISTRY.render())
+    test_data = create_test_data()
+    result = ScheduleSolver(dict(test_data, solverOptions={'verifySolution': True})).solve()
+    ScheduleValidator(dict(test_data, assignments=result['solution'])).validate()
+    after = metrics.parse_exposition(metrics.REGISTRY.render())
+
+    def delta(series):
+        return after.get(series, 0) - before.get(series, 0)
+
+    assert delta('thunder_solver_solves_total{entry_point="library",status="optimal"}') == 1
+    assert delta('thunder_solver_build_seconds_count{entry_point="library"}') == 1
+    assert delta('thunder_solver_model_variables_count{entry_point="library"}') == 1
+    # The solver's own check of its solution is not a validation
+    assert delta('thunder_validator_validations_total{entry_point="library",valid="true"}') == 1
+
+
+def test_serve_metrics_over_http():
+    """Test the /metrics endpoint."""
+    registry, counter, _ = make_registry()
+    counter.inc(('batch', 'optimal'))
+    server = registry.serve(0, '127.0.0.1')
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'jobs_total{entry_point="batch",status="optimal"} 1' in body
+
+
+def test_solver_cli_dumps_metrics_file(tmp_path):
+    """Test that solver processes accumulate their metrics in THUNDER_METRICS_FILE."""
+    path = str(tmp_path / 'solver.prom')
+    env = dict(os.environ, THUNDER_METRICS_FILE=path)
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, os.path.join(SOLVER_DIR, 'constraint_solver.py')],
+            input=json.dumps(create_test_data()),
+            capture_output=True, text=True, check=True, env=env
+        )
+
+    with open(path) as metrics_file:
+        samples = metrics.parse_exposition(metrics_file.read())
+    assert samples['thunder_solver_solves_total{entry_point="constraint_solver",status="optimal"}'] == 2
+
+
+def test_incremental_validator_metrics_query():
+    """Test the metrics query of an incremental validation session."""
+    test_data = create_test_data()
+    test_data['assignments'] = [{'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 1}]
+    lines = [
+        json.dumps(test_data),
+        json.dumps({'op': 'remove', 'assignment': test_data['assignments'][0]}),
+        json.dumps({'op': 'metrics'}),
+    ]
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'incremental_validator.py')],
+        input='\n'.join(lines), capture_output=True, text=True, check=True
+    )
+    exposition = json.loads(completed.stdout.splitlines()[-1])['metrics']
+    samples = metrics.parse_exposition(exposition)
+
+    assert samples['thunder_validator_seconds_count{entry_point="incremental_validator",kind="delta"}'] == 1
+    assert samples['thunder_validator_validations_total{entry_point="incremental_validator",valid="false"}'] == 1
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Parameter Sweep
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.parameter_sweep import ParameterSweep
+from test_solver_pytest import create_test_data
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+GRID = {
+    'maxClassesPerDay': [1, 2, 3],
+    'maxClassesPerWeek': [4, 8],
+    'maxConsecutiveClasses': [1, 2],
+}
+
+
+def sweep_test_data():
+    """Create test data with enough classes that tight settings become infeasible."""
+    test_data = create_test_data(constraints={'requireBreakAfterClass': False})
+    test_data['classes'] = [
+        {'id': f'class{i}', 'name': f'Class {i}', 'gradeLevel': 1} for i in range(1, 8)
+    ]
+    return test_data
+
+
+def test_sweep_matches_independent_solves():
+    """Test that every setting gets the same answer as a separate solver run."""
+    test_data = sweep_test_data()
+    result = ParameterSweep(test_data, GRID).solve()
+
+    assert result['numSettings'] == 12
+    assert result['numSolves'] < result['numSettings']
+
+    for row in result['settings']:
+        setting_data = dict(test_data, constraints={**test_data['constraints'], **row['constraints']})
+        expected = ScheduleSolver(setting_data).solve()
+        assert (row['status'] == 'feasible') == (expected['status'] == 'success'), row['constraints']
+
+        if row['status'] == 'feasible':
+            assert row['maxDayLoad'] <= row['constraints']['maxClassesPerDay']
+            assert row['maxWeekLoad'] <= row['constraints']['maxClassesPerWeek']
+            assert row['maxRun'] <= row['constraints']['maxConsecutiveClasses']
+
+
+def test_sweep_keeps_unswept_limits():
+    """Test that limits missing from the grid keep their input value."""
+    test_data = sweep_test_data()
+    result = ParameterSweep(test_data, {'maxClassesPerDay': [2, 3]}).solve()
+
+    assert [row['constraints'] for row in result['settings']] == [
+        {'maxClassesPerDay': 3, 'maxClassesPerWeek': 12, 'maxConsecutiveClasses': 2},
+        {'maxClassesPerDay': 2, 'maxClassesPerWeek': 12, 'maxConsecutiveClasses': 2},
+    ]
+
+
+def test_sweep_rejects_unknown_limits():
+    """Test that only the supported limits can be swept."""
+    with pytest.raises(ValueError):
+        ParameterSweep(sweep_test_data(), {'requireBreakAfterClass': [True, False]})
+
+
+def test_sweep_cli():
+    """Test the parameter sweep script."""
+    test_data = sweep_test_data()
+    test_data['sweep'] = {'maxClassesPerDay': [1, 2]}
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'parameter_sweep.py')],
+        input=json.dumps(test_data),
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout)
+    assert [row['status'] for row in result['settings']] == ['feasible', 'infeasible']
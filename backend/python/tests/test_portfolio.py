@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Portfolio Solver
+"""
+
+import sys
+import os
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.portfolio import PortfolioSolver, DEFAULT_CONFIGURATIONS
+from test_solver_pytest import create_test_data, validate_solution
+
+
+def test_portfolio_finds_valid_solution():
+    """Test that the portfolio returns a valid solution and records the winner."""
+    test_data = create_test_data()
+
+    result = PortfolioSolver(test_data).solve(time_limit_seconds=10)
+
+    assert result['status'] == 'success'
+    assert len(result['solution']) == len(test_data['classes'])
+
+    portfolio = result['portfolio']
+    assert portfolio['numConfigurations'] == len(DEFAULT_CONFIGURATIONS)
+    assert portfolio['configuration'] == DEFAULT_CONFIGURATIONS[portfolio['winner']]
+    assert any(run['index'] == portfolio['winner'] for run in portfolio['runs'])
+
+    validation_result = validate_solution(result, test_data)
+    assert validation_result['valid'] is True
+
+
+def test_portfolio_stops_on_infeasibility_proof():
+    """Test that a proof of infeasibility from one configuration ends the race."""
+    # Four classes can't fit in a week that allows only two
+    test_data = create_test_data(constraints={'maxClassesPerWeek': 2})
+
+    result = PortfolioSolver(test_data).solve(time_limit_seconds=10)
+
+    assert result['status'] == 'infeasible'
+    assert result['portfolio']['winner'] is not None
+
+
+@pytest.mark.parametrize("configuration", DEFAULT_CONFIGURATIONS)
+def test_single_configuration(configuration):
+    """Test that every default configuration solves the problem on its own."""
+    test_data = create_test_data(rotation_weeks=2)
+
+    result = PortfolioSolver(test_data, [configuration]).solve(time_limit_seconds=10)
+
+    assert result['status'] == 'success'
+    assert result['portfolio']['winner'] == 0
+
+    validation_result = validate_solution(result, test_data)
+    assert validation_result['valid'] is True
+
+
+def test_best_result_prefers_optimal_then_stability():
+    """Test that the fallback winner is the best success rather than the first."""
+    portfolio = PortfolioSolver(create_test_data())
+    feasible = {'status': 'success', 'statusString': 'feasible', 'solveTime': 1}
+    finished = {
+        0: {'status': 'infeasible', 'statusCode': 0, 'solveTime': 1},
+        1: dict(feasible, diff={'stability': 0.5}),
+        2: dict(feasible, diff={'stability': 0.75}),
+    }
+
+    assert portfolio._select_best(finished) == 2
+    assert portfolio._select_best({**finished, 3: dict(feasible, statusString='optimal')}) == 3
+    assert portfolio._select_best({0: finished[0]}) == 0
+    assert portfolio._select_best({}) is None
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Presolve
+"""
+
+import sys
+import os
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.compiled_problem import CompiledProblem
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE
+from solver.parameter_sweep import ParameterSweep
+from solver.presolve import presolve
+from solver.saved_model import FIXED_FILE, solve_saved_model
+from test_solver_pytest import create_test_data, validate_solution
+
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+
+
+def only_slot(day, period):
+    """Conflicts leaving a class a single period in the week."""
+    return {
+        conflict_day: [p for p in range(1, 9) if conflict_day != day or p != period]
+        for conflict_day in DAYS
+    }
+
+
+def create_pinned_data(constraints=None):
+    """Create test data with a class that can only take Tuesday period 4."""
+    test_data = create_test_data(constraints)
+    test_data['classes'].append({'id': 'class5', 'name': 'Class 3A', 'gradeLevel': 3})
+    test_data['conflicts']['class5'] = only_slot('TUESDAY', 4)
+    return test_data
+
+
+def test_forced_class_is_fixed_and_its_neighbours_closed():
+    """Test that a single-slot class is fixed and the break closes its neighbours."""
+    result = presolve(CompiledProblem(create_pinned_data()))
+
+    assert result.infeasible_class is None
+    assert result.fixed == {'class5': (1, 'TUESDAY', 4)}
+    for class_id in ['class1', 'class2', 'class4']:
+        assert not any(result.allows(class_id, 1, 'TUESDAY', period) for period in (3, 4, 5))
+    # Teacher-unavailable slots are closed for every class
+    assert not any(result.allows(f'class{i}', 1, 'MONDAY', 1) for i in range(1, 5))
+    assert result.stats['numFixed'] == 1
+    assert result.stats['numSlots'] == (result.stats['numBlocked'] + result.stats['numPropagated']
+                                        + result.stats['numOpen'] + result.stats['numFixed'])
+
+
+def test_propagation_reaches_a_fixpoint():
+    """Test that a fixed class can force another one through its break."""
+    test_data = create_pinned_data()
+    # class4 is left Tuesday periods 3 and 6; the break after class5 takes period 3
+    test_data['conflicts']['class4'] = {
+        day: [p for p in range(1, 9) if day != 'TUESDAY' or p not in (3, 6)] for day in DAYS
+    }
+    result = presolve(CompiledProblem(test_data))
+
+    assert result.fixed == {'class5': (1, 'TUESDAY', 4), 'class4': (1, 'TUESDAY', 6)}
+    assert result.stats['rounds'] >= 2
+    assert [a['classId'] for a in result.fixed_assignments()] == ['class4', 'class5']
+
+
+def test_fixed_classes_use_up_day_capacity():
+    """Test that a day filled by fixed classes is closed for the others."""
+    test_data = create_pinned_data({'maxClassesPerDay': 1})
+    result = presolve(CompiledProblem(test_data))
+
+    assert not any(result.allows('class1', 1, 'TUESDAY', period) for period in range(1, 9))
+    assert result.allows('class1', 1, 'WEDNESDAY', 1)
+
+
+def test_restrict_narrows_a_domain():
+    """Test that a domain can be narrowed to given slots."""
+    result = presolve(CompiledProblem(create_test_data(rotation_weeks=2)))
+    result.restrict('class1', [(2, 'MONDAY', 5), (1, 'MONDAY', 2)])
+
+    # Monday period 2 is a conflict of class1, so only one slot is left
+    assert result.allows('class1', 2, 'MONDAY', 5)
+    assert not result.allows('class1', 1, 'MONDAY', 2)
+    assert not result.allows('class1', 1, 'MONDAY', 5)
+    assert result.allows('class2', 1, 'MONDAY', 2)
+
+
+def test_restrict_drops_slots_outside_the_calendar():
+    """Test that slots beyond the rotation, in week 0 or on unknown days or periods are dropped."""
+    result = presolve(CompiledProblem(create_test_data(rotation_weeks=2)))
+    outside = [(0, 'MONDAY', 5), (3, 'MONDAY', 5), (1, 'SATURDAY', 5), (1, 'MONDAY', 9)]
+    result.restrict('class1', outside + [(2, 'MONDAY', 5)])
+
+    assert result.allows('class1', 2, 'MONDAY', 5)
+    assert [
+        (week, day, period)
+        for week in (1, 2) for day in DAYS for period in range(1, 9)
+        if result.allows('class1', week, day, period)
+    ] == [(2, 'MONDAY', 5)]
+
+
+def test_fully_presolved_problem_is_not_searched():
+    """Test that a problem presolve settles completely is answered without building a model."""
+    test_data = create_test_data()
+    for class_id, (day, period) in zip(['class1', 'class2', 'class3', 'class4'],
+                                       [('MONDAY', 5), ('TUESDAY', 4), ('THURSDAY', 1), ('FRIDAY', 3)]):
+        test_data['conflicts'][class_id] = only_slot(day, period)
+    test_data['solverOptions'] = {'presolve': True}
+    solver = ScheduleSolver(test_data)
+    result = solver.solve()
+
+    assert result['status'] == 'success'
+    assert result['statusString'] == 'optimal'
+    assert result['presolve']['numFixed'] == 4
+    assert {'classId': 'class3', 'week': 1, 'day': 'THURSDAY', 'period': 1} in result['solution']
+    assert validate_solution(result, test_data)['valid'] is True
+    assert solver.model is None
+
+
+def test_presolve_detects_infeasibility():
+    """Test that two classes pinned to one slot are reported without building a model."""
+    test_data = create_pinned_data()
+    test_data['classes'].append({'id': 'class6', 'name': 'Class 3B', 'gradeLevel': 3})
+    test_data['conflicts']['class6'] = only_slot('TUESDAY', 4)
+    test_data['solverOptions'] = {'presolve': True}
+    solver = ScheduleSolver(test_data)
+    result = solver.solve()
+
+    assert result['status'] == 'infeasible'
+    assert result['statusCode'] == INFEASIBLE
+    assert 'class6' in result['message']
+    assert solver.model is None
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {'calendarEncoding': 'occupancy', 'redundantConstraints': True},
+    {'breakEncoding': 'implication', 'symmetryReduction': True},
+])
+def test_presolved_solve_is_valid_with_fewer_variables(options):
+    """Test that the model only holds the open classes and slots."""
+    test_data = create_pinned_data()
+    full = ScheduleSolver(dict(test_data, solverOptions={'encoding': 'sparse', **options})).solve()
+    test_data['solverOptions'] = {'presolve': True, **options}
+    result = ScheduleSolver(test_data).solve()
+
+    assert result['status'] == 'success'
+    assert result['numAssignments'] == len(test_data['classes'])
+    assert {'classId': 'class5', 'week': 1, 'day': 'TUESDAY', 'period': 4} in result['solution']
+    assert validate_solution(result, test_data)['valid'] is True
+    assert result['presolve']['numFixed'] == 1
+    assert result['modelStats']['numVariables'] < full['modelStats']['numVariables']
+
+
+def test_saved_model_keeps_fixed_classes(tmp_path):
+    """Test that classes fixed in presolve are part of offline solutions."""
+    test_data = create_pinned_data()
+    test_data['solverOptions'] = {'presolve': True, 'exportModelDir': str(tmp_path)}
+    result = ScheduleSolver(test_data).solve()
+    assert os.path.exists(os.path.join(result['exportPath'], FIXED_FILE))
+
+    saved_result = solve_saved_model(result['exportPath'], time_limit_seconds=10)
+    assert saved_result['numAssignments'] == len(test_data['classes'])
+    assert validate_solution(saved_result, test_data)['valid'] is True
+
+
+def test_parameter_sweep_with_presolve():
+    """Test that fixed classes count towards the swept limits."""
+    test_data = create_pinned_data({'maxClassesPerWeek': 12})
+    # A second class pinned to Tuesday, so a one-class-per-day limit can't hold
+    test_data['classes'].append({'id': 'class6', 'name': 'Class 3B', 'gradeLevel': 3})
+    test_data['conflicts']['class6'] = only_slot('TUESDAY', 7)
+    test_data['solverOptions'] = {'presolve': True}
+    result = ParameterSweep(test_data, {'maxClassesPerDay': [1, 3]}).solve()
+
+    statuses = {row['constraints']['maxClassesPerDay']: row['status'] for row in result['settings']}
+    assert statuses == {1: 'infeasible', 3: 'feasible'}
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Schedule Repair
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.repair import ScheduleRepair
+from solver.solution_validator import ScheduleValidator
+from test_solver_pytest import create_test_data, validate_solution
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+EDITED_SCHEDULE = [
+    {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 4},
+    {'classId': 'class2', 'week': 1, 'day': 'TUESDAY', 'period': 4},
+    {'classId': 'class3', 'week': 1, 'day': 'WEDNESDAY', 'period': 5},
+    {'classId': 'class4', 'week': 1, 'day': 'MONDAY', 'period': 6},
+]
+
+
+def repair_test_data():
+    """Create test data in which class1 can only take Monday period 6."""
+    test_data = create_test_data()
+    test_data['conflicts']['class1'] = {
+        day: [period for period in range(1, 9) if (day, period) != ('MONDAY', 6)]
+        for day in ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+    }
+    return test_data
+
+
+def test_valid_schedule_is_kept():
+    """Test that a valid schedule comes back unchanged without solving."""
+    test_data = create_test_data(rotation_weeks=2)
+    schedule = ScheduleSolver(test_data).solve()['solution']
+    result = ScheduleRepair(test_data).repair(schedule)
+
+    assert result['solution'] == schedule
+    assert result['numViolations'] == 0
+    assert result['attempts'] == []
+
+
+@pytest.mark.parametrize("edit", [
+    # class1 moved into one of its conflicts
+    lambda schedule: schedule[0].update(day='MONDAY', period=2),
+    # class2 moved onto class1
+    lambda schedule: schedule[1].update({key: schedule[0][key] for key in ('week', 'day', 'period')}),
+    # class3 removed
+    lambda schedule: schedule.pop(2),
+    # class4 added a second time
+    lambda schedule: schedule.append(dict(schedule[3], week=2)),
+])
+def test_repair_only_moves_freed_classes(edit):
+    """Test that a repaired schedule is valid and keeps every class outside the neighbourhood."""
+    test_data = create_test_data(rotation_weeks=2)
+    schedule = ScheduleSolver(test_data).solve()['solution']
+    edited = [dict(assignment) for assignment in schedule]
+    edit(edited)
+
+    result = ScheduleRepair(test_data).repair(edited)
+
+    assert result['status'] == 'success'
+    assert result['level'] == 'slot'
+    assert validate_solution(result, test_data)['valid'] is True
+    freed = set(result['freedClasses'])
+    assert {moved['classId'] for moved in result['diff']['moved']} <= freed
+    kept = [assignment for assignment in edited if assignment['classId'] not in freed]
+    assert all(assignment in result['solution'] for assignment in kept)
+
+
+def test_repair_widens_when_the_neighbourhood_is_too_small():
+    """Test that a class blocked by a locked class on the same day widens to the day."""
+    test_data = repair_test_data()
+    result = ScheduleRepair(test_data).repair(EDITED_SCHEDULE)
+
+    assert [attempt['level'] for attempt in result['attempts']] == ['slot', 'day']
+    assert result['attempts'][0]['status'] == 'infeasible'
+    assert result['level'] == 'day'
+    assert result['freedClasses'] == ['class1', 'class4']
+    assert {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 6} in result['solution']
+    assert validate_solution(result, test_data)['valid'] is True
+
+
+def test_repair_places_a_missing_class_with_one_slot():
+    """Test a repair whose only freed class is fixed by presolve."""
+    test_data = repair_test_data()
+    schedule = [assignment for assignment in EDITED_SCHEDULE if assignment['classId'] not in ('class1', 'class4')]
+    schedule.append({'classId': 'class4', 'week': 1, 'day': 'FRIDAY', 'period': 5})
+
+    result = ScheduleRepair(test_data).repair(schedule)
+
+    assert result['status'] == 'success'
+    assert result['level'] == 'slot'
+    assert result['freedClasses'] == ['class1']
+    assert {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 6} in result['solution']
+    assert validate_solution(result, test_data)['valid'] is True
+
+
+def test_repair_uses_given_violations():
+    """Test that the validator's violation list drives the repair."""
+    test_data = repair_test_data()
+    violations = ScheduleValidator(dict(test_data, assignments=EDITED_SCHEDULE)).validate()['violations']
+    result = ScheduleRepair(test_data).repair(EDITED_SCHEDULE, violations)
+
+    assert result['numViolations'] == len(violations) == 1
+    assert result['level'] == 'day'
+
+
+def test_repair_cli():
+    """Test the schedule repair script."""
+    test_data = repair_test_data()
+    test_data['assignments'] = EDITED_SCHEDULE
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'repair.py')],
+        input=json.dumps(test_data),
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout)
+    assert result['status'] == 'success'
+    assert result['level'] == 'day'
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler reproducible solve mode
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver, input_fingerprint, replay
+from solver.wire_format import pack_input, unpack_input
+from test_solver_pytest import create_test_data
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def reproducible_test_data(num_workers=1):
+    """Create test data solved in reproducible mode."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = {'reproducible': True, 'numWorkers': num_workers, 'deterministicTimeLimit': 5}
+    return test_data
+
+
+@pytest.mark.parametrize("num_workers", [1, 4])
+def test_reproducible_solves_are_identical(num_workers):
+    """Test that repeated reproducible solves give the same solution and fingerprints."""
+    test_data = reproducible_test_data(num_workers)
+    results = [ScheduleSolver(test_data).solve() for _ in range(3)]
+
+    assert results[0]['status'] == 'success'
+    assert all(result['solution'] == results[0]['solution'] for result in results)
+    assert all(result['reproducibility'] == results[0]['reproducibility'] for result in results)
+    assert 'random_seed: 0' in results[0]['reproducibility']['parameters']
+    assert 'max_deterministic_time: 5' in results[0]['reproducibility']['parameters']
+
+
+def test_input_fingerprint_ignores_wire_format():
+    """Test that JSON and binary copies of a request have the same fingerprint."""
+    test_data = reproducible_test_data()
+    assert input_fingerprint(unpack_input(pack_input(test_data))) == input_fingerprint(test_data)
+
+    changed = dict(test_data, rotationWeeks=3)
+    assert input_fingerprint(changed) != input_fingerprint(test_data)
+
+
+def test_replay_detects_changes():
+    """Test that a replay matches its recording and reports a changed input."""
+    test_data = reproducible_test_data()
+    record = {'input': test_data, 'result': ScheduleSolver(test_data).solve()}
+    assert replay(record)['identical'] is True
+
+    record['input'] = dict(test_data, constraints=dict(test_data['constraints'], maxClassesPerDay=2))
+    assert 'inputFingerprint' in replay(record)['mismatches']
+
+    with pytest.raises(ValueError):
+        replay({'input': test_data, 'result': {'status': 'success'}})
+
+
+def test_replay_uses_the_recorded_time_limit():
+    """Test that a solve with a non-default time limit replays identically."""
+    test_data = reproducible_test_data()
+    # Without its own deterministic limit the solve is bounded by the time limit
+    del test_data['solverOptions']['deterministicTimeLimit']
+    record = {'input': test_data, 'timeLimitSeconds': 5, 'result': ScheduleSolver(test_data).solve(5)}
+    assert replay(record)['identical'] is True
+
+    del record['timeLimitSeconds']
+    assert replay(record)['mismatches'] == ['parametersFingerprint']
+
+
+def test_replay_of_fully_locked_solve():
+    """Test that a solve settled by presolve alone is recorded and replays identically."""
+    test_data = reproducible_test_data()
+    test_data['lockedAssignments'] = ScheduleSolver(create_test_data(rotation_weeks=2)).solve()['solution']
+    solver = ScheduleSolver(test_data)
+    result = solver.solve()
+
+    assert result['status'] == 'success'
+    assert solver.model is None
+    assert replay({'input': test_data, 'result': result})['identical'] is True
+
+
+def test_record_and_replay_cli(tmp_path):
+    """Test recording a solve with the solver script and replaying it."""
+    record_path = str(tmp_path / 'record.json')
+    script = os.path.join(SOLVER_DIR, 'constraint_solver.py')
+    subprocess.run(
+        [sys.executable, script, '--record', record_path],
+        input=json.dumps(reproducible_test_data()),
+        capture_output=True, text=True, check=True
+    )
+    completed = subprocess.run(
+        [sys.executable, script, '--replay', record_path],
+        capture_output=True, text=True, check=True
+    )
+    assert json.loads(completed.stdout)['identical'] is True
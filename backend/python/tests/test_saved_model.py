@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Saved Models
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.saved_model import INPUT_FILE, PARAMETERS_FILE, solve_saved_model
+from test_solver_pytest import create_test_data, validate_solution
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def export_test_model(tmp_path, options=None):
+    """Solve the test data with model export enabled."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = {'exportModelDir': str(tmp_path), 'randomSeed': 3, **(options or {})}
+    result = ScheduleSolver(test_data).solve()
+    assert result['status'] == 'success'
+    return test_data, result
+
+
+@pytest.mark.parametrize("options", [{}, {'encoding': 'sparse', 'variableNames': False}])
+def test_saved_model_solves_without_rebuilding(tmp_path, options):
+    """Test that an exported model solves to a valid schedule on its own."""
+    test_data, result = export_test_model(tmp_path, options)
+    path = result['exportPath']
+
+    with open(os.path.join(path, INPUT_FILE)) as input_file:
+        assert json.load(input_file) == test_data
+    with open(os.path.join(path, PARAMETERS_FILE)) as parameters_file:
+        assert 'random_seed: 3' in parameters_file.read()
+
+    saved_result = solve_saved_model(path, time_limit_seconds=10)
+    assert saved_result['status'] == 'success'
+    assert saved_result['numAssignments'] == len(test_data['classes'])
+    assert validate_solution(saved_result, test_data)['valid'] is True
+
+
+def test_exports_share_a_corpus_directory(tmp_path):
+    """Test that different inputs are exported side by side."""
+    _, first = export_test_model(tmp_path)
+    _, second = export_test_model(tmp_path, {'breakEncoding': 'slot'})
+    _, repeated = export_test_model(tmp_path)
+
+    assert first['exportPath'] != second['exportPath']
+    assert first['exportPath'] == repeated['exportPath']
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_saved_model_cli(tmp_path):
+    """Test the saved model script."""
+    _, result = export_test_model(tmp_path)
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'saved_model.py'), result['exportPath'], '--num-workers', '1'],
+        capture_output=True, text=True, check=True
+    )
+    assert json.loads(completed.stdout)['status'] == 'success'
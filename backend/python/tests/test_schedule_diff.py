@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Schedule Diff
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.schedule_diff import diff_schedules
+from test_solver_pytest import create_test_data, validate_solution
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+PREVIOUS = [
+    {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 4},
+    {'classId': 'class2', 'week': 1, 'day': 'TUESDAY', 'period': 1},
+    {'classId': 'class3', 'week': 2, 'day': 'FRIDAY', 'period': 8},
+]
+CURRENT = [
+    {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 4},
+    {'classId': 'class2', 'week': 2, 'day': 'TUESDAY', 'period': 1},
+    {'classId': 'class4', 'week': 1, 'day': 'THURSDAY', 'period': 6},
+]
+
+
+def test_diff_schedules():
+    """Test that moved, added and removed classes are reported."""
+    diff = diff_schedules(PREVIOUS, CURRENT)
+
+    assert diff['moved'] == [{
+        'classId': 'class2',
+        'from': {'week': 1, 'day': 'TUESDAY', 'period': 1},
+        'to': {'week': 2, 'day': 'TUESDAY', 'period': 1}
+    }]
+    assert diff['added'] == [CURRENT[2]]
+    assert diff['removed'] == [PREVIOUS[2]]
+    assert diff['numUnchanged'] == 1
+    assert diff['stability'] == pytest.approx(1 / 4)
+
+
+def test_diff_identical_schedules():
+    """Test that identical schedules are fully stable, regardless of order."""
+    diff = diff_schedules(PREVIOUS, list(reversed(PREVIOUS)))
+    assert diff['moved'] == diff['added'] == diff['removed'] == []
+    assert diff['stability'] == 1.0
+    assert diff_schedules([], [])['stability'] == 1.0
+
+
+def test_reference_schedule_minimises_moves():
+    """Test that a re-solve only moves the class whose slot became unavailable."""
+    test_data = create_test_data()
+    reference = ScheduleSolver(test_data).solve()['solution']
+
+    # Block the reference slot of the first class
+    moved = reference[0]
+    test_data['conflicts'].setdefault(moved['classId'], {}).setdefault(moved['day'], []).append(moved['period'])
+    test_data['solverOptions'] = {'referenceSchedule': reference}
+    result = ScheduleSolver(test_data).solve()
+
+    assert result['status'] == 'success'
+    assert result['statusString'] == 'optimal'
+    assert validate_solution(result, test_data)['valid'] is True
+    assert [move['classId'] for move in result['diff']['moved']] == [moved['classId']]
+    assert result['diff']['stability'] == pytest.approx(3 / 4)
+
+
+def test_diff_cli():
+    """Test the schedule diff script."""
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'schedule_diff.py')],
+        input=json.dumps({'previous': PREVIOUS, 'current': CURRENT}),
+        capture_output=True, text=True, check=True
+    )
+    assert json.loads(completed.stdout) == diff_schedules(PREVIOUS, CURRENT)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Shared Problem
+"""
+
+import sys
+import os
+import multiprocessing
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.compiled_problem import CompiledProblem
+from solver.presolve import presolve
+from solver.shared_problem import SharedProblem, SharedSchedule, attach_worker, check_shared_schedule
+from solver.solution_validator import check_schedule
+from test_solver_pytest import create_test_data
+
+SCHEDULE = [
+    {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 1},
+    {'classId': 'class2', 'week': 1, 'day': 'MONDAY', 'period': 2},
+    {'classId': 'class3', 'week': 2, 'day': 'MONDAY', 'period': 1},
+    {'classId': 'class4', 'week': 2, 'day': 'FRIDAY', 'period': 8},
+]
+
+
+@pytest.fixture
+def shared_problem():
+    """Create a shared problem and free it after the test."""
+    problem = SharedProblem.create(create_test_data(rotation_weeks=2))
+    yield problem
+    problem.close()
+    problem.unlink()
+
+
+def test_attached_problem_matches_compiled_problem(shared_problem):
+    """Test that an attached problem reads the same tables as a CompiledProblem."""
+    test_data = create_test_data(rotation_weeks=2)
+    compiled = CompiledProblem(test_data)
+
+    with SharedProblem.attach(shared_problem.name) as attached:
+        assert attached.class_ids == compiled.class_ids
+        assert attached.class_index == compiled.class_index
+        assert attached.classes == compiled.classes
+        assert attached.rotation_weeks == 2
+        assert list(attached.conflict_masks) == list(compiled.conflict_masks)
+        for class_id in compiled.class_ids:
+            for day in compiled.days:
+                assert attached.blocked_mask(class_id, day) == compiled.blocked_mask(class_id, day)
+
+
+def test_shared_problem_validates_and_presolves(shared_problem):
+    """Test that the validator and presolve give the same results on a shared problem."""
+    compiled = CompiledProblem(create_test_data(rotation_weeks=2))
+
+    assert check_schedule(shared_problem, SCHEDULE) == check_schedule(compiled, SCHEDULE)
+    assert presolve(shared_problem, SCHEDULE[:1]).fixed == presolve(compiled, SCHEDULE[:1]).fixed
+
+
+def test_shared_schedule_round_trip(shared_problem):
+    """Test that a shared schedule decodes to its assignments."""
+    with SharedSchedule.create(shared_problem, SCHEDULE) as schedule:
+        with SharedSchedule.attach(schedule.name) as attached:
+            assert attached.assignments(shared_problem) == SCHEDULE
+        schedule.unlink()
+
+    with pytest.raises(ValueError):
+        SharedSchedule.create(shared_problem, [{'classId': 'nope', 'day': 'MONDAY', 'period': 1}])
+
+
+def test_pool_workers_check_shared_schedules(shared_problem):
+    """Test that pool workers validate schedules given only block names."""
+    valid = [dict(assignment) for assignment in SCHEDULE]
+    invalid = valid[:3] + [dict(valid[3], day='MONDAY', period=1)]
+    schedules = [SharedSchedule.create(shared_problem, schedule) for schedule in (valid, invalid)]
+
+    try:
+        with multiprocessing.Pool(2, initializer=attach_worker, initargs=(shared_problem.name,)) as pool:
+            results = pool.map(check_shared_schedule, [schedule.name for schedule in schedules])
+    finally:
+        for schedule in schedules:
+            schedule.close()
+            schedule.unlink()
+
+    assert results[0] == check_schedule(shared_problem, valid)
+    assert results[1] == check_schedule(shared_problem, invalid)
+    assert results[1]['valid'] is False
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Slot Query
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.incremental_validator import IncrementalScheduleValidator
+from solver.slot_query import SlotQuery
+from test_solver_pytest import create_test_data
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def solved_test_data(constraints, rotation_weeks):
+    """Create test data with a valid solved schedule as its assignments."""
+    test_data = create_test_data(constraints=constraints, rotation_weeks=rotation_weeks)
+    result = ScheduleSolver(test_data).solve()
+    assert result['status'] == 'success'
+    test_data['assignments'] = result['solution']
+    return test_data
+
+
+@pytest.mark.parametrize("constraints,rotation_weeks", [
+    ({}, 1),
+    ({'requireBreakAfterClass': False, 'maxConsecutiveClasses': 1}, 1),
+    ({'requireBreakAfterClass': False, 'maxClassesPerDay': 1, 'maxClassesPerWeek': 4}, 2),
+])
+def test_explain_matches_validation(constraints, rotation_weeks):
+    """Test that the reasons for every slot match the violations a move would cause."""
+    test_data = solved_test_data(constraints, rotation_weeks)
+    query = SlotQuery.from_data(test_data)
+
+    for assignment in test_data['assignments']:
+        explanation = query.explain(assignment['classId'])
+        slots = explanation['feasible'] + explanation['excluded']
+        assert len(slots) == rotation_weeks * 5 * 8
+
+        for slot in slots:
+            validator = IncrementalScheduleValidator(test_data)
+            to = {'week': slot['week'], 'day': slot['day'], 'period': slot['period']}
+            result = validator.apply({'op': 'move', 'assignment': assignment, 'to': to})
+
+            assert set(slot.get('reasons', [])) == {v['type'] for v in result['added']}
+
+
+def test_feasible_masks_follow_edits():
+    """Test that queries see edits made through a shared incremental validator."""
+    test_data = create_test_data()
+    test_data['assignments'] = [{'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 3}]
+    validator = IncrementalScheduleValidator(test_data)
+
+    # Teacher-free Tuesday: class2 conflicts with periods 1-2, breaks block 2 and 4
+    assert validator.slot_query.feasible_masks('class2')[(1, 'TUESDAY')] == 0b11110000
+
+    validator.apply({'op': 'add', 'assignment': {'classId': 'class3', 'week': 1, 'day': 'TUESDAY', 'period': 7}})
+
+    assert validator.slot_query.feasible_masks('class2')[(1, 'TUESDAY')] == 0b00010000
+
+
+def test_explain_cli():
+    """Test the slot query script."""
+    test_data = solved_test_data({}, 1)
+    test_data['classIds'] = ['class1', 'class2']
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'slot_query.py')],
+        input=json.dumps(test_data),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    result = json.loads(completed.stdout)
+
+    assert [item['classId'] for item in result] == ['class1', 'class2']
+    assert all(item['feasible'] for item in result)
+
+
+def test_explain_covers_weeks_of_the_schedule_without_rotation_weeks():
+    """Test that occupancy in later weeks counts when the input leaves rotationWeeks out."""
+    test_data = solved_test_data({}, 2)
+    del test_data['rotationWeeks']
+    occupied = next(assignment for assignment in test_data['assignments'] if assignment['week'] == 2)
+    other_class = next(
+        class_obj['id'] for class_obj in test_data['classes'] if class_obj['id'] != occupied['classId']
+    )
+
+    explanation = SlotQuery.from_data(test_data).explain(other_class)
+    slot = {'week': 2, 'day': occupied['day'], 'period': occupied['period']}
+
+    assert slot not in explanation['feasible']
+    excluded = next(entry for entry in explanation['excluded'] if entry['week'] == 2
+                    and entry['day'] == slot['day'] and entry['period'] == slot['period'])
+    assert 'multiple_classes_per_slot' in excluded['reasons']
+
+
+def test_explain_reports_assignments_outside_the_calendar():
+    """Test that assignments outside the calendar are reported instead of failing the query."""
+    test_data = solved_test_data({}, 1)
+    moved = dict(test_data['assignments'][0], period=9)
+    test_data['assignments'] = [moved, dict(test_data['assignments'][1], week='1')] + test_data['assignments'][2:]
+
+    query = SlotQuery.from_data(test_data)
+
+    assert [violation['type'] for violation in query.explain(moved['classId'])['invalidSlots']] == ['invalid_slot']
+    assert query.explain(test_data['assignments'][1]['classId'])['invalidSlots'] == []
+
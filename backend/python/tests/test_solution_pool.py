@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Solution Pool
+"""
+
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.schedule_diff import diff_schedules
+from solver.solution_pool import SolutionPool
+from test_solver_pytest import create_test_data, validate_solution
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+@pytest.mark.parametrize("min_distance", [1, 2, 4])
+def test_pool_holds_valid_diverse_schedules(min_distance):
+    """Test that every pair of pooled schedules differs in enough classes."""
+    test_data = create_test_data(rotation_weeks=2)
+    result = SolutionPool(test_data, 4, min_distance).solve()
+
+    assert result['status'] == 'success'
+    assert result['numSolutions'] == 4
+    assert result['stopReason'] == 'full'
+    solutions = [entry['solution'] for entry in result['solutions']]
+    for index, solution in enumerate(solutions):
+        assert validate_solution({'status': 'success', 'solution': solution}, test_data)['valid'] is True
+        for earlier in solutions[:index]:
+            assert len(diff_schedules(earlier, solution)['moved']) >= min_distance
+    assert all(entry['distance'] >= min_distance for entry in result['solutions'][1:])
+
+
+def test_pool_stops_when_no_schedule_is_far_enough():
+    """Test that the pool ends early once the cuts leave no schedule."""
+    test_data = create_test_data()
+    test_data['lockedAssignments'] = [
+        {'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 4},
+        {'classId': 'class2', 'week': 1, 'day': 'WEDNESDAY', 'period': 4},
+        {'classId': 'class3', 'week': 1, 'day': 'THURSDAY', 'period': 2},
+    ]
+    # Only class4 is left to move, so no two schedules differ in two classes
+    result = SolutionPool(test_data, 3, min_distance=2).solve()
+
+    assert result['numSolutions'] == 1
+    assert result['stopReason'] == 'exhausted'
+
+
+def test_pool_of_fully_locked_problem_has_one_schedule():
+    """Test that a problem with every class locked gives its one schedule."""
+    test_data = create_test_data()
+    test_data['lockedAssignments'] = [
+        {'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 4},
+        {'classId': 'class2', 'week': 1, 'day': 'WEDNESDAY', 'period': 4},
+        {'classId': 'class3', 'week': 1, 'day': 'THURSDAY', 'period': 2},
+        {'classId': 'class4', 'week': 1, 'day': 'FRIDAY', 'period': 3},
+    ]
+    result = SolutionPool(test_data, 3).solve()
+
+    assert result['numSolutions'] == 1
+    assert result['stopReason'] == 'exhausted'
+    assert validate_solution(dict(result['solutions'][0], status='success'), test_data)['valid'] is True
+
+
+def test_pool_of_infeasible_problem_is_empty():
+    """Test that an infeasible problem gives the solver's answer and no schedules."""
+    test_data = create_test_data({'maxClassesPerWeek': 2})
+    result = SolutionPool(test_data, 3).solve()
+
+    assert result['status'] == 'infeasible'
+    assert result['solutions'] == []
+
+
+def test_pool_cli():
+    """Test the solution pool script."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data.update(poolSize=2, minDistance=2)
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'solution_pool.py')],
+        input=json.dumps(test_data),
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout)
+    assert result['numSolutions'] == 2
+    assert result['solutions'][1]['distance'] >= 2
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Solution Validator
+"""
+
+import sys
+import os
+import json
+import random
+import subprocess
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.constraint_solver import ScheduleSolver
+from solver.solution_validator import (
+    ScheduleValidator,
+    StreamingScheduleValidator,
+    iter_exported_schedule,
+)
+from test_solver_pytest import create_test_data
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+
+
+def random_assignments(test_data, num_assignments, seed):
+    """Create random (usually invalid) assignments for the test classes."""
+    rng = random.Random(seed)
+    class_ids = [class_obj['id'] for class_obj in test_data['classes']]
+    return [
+        {
+            'classId': rng.choice(class_ids),
+            'week': rng.randint(1, test_data['rotationWeeks']),
+            'day': rng.choice(DAYS),
+            'period': rng.randint(1, 8)
+        }
+        for _ in range(num_assignments)
+    ]
+
+
+def violation_counts(violations, exclude=()):
+    """Count violations by type."""
+    counts = {}
+    for violation in violations:
+        if violation['type'] not in exclude:
+            counts[violation['type']] = counts.get(violation['type'], 0) + 1
+    return counts
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_matches_batch(seed):
+    """Test that streaming validation finds the same violations as batch validation."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['assignments'] = random_assignments(test_data, 30, seed)
+
+    batch = ScheduleValidator(test_data).validate()
+    streaming = StreamingScheduleValidator(test_data)
+    violations = list(streaming.validate_stream(test_data['assignments']))
+
+    assert violation_counts(violations) == violation_counts(batch['violations'])
+    assert streaming.summary()['valid'] == batch['valid']
+    assert streaming.summary()['numAssignments'] == 30
+
+
+def test_streaming_reports_early_violations():
+    """Test that per-assignment violations are reported as soon as they occur."""
+    test_data = create_test_data()
+    streaming = StreamingScheduleValidator(test_data)
+
+    assert streaming.add({'classId': 'class1', 'week': 1, 'day': 'TUESDAY', 'period': 3}) == []
+    violations = streaming.add({'classId': 'class2', 'week': 1, 'day': 'TUESDAY', 'period': 4})
+
+    assert [violation['type'] for violation in violations] == ['no_break_after_class']
+    assert violations[0]['period'] == 3
+
+
+def test_streaming_reports_every_long_run():
+    """Test that every run of too many consecutive classes is reported in full."""
+    test_data = create_test_data(constraints={'maxConsecutiveClasses': 2, 'requireBreakAfterClass': False})
+    streaming = StreamingScheduleValidator(test_data)
+    assignments = [
+        {'classId': 'class1', 'week': 1, 'day': 'WEDNESDAY', 'period': period}
+        for period in [1, 2, 3, 5, 6, 7, 8]
+    ]
+
+    violations = [
+        violation for violation in streaming.validate_stream(assignments)
+        if violation['type'] == 'max_consecutive_classes_exceeded'
+    ]
+
+    assert [violation['periods'] for violation in violations] == [[1, 2, 3], [5, 6, 7, 8]]
+
+
+def test_batch_reports_every_long_run():
+    """Test that the batch validator reports every long run in full."""
+    test_data = create_test_data(constraints={'maxConsecutiveClasses': 2, 'requireBreakAfterClass': True})
+    test_data['assignments'] = [
+        {'classId': 'class1', 'week': 2, 'day': 'WEDNESDAY', 'period': period}
+        for period in [1, 2, 3, 5, 6, 7, 8]
+    ]
+
+    violations = ScheduleValidator(test_data).validate()['violations']
+    runs = [v['periods'] for v in violations if v['type'] == 'max_consecutive_classes_exceeded']
+    breaks = [v['period'] for v in violations if v['type'] == 'no_break_after_class']
+
+    assert runs == [[1, 2, 3], [5, 6, 7, 8]]
+    assert breaks == [1, 2, 5, 6, 7]
+
+
+@pytest.mark.parametrize("slot", [
+    {'week': 1, 'day': 'MONDAY', 'period': 9},
+    {'week': 1, 'day': 'SATURDAY', 'period': 4},
+    {'week': 0, 'day': 'MONDAY', 'period': 4},
+    {'week': 'two', 'day': 'MONDAY', 'period': 4},
+])
+def test_slots_outside_the_calendar_are_violations(slot):
+    """Test that a bad week, day or period is reported instead of raising."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['assignments'] = [
+        dict(assignment, **slot) if assignment['classId'] == 'class2' else assignment
+        for assignment in ScheduleSolver(test_data).solve()['solution']
+    ]
+
+    result = ScheduleValidator(test_data).validate()
+
+    assert [v['type'] for v in result['violations']] == ['invalid_slot']
+    assert result['violations'][0]['assignment']['classId'] == 'class2'
+
+
+def test_numeric_string_week_is_read_as_a_number():
+    """Test that a week sent as a string counts towards the same week."""
+    test_data = create_test_data(rotation_weeks=2)
+    schedule = ScheduleSolver(test_data).solve()['solution']
+    # class2 moved onto class1, with its week as a string
+    moved = dict(schedule[0], classId='class2', week=str(schedule[0]['week']))
+    test_data['assignments'] = [schedule[0], moved] + schedule[2:]
+
+    violations = ScheduleValidator(test_data).validate()['violations']
+
+    assert 'multiple_classes_per_slot' in [v['type'] for v in violations]
+    assert 'invalid_slot' not in [v['type'] for v in violations]
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ('conflicts', {'class1': {'MONDAY': [9]}}, 'period 9'),
+    ('conflicts', {'class1': {'SUNDAY': [1]}}, 'unknown day SUNDAY'),
+    ('teacherAvailability', {'FRIDAY': [0]}, 'period 0'),
+    ('teacherAvailability', {'Friday': [1]}, 'unknown day Friday'),
+])
+def test_compiled_input_rejects_slots_outside_the_calendar(field, value, message):
+    """Test that conflicts and availability outside the calendar are rejected by name."""
+    test_data = create_test_data()
+    test_data[field] = value
+
+    with pytest.raises(ValueError, match=message):
+        ScheduleValidator(dict(test_data, assignments=[]))
+    with pytest.raises(ValueError, match=message):
+        ScheduleSolver(test_data)
+
+
+def test_exported_schedule_csv():
+    """Test reading assignments from an exported schedule CSV."""
+    csv_path = os.path.join(PROJECT_ROOT, 'test_data', 'exported-schedule.csv')
+    test_data = create_test_data()
+
+    with open(csv_path, newline='') as csv_file:
+        assignments = list(iter_exported_schedule(csv_file, test_data['classes']))
+
+    assert assignments == [
+        {'classId': 'class1', 'week': 1, 'day': 'MONDAY', 'period': 1},
+        {'classId': 'class2', 'week': 1, 'day': 'MONDAY', 'period': 2},
+        {'classId': 'class3', 'week': 1, 'day': 'TUESDAY', 'period': 3},
+        {'classId': 'class4', 'week': 1, 'day': 'WEDNESDAY', 'period': 4},
+    ]
+
+
+def test_stream_cli():
+    """Test the validator script in streaming mode."""
+    test_data = create_test_data()
+    assignments = random_assignments(test_data, 12, seed=1)
+    context = {key: value for key, value in test_data.items() if key != 'assignments'}
+    stdin = '\n'.join(
+        [json.dumps(context), json.dumps(assignments[:6])] + [json.dumps(a) for a in assignments[6:]]
+    )
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'solution_validator.py'), '--stream'],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    lines = [json.loads(line) for line in completed.stdout.splitlines()]
+
+    summary = lines[-1]
+    assert summary['numAssignments'] == 12
+    assert summary['numViolations'] == len(lines) - 1
@@ -15,8 +15,9 @@ from typing import Dict, Any
 
 # Add the parent directory to the path so we can import the solver modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from solver.constraint_solver import ScheduleSolver
+from solver.constraint_solver import ScheduleSolver, UNKNOWN
 from solver.solution_validator import ScheduleValidator
+from ortools.sat.python import cp_model
 
 
 def create_test_data(constraints=None, rotation_weeks=1):
@@ -416,6 +417,232 @@ def test_rotation_weeks(weeks):
     assert validation_result['valid'] is True
 
 
+# Solver option tests
+@pytest.mark.parametrize("options", [
+    {'encoding': 'sparse'},
+    {'breakEncoding': 'implication'},
+    {'encoding': 'sparse', 'breakEncoding': 'implication', 'randomSeed': 7, 'numWorkers': 1},
+    {'breakEncoding': 'slot', 'variableNames': False},
+    {'calendarEncoding': 'occupancy'},
+    {'encoding': 'sparse', 'calendarEncoding': 'occupancy', 'redundantConstraints': True},
+])
+def test_solver_options(options):
+    """Test the solver with alternative encodings and search parameters."""
+    # Create test data with solver options
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = options
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve()
+    
+    # Check if solver found a solution
+    assert result['status'] == 'success'
+    assert len(result['solution']) == len(test_data['classes'])
+    
+    # Validate solution
+    validation_result = validate_solution(result, test_data)
+    assert validation_result is not None
+    assert validation_result['valid'] is True
+
+
+# Redundant constraint tests
+def test_redundant_constraints_keep_solutions():
+    """Test that redundant constraints don't cut off valid schedules."""
+    # Create test data with redundant constraints enabled
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = {'redundantConstraints': True}
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve()
+    
+    # Check if solver found a valid solution
+    assert result['status'] == 'success'
+    validation_result = validate_solution(result, test_data)
+    assert validation_result['valid'] is True
+
+
+def test_redundant_constraints_prove_over_capacity():
+    """Test that an over-capacity roster is proven infeasible immediately."""
+    # With a break after every class only 4 of 8 periods are usable, and the
+    # teacher gap on Monday leaves 3, so a week holds 19 classes at most
+    test_data = create_test_data(constraints={
+        'maxClassesPerDay': 5,
+        'maxClassesPerWeek': 20,
+        'requireBreakAfterClass': True
+    })
+    test_data['classes'] = [
+        {'id': f'class{i}', 'name': f'Class {i}', 'gradeLevel': 1} for i in range(1, 21)
+    ]
+    test_data['conflicts'] = {}
+    test_data['teacherAvailability'] = {'MONDAY': [3, 6]}
+    test_data['solverOptions'] = {'redundantConstraints': True}
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve(time_limit_seconds=10)
+    
+    # Check that infeasibility was proven rather than timed out
+    assert result['status'] == 'infeasible'
+    assert result['statusCode'] == cp_model.INFEASIBLE
+    assert result['solveTime'] < 5
+
+
+@pytest.mark.parametrize("options", [{}, {'calendarEncoding': 'occupancy'}])
+def test_break_after_last_periods(options):
+    """Test that the break rule also applies between the last two periods."""
+    # Only periods 7 and 8 on Monday are available
+    test_data = create_test_data(constraints={'requireBreakAfterClass': True})
+    test_data['solverOptions'] = options
+    test_data['classes'] = test_data['classes'][:2]
+    test_data['conflicts'] = {}
+    test_data['teacherAvailability'] = {
+        day: list(range(1, 9)) for day in ['TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY']
+    }
+    test_data['teacherAvailability']['MONDAY'] = list(range(1, 7))
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve(time_limit_seconds=10)
+    
+    # Two classes can't take adjacent periods 7 and 8
+    assert result['status'] == 'infeasible'
+
+
+# Solution verification tests
+def test_validate_solution():
+    """Test that the solver validates schedules like ScheduleValidator."""
+    # Create test data
+    test_data = create_test_data()
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve()
+    assert result['status'] == 'success'
+    
+    # The solver's own solution is valid
+    assert solver.validate_solution(result['solution'])['valid'] is True
+    
+    # A broken schedule reports the same violations as the standalone validator
+    broken = [dict(assignment, day='MONDAY', period=1) for assignment in result['solution']]
+    solver_result = solver.validate_solution(broken)
+    assert solver_result['valid'] is False
+    assert solver_result == validate_solution(dict(result, solution=broken), test_data)
+
+
+def test_verify_solution_option():
+    """Test that the verifySolution option reports the verification result."""
+    # Create test data with verification enabled
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = {'verifySolution': True}
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve()
+    
+    # Check that the solution was verified
+    assert result['status'] == 'success'
+    assert result['validation']['valid'] is True
+    assert result['validation']['numAssignments'] == len(test_data['classes'])
+    assert result['verificationTime'] >= 0
+
+
+# Model size tests
+@pytest.mark.parametrize("options", [
+    {},
+    {'encoding': 'sparse', 'breakEncoding': 'implication'},
+    {'encoding': 'sparse', 'breakEncoding': 'slot'},
+    {'calendarEncoding': 'occupancy'},
+    {'encoding': 'sparse', 'calendarEncoding': 'occupancy'},
+])
+def test_model_size_estimate(options):
+    """Test that the size estimate counts the variables and constraints of the built model."""
+    # Create test data with solver options
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = options
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    estimate = solver.estimate_model_size()
+    
+    # Solve and get result
+    result = solver.solve()
+    
+    # Check the estimate against the reported model size
+    assert result['status'] == 'success'
+    assert result['modelStats']['numVariables'] == estimate['numVariables']
+    assert result['modelStats']['numConstraints'] == estimate['numConstraints']
+    assert result['modelStats']['peakRssBytes'] > 0
+
+
+def test_memory_budget_switches_to_lean_model():
+    """Test that a model over the memory budget is built with the lean options."""
+    # Create test data
+    test_data = create_test_data(rotation_weeks=2)
+    solver = ScheduleSolver(test_data)
+    sparse = solver.estimate_model_size({'encoding': 'sparse'})['estimatedBytes']
+    lean = solver.estimate_model_size({'encoding': 'sparse', 'breakEncoding': 'slot'})['estimatedBytes']
+    assert lean < sparse < solver.estimate_model_size()['estimatedBytes']
+    
+    # A budget only the sparse encoding with slot break constraints fits into
+    test_data['solverOptions'] = {'memoryBudgetMB': (lean + sparse) / 2 / 2 ** 20}
+    result = ScheduleSolver(test_data).solve()
+    
+    # Check that the lean model was solved
+    assert result['status'] == 'success'
+    assert result['modelStats']['encoding'] == 'sparse'
+    assert result['modelStats']['breakEncoding'] == 'slot'
+    assert result['modelStats']['calendarEncoding'] == 'direct'
+    assert validate_solution(result, test_data)['valid'] is True
+    
+    # A budget below the lean size is refused before building anything
+    test_data['solverOptions'] = {'memoryBudgetMB': lean / 4 / 2 ** 20}
+    result = ScheduleSolver(test_data).solve()
+    assert result['status'] == 'error'
+    assert result['statusCode'] == UNKNOWN
+    assert 'memory budget' in result['message']
+    # Fields the Node service's SolverResult requires
+    assert isinstance(result['statusCode'], int) and isinstance(result['solveTime'], (int, float))
+    assert result['modelStats']['estimatedBytes'] > lean / 4
+
+
+# Solution extraction tests
+@pytest.mark.parametrize("encoding", ['boolean', 'sparse'])
+def test_bulk_extraction_matches_values(encoding):
+    """Test that bulk extraction reads the same assignments as per-variable reads."""
+    # Create test data
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['solverOptions'] = {'encoding': encoding}
+    
+    # Create solver
+    solver = ScheduleSolver(test_data)
+    
+    # Solve and get result
+    result = solver.solve()
+    assert result['status'] == 'success'
+    
+    # Compare with reading every variable individually
+    expected = [
+        {'classId': class_id, 'week': week, 'day': day, 'period': period}
+        for (class_id, week, day, period), var in solver.assignments.items()
+        if solver.solver.Value(var) == 1
+    ]
+    assert result['solution'] == expected
+
+
 # CSV data tests
 def test_small_csv_data():
     """Test the solver with small CSV dataset."""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler Symmetry Reduction
+"""
+
+import sys
+import os
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.compiled_problem import CompiledProblem
+from solver.constraint_solver import ScheduleSolver, INFEASIBLE
+from solver.parameter_sweep import ParameterSweep
+from solver.saved_model import GROUPS_FILE, solve_saved_model
+from solver.symmetry import class_groups, expand_solution
+from test_solver_pytest import create_test_data, validate_solution
+
+
+def create_section_data(constraints=None, sections=3):
+    """Create test data where every class of the base data has identical sections."""
+    test_data = create_test_data(constraints)
+    classes = []
+    conflicts = {}
+    for cls in test_data['classes']:
+        for section in range(1, sections + 1):
+            class_id = f"{cls['id']}_{section}"
+            classes.append(dict(cls, id=class_id, name=f"{cls['name']}{section}"))
+            conflicts[class_id] = test_data['conflicts'].get(cls['id'], {})
+    return dict(test_data, classes=classes, conflicts=conflicts)
+
+
+def test_class_groups_merge_identical_profiles():
+    """Test that classes with the same conflicts share a group."""
+    compiled = CompiledProblem(create_section_data(sections=2))
+    groups = class_groups(compiled)
+
+    assert groups == {
+        'class1_1': ['class1_1', 'class1_2'],
+        'class2_1': ['class2_1', 'class2_2'],
+        'class3_1': ['class3_1', 'class3_2'],
+        'class4_1': ['class4_1', 'class4_2'],
+    }
+    assert class_groups(compiled, singletons={'class1_2'})['class1_2'] == ['class1_2']
+    assert len(class_groups(CompiledProblem(create_test_data()))) == 4
+
+
+def test_expand_solution_hands_out_slots_in_calendar_order():
+    """Test that members take their group's slots in calendar order."""
+    solution = [
+        {'classId': 'a', 'week': 1, 'day': 'TUESDAY', 'period': 1},
+        {'classId': 'a', 'week': 1, 'day': 'MONDAY', 'period': 3},
+    ]
+    expanded = expand_solution(solution, {'a': ['a', 'b']}, {'MONDAY': 0, 'TUESDAY': 1})
+
+    assert expanded == [
+        {'classId': 'a', 'week': 1, 'day': 'MONDAY', 'period': 3},
+        {'classId': 'b', 'week': 1, 'day': 'TUESDAY', 'period': 1},
+    ]
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {'encoding': 'sparse'},
+    {'calendarEncoding': 'occupancy'},
+])
+def test_reduced_solve_is_valid_with_fewer_variables(options):
+    """Test that a reduced model solves to a valid schedule for every class."""
+    test_data = create_section_data({'maxClassesPerDay': 6, 'maxClassesPerWeek': 30})
+    full_solver = ScheduleSolver(dict(test_data, solverOptions=options))
+    full = full_solver.solve()
+    test_data['solverOptions'] = {'symmetryReduction': True, **options}
+    reduced_solver = ScheduleSolver(test_data)
+    reduced = reduced_solver.solve()
+
+    assert full['status'] == reduced['status'] == 'success'
+    assert reduced['numAssignments'] == len(test_data['classes'])
+    assert validate_solution(reduced, test_data)['valid'] is True
+    assert len(reduced_solver.assignments) * 3 == len(full_solver.assignments)
+
+
+def test_reduced_model_keeps_infeasibility():
+    """Test that reduction does not turn an infeasible input feasible."""
+    test_data = create_section_data({'maxClassesPerDay': 1, 'maxClassesPerWeek': 3})
+    test_data['solverOptions'] = {'symmetryReduction': True}
+    result = ScheduleSolver(test_data).solve()
+
+    assert result['status'] == 'infeasible'
+    assert result['statusCode'] == INFEASIBLE
+
+
+def test_reference_schedule_disables_reduction():
+    """Test that stability solves keep one variable set per class."""
+    test_data = create_section_data({'maxClassesPerDay': 6, 'maxClassesPerWeek': 30})
+    reference = ScheduleSolver(test_data).solve()['solution']
+    test_data['solverOptions'] = {'symmetryReduction': True, 'referenceSchedule': reference}
+    solver = ScheduleSolver(test_data)
+    result = solver.solve()
+
+    assert len(solver.groups) == len(test_data['classes'])
+    assert result['diff']['stability'] == 1.0
+
+
+def test_saved_model_expands_groups(tmp_path):
+    """Test that a reduced model solves offline to a schedule for every class."""
+    test_data = create_section_data({'maxClassesPerDay': 6, 'maxClassesPerWeek': 30})
+    test_data['solverOptions'] = {'symmetryReduction': True, 'exportModelDir': str(tmp_path)}
+    result = ScheduleSolver(test_data).solve()
+    assert os.path.exists(os.path.join(result['exportPath'], GROUPS_FILE))
+
+    saved_result = solve_saved_model(result['exportPath'], time_limit_seconds=10)
+    assert saved_result['numAssignments'] == len(test_data['classes'])
+    assert validate_solution(saved_result, test_data)['valid'] is True
+
+
+def test_parameter_sweep_with_reduction():
+    """Test that sweeps run on the reduced model."""
+    test_data = create_section_data({'maxClassesPerWeek': 30})
+    test_data['solverOptions'] = {'symmetryReduction': True}
+    result = ParameterSweep(test_data, {'maxClassesPerDay': [1, 6]}).solve()
+
+    statuses = {row['constraints']['maxClassesPerDay']: row['status'] for row in result['settings']}
+    assert statuses == {1: 'infeasible', 6: 'feasible'}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Pytest-based tests for the Thunder Scheduler binary wire format
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+import pytest
+
+# Add the parent directory to the path so we can import the solver modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from solver.compiled_problem import CompiledProblem
+from solver.constraint_solver import ScheduleSolver, input_fingerprint
+from solver.wire_format import (
+    encode_assignments, iter_assignments, pack_input, unpack_compiled, unpack_input, pack_result, unpack_result,
+    unpack_frame
+)
+from test_solver_pytest import create_test_data
+
+SOLVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'solver')
+
+
+def make_assignments(num_weeks):
+    """Create a large list of assignments covering every slot."""
+    return [
+        {'classId': f'class{(week * 40 + day_idx * 8 + period) % 4 + 1}', 'week': week, 'day': day, 'period': period}
+        for week in range(1, num_weeks + 1)
+        for day_idx, day in enumerate(['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY'])
+        for period in range(1, 9)
+    ]
+
+
+def test_input_round_trip():
+    """Test that solver and validator input survive a binary round trip."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['assignments'] = make_assignments(2)
+
+    decoded = unpack_input(pack_input(test_data))
+
+    assert decoded['classes'] == test_data['classes']
+    assert decoded['constraints'] == test_data['constraints']
+    assert decoded['teacherAvailability'] == test_data['teacherAvailability']
+    assert decoded['rotationWeeks'] == 2
+    assert decoded['assignments'] == test_data['assignments']
+    for class_id, days in test_data['conflicts'].items():
+        assert decoded['conflicts'][class_id] == {day: sorted(periods) for day, periods in days.items()}
+
+
+def test_result_round_trip_is_compact():
+    """Test that a result round trips and is smaller than its JSON encoding."""
+    class_ids = [f'class{i}' for i in range(1, 5)]
+    result = {
+        'status': 'success',
+        'statusCode': 4,
+        'statusString': 'optimal',
+        'solution': make_assignments(20),
+        'solveTime': 0.5,
+        'numClasses': 4,
+        'numAssignments': 800
+    }
+
+    frame = pack_result(result, class_ids)
+
+    assert unpack_result(frame) == result
+    assert len(frame) * 5 < len(json.dumps(result))
+
+
+def test_frame_arrays_are_views():
+    """Test that decoded arrays share memory with the input buffer."""
+    test_data = create_test_data()
+    test_data['assignments'] = make_assignments(1)
+    buffer = bytearray(pack_input(test_data))
+
+    header, arrays = unpack_frame(buffer)
+
+    assert arrays['period'].base is not None
+    assert not arrays['period'].flags['OWNDATA']
+
+
+def test_unpack_compiled_keeps_columns():
+    """Test that compiled input reads the conflict masks and assignments from the frame."""
+    test_data = create_test_data(rotation_weeks=2)
+    test_data['assignments'] = make_assignments(2)
+
+    data, compiled, columns = unpack_compiled(bytearray(pack_input(test_data)))
+
+    assert 'conflicts' not in data and 'assignments' not in data
+    assert list(compiled.conflict_masks) == list(CompiledProblem(test_data).conflict_masks)
+    assert not columns['classIndex'].flags['OWNDATA']
+    assert list(iter_assignments(columns, compiled.class_ids, chunk_size=7)) == test_data['assignments']
+
+
+def test_binary_input_fingerprint_matches_json():
+    """Test that a solver of compiled binary input sees the same input as the JSON one."""
+    test_data = create_test_data()
+    data, compiled, _ = unpack_compiled(pack_input(test_data))
+
+    solver = ScheduleSolver(data, compiled=compiled)
+
+    assert input_fingerprint(solver.input_data()) == input_fingerprint(test_data)
+
+
+def test_encode_assignments_rejects_unknown_class():
+    """Test that an assignment of an unknown class is reported by name."""
+    with pytest.raises(ValueError, match='unknown class nope'):
+        encode_assignments([{'classId': 'nope', 'day': 'MONDAY', 'period': 1}], {'class1': 0})
+    with pytest.raises(ValueError, match='unknown day SUNDAY'):
+        encode_assignments([{'classId': 'class1', 'day': 'SUNDAY', 'period': 1}], {'class1': 0})
+
+
+def test_solver_input_has_no_assignments_to_validate():
+    """Test that validating a frame without assignment columns is a clear error."""
+    _, compiled, columns = unpack_compiled(pack_input(create_test_data()))
+
+    assert columns == {}
+    with pytest.raises(ValueError, match='no assignments'):
+        list(iter_assignments(columns, compiled.class_ids))
+
+
+def test_solver_binary_cli():
+    """Test the solver script with binary input and output."""
+    test_data = create_test_data()
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'constraint_solver.py'), '--format', 'binary'],
+        input=pack_input(test_data),
+        capture_output=True,
+        check=True
+    )
+    result = unpack_result(completed.stdout)
+
+    assert result['status'] == 'success'
+    assert len(result['solution']) == len(test_data['classes'])
+
+
+def test_validator_binary_cli():
+    """Test the validator script with binary input."""
+    test_data = create_test_data()
+    test_data['assignments'] = make_assignments(1)
+
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SOLVER_DIR, 'solution_validator.py'), '--format', 'binary'],
+        input=pack_input(test_data),
+        capture_output=True,
+        check=True
+    )
+    result = json.loads(completed.stdout)
+
+    assert result['valid'] is False
+    assert result['numAssignments'] == 40
@@ -10,7 +10,8 @@ import {
 } from '../types';
 
 interface SolverResult {
-  status: 'success' | 'infeasible';
+  // 'error' when the solver refused the input, e.g. a model over its memory budget
+  status: 'success' | 'infeasible' | 'error';
   statusCode: number;
   statusString?: string;
   message?: string;